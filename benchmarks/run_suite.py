@@ -0,0 +1,261 @@
+# coding: utf-8
+"""
+Standalone runner of the benchmark suite in benchmarks/suite: runs the
+asv-style benchmarks (time_*, peakmem_* and track_* methods), prints the results,
+writes them to a JSON file together with the versions of Python, SymPy and
+SymPDE, and compares two result files.
+
+The peak memory is the peak of the memory allocated by Python during the
+call (tracemalloc), after setup. The value of a track_* benchmark is the
+value returned by the method, in the unit given by its attribute 'unit'.
+
+Usage:
+    python benchmarks/run_suite.py run [--bench REGEX] [--param NAME=VALUE ...]
+                                       [--repeat N] [--output FILE]
+    python benchmarks/run_suite.py compare BASE NEW [--factor F]
+
+Examples:
+    python benchmarks/run_suite.py run --param dim=2 --output sympy-1.6.json
+    python benchmarks/run_suite.py compare sympy-1.5.json sympy-1.6.json
+
+"""
+import argparse
+import datetime
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+FORMAT_VERSION = 1
+
+#==============================================================================
+def discover(pattern=None):
+    """ Return the list of (name, class, method name) of the benchmarks whose
+    name matches the regular expression pattern. """
+    import suite
+
+    benchmarks = []
+    for info in pkgutil.iter_modules(suite.__path__):
+        if not info.name.startswith('bench_'):
+            continue
+
+        module = importlib.import_module('suite.' + info.name)
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or cls_name.startswith('_'):
+                continue
+
+            for attr in sorted(dir(cls)):
+                if not attr.startswith(('time_', 'peakmem_', 'track_')):
+                    continue
+
+                name = '{}.{}.{}'.format(info.name, cls_name, attr)
+                if pattern is None or re.search(pattern, name):
+                    benchmarks.append((name, cls, attr))
+
+    return benchmarks
+
+def _parameters(cls, filters):
+    """ Cartesian product of the parameters of a benchmark class, restricted
+    to the values given in filters. """
+    names  = list(getattr(cls, 'param_names', []))
+    params = list(getattr(cls, 'params', []))
+    if names and not isinstance(params[0], (list, tuple)):
+        params = [params]
+
+    for p in itertools.product(*params):
+        d = dict(zip(names, p))
+        if all(str(d[k]) == v for k, v in filters.items() if k in d):
+            yield d
+
+def _sample(cls, method, params, memory):
+    obj = cls()
+    if hasattr(obj, 'setup'):
+        obj.setup(**params)
+
+    func = getattr(obj, method)
+    if method.startswith('track_'):
+        value = func(**params)
+    elif memory:
+        tracemalloc.start()
+        try:
+            func(**params)
+            value = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    else:
+        tb = time.perf_counter()
+        func(**params)
+        value = time.perf_counter() - tb
+
+    if hasattr(obj, 'teardown'):
+        obj.teardown(**params)
+
+    return value
+
+def run_benchmark(cls, method, params, repeat=None):
+    """ Run a benchmark and return its result (minimum over the samples for
+    the timings) and the samples. Returns (None, []) if it is skipped, i.e. if
+    it raises NotImplementedError. """
+    memory = method.startswith('peakmem_')
+    track  = method.startswith('track_')
+    if track:
+        repeat = 1
+    elif repeat is None:
+        repeat = 1 if memory else getattr(cls, 'repeat', 3)
+
+    samples = []
+    try:
+        for _ in range(repeat):
+            samples.append(_sample(cls, method, params, memory))
+    except NotImplementedError:
+        return None, []
+
+    return (max(samples) if memory or track else min(samples)), samples
+
+#==============================================================================
+def _git_commit():
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                      stderr=subprocess.DEVNULL)
+        return out.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _environment():
+    import sympy
+    import sympde
+    return {
+        'python'  : platform.python_version(),
+        'sympy'   : sympy.__version__,
+        'sympde'  : sympde.__version__,
+        'commit'  : _git_commit(),
+        'machine' : platform.node(),
+        'platform': platform.platform(),
+        'date'    : datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+
+def _key(params):
+    return ', '.join('{}={}'.format(k, v) for k, v in params.items())
+
+def _unit(cls, method):
+    if method.startswith('peakmem_'):
+        return 'bytes'
+    elif method.startswith('track_'):
+        return getattr(getattr(cls, method), 'unit', 'unit')
+    else:
+        return 'seconds'
+
+def _format(value, unit):
+    if value is None:
+        return 'skipped'
+    elif unit == 'bytes':
+        return '{:.1f} MB'.format(value / 2**20)
+    elif unit == 'seconds':
+        return '{:.3f} s'.format(value)
+    else:
+        return '{:g} {}'.format(value, unit)
+
+def run(pattern=None, filters=None, repeat=None, output=None):
+    filters = filters or {}
+    results = {}
+
+    for name, cls, method in discover(pattern):
+        unit = _unit(cls, method)
+        entries = []
+        for params in _parameters(cls, filters):
+            value, samples = run_benchmark(cls, method, params, repeat)
+            entries.append({'params': params, 'value': value, 'samples': samples})
+            print('{:<60} {:<45} {:>12}'.format(name, _key(params), _format(value, unit)),
+                  flush=True)
+
+        results[name] = {'unit': unit, 'results': entries}
+
+    data = {'version': FORMAT_VERSION, 'environment': _environment(), 'results': results}
+    if output:
+        with open(output, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    return data
+
+#==============================================================================
+def compare(base, new, factor=1.1):
+    """ Compare two result files. Returns the list of regressions, i.e. the
+    benchmarks whose value increased by more than the given factor. """
+    with open(base) as f:
+        base = json.load(f)
+    with open(new) as f:
+        new  = json.load(f)
+
+    print('base: sympy {sympy}, sympde {sympde}, commit {commit}'.format(**base['environment']))
+    print('new : sympy {sympy}, sympde {sympde}, commit {commit}'.format(**new['environment']))
+    print()
+
+    regressions = []
+    for name, b in sorted(base['results'].items()):
+        if name not in new['results']:
+            continue
+
+        n    = new['results'][name]
+        unit = b['unit']
+        values = {_key(e['params']): e['value'] for e in n['results']}
+        for e in b['results']:
+            key = _key(e['params'])
+            v0  = e['value']
+            v1  = values.get(key)
+            if v0 is None or v1 is None:
+                continue
+
+            ratio = v1 / v0 if v0 else float('inf')
+            if ratio > factor:
+                mark = '+'
+                regressions.append((name, key, ratio))
+            elif ratio < 1 / factor:
+                mark = '-'
+            else:
+                mark = ' '
+
+            print('{} {:<60} {:<45} {:>12} {:>12} {:>7.2f}'.format(mark, name, key,
+                  _format(v0, unit), _format(v1, unit), ratio))
+
+    print()
+    print('{} regression(s) larger than a factor {}'.format(len(regressions), factor))
+    return regressions
+
+#==============================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    p = subparsers.add_parser('run', help='run the benchmarks')
+    p.add_argument('--bench', default=None, help='regular expression on the benchmark names')
+    p.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                   help='only run the given value of a parameter')
+    p.add_argument('--repeat', type=int, default=None, help='number of samples')
+    p.add_argument('--output', default=None, help='JSON file of the results')
+
+    p = subparsers.add_parser('compare', help='compare two result files')
+    p.add_argument('base')
+    p.add_argument('new')
+    p.add_argument('--factor', type=float, default=1.1,
+                   help='ratio above which a change is reported as a regression')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        filters = dict(p.split('=', 1) for p in args.param)
+        run(args.bench, filters, args.repeat, args.output)
+    else:
+        regressions = compare(args.base, args.new, args.factor)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,14 @@
+# coding: utf-8
+"""
+Benchmark suite of the symbolic pipeline, written in the style of airspeed
+velocity (asv): every module bench_*.py contains classes whose methods
+time_*, peakmem_* and track_* are benchmarks, parametrized by the class
+attributes params and param_names, with a setup method called before every
+sample. The track_* methods return the tracked value (e.g. a size), whose
+unit is given by their attribute 'unit'.
+
+The suite can be run with asv (see benchmarks/asv.conf.json) or with the
+standalone runner benchmarks/run_suite.py, which also writes the results to
+JSON files and compares them.
+
+"""
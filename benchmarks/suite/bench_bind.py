@@ -0,0 +1,78 @@
+# coding: utf-8
+"""
+Benchmarks of the evaluation of a sequence of forms which only differ by the
+values of their constants or by their fields, as in time-stepping loops:
+every form is either rebuilt and evaluated by TerminalExpr ('rebuild'), or
+obtained by binding the free variables of a reference form (BasicForm.bind),
+in which case its terminal expression is patched ('bind').
+
+"""
+from collections import OrderedDict
+
+from sympy.core import cache
+
+from sympde.core     import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import ScalarFunctionSpace, elements_of
+from sympde.expr     import BilinearForm, integral
+from sympde.expr     import TerminalExpr
+
+from .workloads import DIMS, _domain, build
+
+#==============================================================================
+def problems(dim, steps):
+    """ Dictionary of the pairs (reference form, values of its free variables
+    at every step). """
+    M, domain = _domain('curved', dim)
+
+    V = ScalarFunctionSpace('V', domain)
+    u, v, F = elements_of(V, names='u, v, F')
+    Fs = elements_of(V, names=', '.join('F_{}'.format(i) for i in range(steps)))
+    dt = Constant('dt')
+
+    d = OrderedDict()
+
+    # heat equation, implicit Euler with a variable time step
+    a = BilinearForm((u, v), integral(domain, u*v + dt*dot(grad(u), grad(v))))
+    d['heat'] = (a, [{'dt': 1. / (i + 1)} for i in range(steps)])
+
+    # nonlinear diffusion, Picard iteration
+    a = BilinearForm((u, v), integral(domain, (1 + F**2)*dot(grad(u), grad(v))))
+    d['picard'] = (a, [{'F': Fi} for Fi in Fs])
+
+    # interior penalty with a variable penalty parameter
+    a = build('dg_multipatch', 'curved', dim).form
+    d['dg'] = (a, [{'kappa': 10.*(i + 1)} for i in range(steps)])
+
+    # Newton iteration of the Navier-Stokes equations
+    w  = build('navier_stokes', 'curved', dim)
+    Us = elements_of(w.fields[0].space, names=', '.join('u_{}'.format(i) for i in range(steps)))
+    d['newton'] = (w.form, [{'u': Ui} for Ui in Us])
+
+    return d
+
+#==============================================================================
+class BindSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+    timeout     = 600
+
+    params      = (['heat', 'picard', 'dg', 'newton'], DIMS, ['rebuild', 'bind'])
+    param_names = ['problem', 'dim', 'method']
+
+    steps       = 20
+
+    def setup(self, problem, dim, method):
+        cache.clear_cache()
+        self.form, self.values = problems(dim, self.steps)[problem]
+        cache.clear_cache()
+
+    def time_evaluate(self, problem, dim, method):
+        a = self.form
+        if method == 'rebuild':
+            for kwargs in self.values:
+                TerminalExpr(BilinearForm(a.variables, a._update_free_variables(**kwargs)))
+        else:
+            for kwargs in self.values:
+                TerminalExpr(a.bind(**kwargs))
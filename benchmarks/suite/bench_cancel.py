@@ -0,0 +1,57 @@
+# coding: utf-8
+"""
+Benchmarks of the rational simplification sympde.topology.mapping.cancel on
+the entries of the Jacobian-weighted inverse metric tensor det(J) J^-1 J^-T
+of the analytical mappings: timings and size of the result, in number of
+operations.
+
+"""
+from sympy      import ImmutableDenseMatrix, count_ops
+from sympy.core import cache
+
+from sympde.topology import PolarMapping, TargetMapping, CzarnyMapping
+from sympde.topology import CollelaMapping, TorusMapping, TwistedTargetMapping
+from sympde.topology.mapping import cancel
+
+#==============================================================================
+MAPPINGS = {
+    'polar'          : lambda: PolarMapping        ('M', 2),
+    'target'         : lambda: TargetMapping       ('M', 2),
+    'czarny'         : lambda: CzarnyMapping       ('M', 2),
+    'collela'        : lambda: CollelaMapping      ('M', 2),
+    'torus'          : lambda: TorusMapping        ('M', 3),
+    'twisted_target' : lambda: TwistedTargetMapping('M', 3),
+}
+
+def weighted_inverse_metric(mapping):
+    x = mapping._logical_coordinates
+    J = ImmutableDenseMatrix(mapping.expressions).jacobian(x)
+    return list(J.det()*J.inv()*J.inv().T)
+
+#==============================================================================
+class CancelSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = sorted(MAPPINGS)
+    param_names = ['mapping']
+
+    def setup(self, mapping):
+        cache.clear_cache()
+        self.exprs = weighted_inverse_metric(MAPPINGS[mapping]())
+        cache.clear_cache()
+
+    def time_cancel(self, mapping):
+        [cancel(e) for e in self.exprs]
+
+    def track_operations(self, mapping):
+        """ Number of operations of the input expressions. """
+        return sum(count_ops(e) for e in self.exprs)
+
+    def track_cancel_operations(self, mapping):
+        """ Number of operations of the simplified expressions. """
+        return sum(count_ops(cancel(e)) for e in self.exprs)
+
+    track_operations.unit        = 'operations'
+    track_cancel_operations.unit = 'operations'
@@ -0,0 +1,76 @@
+# coding: utf-8
+"""
+Size and cost metrics (see sympde.analysis.cost) of the workloads along the
+pipeline: form, terminal expression, logical expression (with the analytical
+mapping substituted) and symbolic expression; the number of nodes of the
+expression tree, the size of its DAG, the number of arithmetic operations,
+the number of needed derivatives and the depth are tracked, together with the
+time taken by cost.
+
+The workloads whose logical expression is not available (e.g. H(curl)
+pull-backs) are skipped.
+
+"""
+from sympde.expr     import TerminalExpr
+from sympde.topology import LogicalExpr, SymbolicExpr
+from sympde.analysis import cost
+
+from .workloads import build, MAPPINGS, DIMS
+
+#==============================================================================
+def _stage(w, dim, stage):
+    """ Expression of the workload at the given stage of the pipeline. """
+    if stage == 'form':
+        return w.form
+
+    expr = TerminalExpr(w.form)
+    if stage == 'terminal':
+        return expr
+
+    expr = LogicalExpr(expr[0].expr, mapping=w.mapping, dim=dim, subs=True)
+    if stage == 'logical':
+        return expr
+
+    return SymbolicExpr(expr)
+
+#==============================================================================
+class CostSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = (['poisson', 'vector_laplace', 'stokes', 'maxwell', 'navier_stokes'],
+                   MAPPINGS, DIMS, ['form', 'terminal', 'logical', 'symbolic'])
+    param_names = ['workload', 'mapping', 'dim', 'stage']
+
+    def setup(self, workload, mapping, dim, stage):
+        w = build(workload, mapping, dim)
+        self.expr = _stage(w, dim, stage)
+
+        # Functions whose derivatives are symbols in the symbolic expression
+        self.functions = w.trials + w.tests + (w.fields or ())
+        self.cost      = cost(self.expr, functions=self.functions)
+
+    def time_cost(self, workload, mapping, dim, stage):
+        cost(self.expr, functions=self.functions)
+
+    def track_nodes(self, workload, mapping, dim, stage):
+        return self.cost.nodes
+
+    def track_dag_size(self, workload, mapping, dim, stage):
+        return self.cost.dag_size
+
+    def track_operations(self, workload, mapping, dim, stage):
+        return self.cost.total_operations
+
+    def track_derivatives(self, workload, mapping, dim, stage):
+        return len(self.cost.derivatives)
+
+    def track_depth(self, workload, mapping, dim, stage):
+        return self.cost.depth
+
+    track_nodes.unit       = 'nodes'
+    track_dag_size.unit    = 'nodes'
+    track_operations.unit  = 'operations'
+    track_derivatives.unit = 'derivatives'
+    track_depth.unit       = 'levels'
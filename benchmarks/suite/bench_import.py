@@ -0,0 +1,71 @@
+# coding: utf-8
+"""
+Benchmarks of the import time of SymPDE: every module is imported in a new
+Python process, either alone (total time) or after SymPy, on which all of
+SymPDE depends (own time). The own import time of sympde.expr matters most,
+since it is paid by every code generation worker: the benchmark fails if it
+exceeds BUDGET.
+
+The modules which are expected to be imported on demand only (h5py, yaml,
+numpy and the subpackages exterior and printing) are counted when they are
+imported.
+
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODULES  = ['sympy', 'sympde', 'sympde.core', 'sympde.topology', 'sympde.calculus',
+            'sympde.expr', 'sympde.exterior', 'sympde.printing']
+DEFERRED = ['h5py', 'yaml', 'numpy', 'sympde.exterior', 'sympde.printing']
+
+# Maximum own import time of sympde.expr [s]
+BUDGET   = 0.2
+
+_code = """
+import sys, time
+{}
+tb = time.perf_counter()
+import {}
+te = time.perf_counter()
+print(te - tb)
+print(' '.join(m for m in {!r} if m in sys.modules))
+"""
+
+def _import(module, preload=''):
+    """ Import time of a module in a new process, and the deferred modules
+    which were imported with it. """
+    code = _code.format(preload, module, DEFERRED)
+    out  = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+    t, loaded = out.decode().split('\n')[:2]
+    return float(t), [m for m in loaded.split() if m != module]
+
+#==============================================================================
+class ImportSuite(object):
+    repeat      = 5
+
+    params      = MODULES
+    param_names = ['module']
+
+    def track_import_time(self, module):
+        """ Import time, SymPy included (best of repeat). """
+        return min(_import(module)[0] for _ in range(self.repeat))
+
+    def track_own_import_time(self, module):
+        """ Import time after SymPy (best of repeat), within BUDGET for
+        sympde.expr. """
+        t = min(_import(module, preload='import sympy')[0] for _ in range(self.repeat))
+        if module == 'sympde.expr' and t > BUDGET:
+            raise AssertionError('> Own import time of sympde.expr {:.3f} s exceeds '
+                                 'the budget of {} s'.format(t, BUDGET))
+        return t
+
+    def track_deferred_imports(self, module):
+        """ Number of modules imported on demand only which were imported. """
+        return len(_import(module)[1])
+
+    track_import_time.unit      = 'seconds'
+    track_own_import_time.unit  = 'seconds'
+    track_deferred_imports.unit = 'modules'
@@ -0,0 +1,51 @@
+# coding: utf-8
+"""
+Benchmarks of the construction of multipatch domains and of the queries on
+their topology, on chains of squares: the patches are merged by successive
+pairwise joins or by a single call to Domain.join, and the interfaces of
+every patch are found through the adjacency index of the domain
+(Domain.adjacency).
+
+"""
+from sympy.core import cache
+
+from sympde.topology import Square
+
+#==============================================================================
+def squares(n):
+    """ Unit squares A0, ..., A(n-1) and the boundaries to be glued. """
+    squares   = [Square('A{}'.format(i), bounds1=(i, i+1), bounds2=(0, 1)) for i in range(n)]
+    bnd_minus = [P.get_boundary(axis=0, ext= 1) for P in squares[:-1]]
+    bnd_plus  = [P.get_boundary(axis=0, ext=-1) for P in squares[1:]]
+    return squares, bnd_minus, bnd_plus
+
+#==============================================================================
+class JoinSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = [10, 50, 200]
+    param_names = ['patches']
+
+    def setup(self, patches):
+        cache.clear_cache()
+        self.squares, self.bnd_minus, self.bnd_plus = squares(patches)
+        self.domain = self.squares[0].join(self.squares[1:], name='D',
+                                           bnd_minus=self.bnd_minus, bnd_plus=self.bnd_plus)
+        self.domain._adjacency = None
+        cache.clear_cache()
+
+    def time_join_pairwise(self, patches):
+        domain = self.squares[0]
+        for i in range(1, len(self.squares)):
+            domain = domain.join(self.squares[i], name='D',
+                                 bnd_minus=self.bnd_minus[i-1], bnd_plus=self.bnd_plus[i-1])
+
+    def time_join(self, patches):
+        self.squares[0].join(self.squares[1:], name='D',
+                             bnd_minus=self.bnd_minus, bnd_plus=self.bnd_plus)
+
+    def time_interfaces(self, patches):
+        for P in self.domain.interior.args:
+            self.domain.adjacency.interfaces(P)
@@ -0,0 +1,69 @@
+# coding: utf-8
+"""
+Benchmarks of the element kernels generated by sympde.printing.lambdify_kernel
+from the terminal expressions of bilinear forms: local element matrices are
+computed on a batch of elements with random basis values, with the 'numpy'
+backend, the experimental 'numba' backend (skipped if numba is not installed)
+and the uncompiled loops of the 'python' backend (on fewer elements).
+
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from sympy.core import cache
+
+from sympde.expr     import TerminalExpr
+from sympde.printing import lambdify_kernel
+
+from .workloads import build
+
+#==============================================================================
+def _data(args, n_elements, n_basis, n_points, tests, trials):
+    """ Random weights, basis values and coefficients. """
+    rng   = np.random.default_rng(0)
+    names = tuple(str(f.name) for f in tests + trials)
+    data  = OrderedDict()
+    for a in args[1:]:
+        if a.split('_')[0] in names:
+            data[a] = rng.random((n_elements, n_basis, n_points))
+        else:
+            data[a] = rng.random((n_elements, n_points))
+    return rng.random((n_elements, n_points)), data
+
+#==============================================================================
+class KernelSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = (['poisson', 'vector_laplace', 'stokes', 'navier_stokes'], [2, 3],
+                   ['numpy', 'numba', 'python'])
+    param_names = ['workload', 'dim', 'backend']
+
+    elements    = 1000
+    degree      = 2
+
+    def setup(self, workload, dim, backend):
+        cache.clear_cache()
+        w = build(workload, 'identity', dim)
+        self.tests, self.trials = w.tests, w.trials
+        self.expr = TerminalExpr(w.form)[0]
+
+        try:
+            self.kernel = lambdify_kernel(self.expr, self.tests, self.trials, backend=backend)
+        except ImportError:
+            raise NotImplementedError('numba is not installed')
+
+        n = self.elements if backend != 'python' else max(1, self.elements // 100)
+        n_basis = n_points = (self.degree + 1)**dim
+        self.weights, self.data = _data(self.kernel.args, n, n_basis, n_points,
+                                        self.tests, self.trials)
+        self.kernel(self.weights, **self.data)
+        cache.clear_cache()
+
+    def time_lambdify_kernel(self, workload, dim, backend):
+        lambdify_kernel(self.expr, self.tests, self.trials, backend=backend)
+
+    def time_kernel(self, workload, dim, backend):
+        self.kernel(self.weights, **self.data)
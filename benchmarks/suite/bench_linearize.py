@@ -0,0 +1,73 @@
+# coding: utf-8
+"""
+Benchmarks of linearize, which computes the Gateaux derivative of a linear
+form by differentiating its expression tree, on nonlinear problems in 2D.
+
+"""
+from collections import OrderedDict
+
+from sympy      import exp, sqrt
+from sympy.core import cache
+
+from sympde.core     import Constant
+from sympde.calculus import grad, div, dot, inner, convect
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import elements_of
+from sympde.topology import Domain
+from sympde.expr     import LinearForm, integral, linearize
+
+#==============================================================================
+def problems():
+    """ Dictionary of the tuples (linear form, fields, trial functions). """
+    domain = Domain('Omega', dim=2)
+    int_0  = lambda expr: integral(domain, expr)
+
+    V = ScalarFunctionSpace('V', domain)
+    W = VectorFunctionSpace('W', domain)
+
+    v, F, du = elements_of(V, names='v, F, du')
+    w, G, dG = elements_of(W, names='w, G, dG')
+    q, P, dP = elements_of(V, names='q, P, dP')
+    eps      = Constant('eps', real=True)
+
+    d = OrderedDict()
+
+    # Bratu problem
+    l = LinearForm(v, int_0(dot(grad(v), grad(F)) + 4.*exp(-F)*v))
+    d['bratu'] = (l, [F], [du])
+
+    # p-Laplacian, p = 4 and p = 3 (regularized)
+    l = LinearForm(v, int_0(dot(grad(F), grad(F))*dot(grad(F), grad(v)) - v))
+    d['p_laplace_4'] = (l, [F], [du])
+
+    l = LinearForm(v, int_0(sqrt(eps**2 + dot(grad(F), grad(F)))*dot(grad(F), grad(v)) - v))
+    d['p_laplace_3'] = (l, [F], [du])
+
+    # nonlinear diffusion
+    l = LinearForm(v, int_0((1 + F**2)*dot(grad(F), grad(v)) - v))
+    d['nonlinear_diff'] = (l, [F], [du])
+
+    # incompressible Navier-Stokes with convection
+    l = LinearForm((w, q), int_0(dot(convect(G, G), w) + inner(grad(G), grad(w))
+                                 - P*div(w) + div(G)*q))
+    d['navier_stokes'] = (l, [G, P], [dG, dP])
+
+    return d
+
+#==============================================================================
+class NonlinearProblemsSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = ['bratu', 'p_laplace_4', 'p_laplace_3', 'nonlinear_diff', 'navier_stokes']
+    param_names = ['problem']
+
+    def setup(self, problem):
+        cache.clear_cache()
+        self.problem = problems()[problem]
+        cache.clear_cache()
+
+    def time_linearize(self, problem):
+        l, fields, trials = self.problem
+        linearize(l, fields, trials=trials)
@@ -0,0 +1,54 @@
+# coding: utf-8
+"""
+Benchmarks of the vectorized NumPy evaluation of analytical mappings
+(Mapping.to_callable) on grids of 10^6 points.
+
+"""
+import numpy as np
+
+from sympy.core import cache
+
+from sympde.topology import IdentityMapping, AffineMapping, PolarMapping
+from sympde.topology import TargetMapping, CzarnyMapping, CollelaMapping
+from sympde.topology import TorusMapping, TwistedTargetMapping
+
+#==============================================================================
+MAPPINGS = {
+    'identity'       : lambda: IdentityMapping     ('M', 2),
+    'affine'         : lambda: AffineMapping       ('M', 2, c1=0., c2=0., a11=1., a12=0.5, a21=0.2, a22=2.),
+    'polar'          : lambda: PolarMapping        ('M', 2, c1=0., c2=0., rmin=0.2, rmax=1.),
+    'target'         : lambda: TargetMapping       ('M', 2, c1=0., c2=0., k=0.3, D=0.2),
+    'czarny'         : lambda: CzarnyMapping       ('M', 2, c2=0., eps=0.2, b=1.4),
+    'collela'        : lambda: CollelaMapping      ('M', 2, eps=0.05, k1=1., k2=1.),
+    'torus'          : lambda: TorusMapping        ('M', 3, R0=2.),
+    'twisted_target' : lambda: TwistedTargetMapping('M', 3, c1=0., c2=0., c3=0., k=0.3, D=0.2),
+}
+
+KERNELS = ('F', 'J', 'inv_J', 'det_J')
+
+def _kernel(F, kind):
+    return {'F': F, 'J': F.jacobian, 'inv_J': F.inv_jacobian, 'det_J': F.det_jacobian}[kind]
+
+#==============================================================================
+class CallableMappingSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = (sorted(MAPPINGS), KERNELS)
+    param_names = ['mapping', 'kernel']
+
+    def setup(self, mapping, kernel):
+        self.mapping = MAPPINGS[mapping]()
+        self.x       = np.random.default_rng(0).uniform(0.1, 0.9, size=(self.mapping.rdim, 10**6))
+        self.kernel  = _kernel(self.mapping.to_callable(), kernel)
+        self.kernel(*self.x[:, :1])
+
+    def time_build(self, mapping, kernel):
+        """ Generation of the kernel (first call). """
+        cache.clear_cache()
+        _kernel(self.mapping.to_callable(), kernel)(*self.x[:, :1])
+
+    def time_evaluate(self, mapping, kernel):
+        """ Evaluation of the kernel on the grid, once generated. """
+        self.kernel(*self.x)
@@ -0,0 +1,58 @@
+# coding: utf-8
+"""
+Benchmarks of the pull-back of forms on 3D mapped domains to the logical
+domain (LogicalExpr of the TerminalExpr of the form), which needs the inverse
+and the determinant of the Jacobian matrix and of the metric tensor of the
+mapping. Every sample starts with empty caches and new mapping objects.
+
+"""
+from sympy.core import cache
+
+from sympde.calculus import grad, div, curl, dot
+from sympde.topology import Mapping, Cube
+from sympde.topology import TorusMapping, TwistedTargetMapping
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace, elements_of
+from sympde.topology import LogicalExpr
+from sympde.expr     import BilinearForm, integral, TerminalExpr
+
+#==============================================================================
+MAPPINGS = {
+    'symbolic' : lambda: Mapping('M', 3),
+    'torus'    : lambda: TorusMapping('M', 3, R0=2.),
+    'twisted'  : lambda: TwistedTargetMapping('M', 3, c1=0., c2=0., c3=0., k=0.3, D=0.2),
+}
+
+def poisson(D):
+    V = ScalarFunctionSpace('V', D)
+    u, v = elements_of(V, names='u, v')
+    return BilinearForm((u, v), integral(D, dot(grad(u), grad(v)) + u*v))
+
+def maxwell(D):
+    V = VectorFunctionSpace('V', D, kind='hcurl')
+    u, v = elements_of(V, names='u, v')
+    return BilinearForm((u, v), integral(D, dot(curl(u), curl(v)) + dot(u, v)))
+
+def darcy(D):
+    V = VectorFunctionSpace('V', D, kind='hdiv')
+    u, v = elements_of(V, names='u, v')
+    return BilinearForm((u, v), integral(D, div(u)*div(v) + dot(u, v)))
+
+FORMS = {'poisson': poisson, 'maxwell': maxwell, 'darcy': darcy}
+
+#==============================================================================
+class MappingMetricSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+    timeout     = 600
+
+    params      = (sorted(MAPPINGS), sorted(FORMS))
+    param_names = ['mapping', 'form']
+
+    def setup(self, mapping, form):
+        cache.clear_cache()
+
+    def time_pull_back(self, mapping, form):
+        M = MAPPINGS[mapping]()
+        a = FORMS[form](M(Cube('A')))
+        LogicalExpr(TerminalExpr(a)[0], mapping=M, dim=3)
@@ -0,0 +1,72 @@
+# coding: utf-8
+"""
+Benchmarks of the extraction of the metric common subexpressions
+(sympde.topology.mapping.metric_cse) from the logical expression of forms on
+curved domains: timings and number of nodes of the expression trees.
+
+"""
+from sympy      import preorder_traversal
+from sympy.core import cache
+
+from sympde.calculus import grad, curl, dot
+from sympde.topology import Mapping, Square, Cube
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace, elements_of
+from sympde.topology.mapping import LogicalExpr, metric_cse
+from sympde.expr     import BilinearForm, integral, TerminalExpr
+
+#==============================================================================
+def poisson_2d():
+    M = Mapping('M', 2)
+    D = M(Square('A'))
+    V = ScalarFunctionSpace('V', D)
+    u, v = elements_of(V, names='u, v')
+    return M, BilinearForm((u, v), integral(D, dot(grad(u), grad(v)) + u*v))
+
+def poisson_3d():
+    M = Mapping('M', 3)
+    D = M(Cube('A'))
+    V = ScalarFunctionSpace('V', D)
+    u, v = elements_of(V, names='u, v')
+    return M, BilinearForm((u, v), integral(D, dot(grad(u), grad(v)) + u*v))
+
+def maxwell_3d():
+    M = Mapping('M', 3)
+    D = M(Cube('A'))
+    V = VectorFunctionSpace('V', D, kind='hcurl')
+    u, v = elements_of(V, names='u, v')
+    return M, BilinearForm((u, v), integral(D, dot(curl(u), curl(v)) + dot(u, v)))
+
+FORMS = {'poisson_2d': poisson_2d, 'poisson_3d': poisson_3d, 'maxwell_3d': maxwell_3d}
+
+def _size(expr):
+    return sum(1 for _ in preorder_traversal(expr))
+
+#==============================================================================
+class MetricCSESuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = sorted(FORMS)
+    param_names = ['form']
+
+    def setup(self, form):
+        cache.clear_cache()
+        M, a = FORMS[form]()
+        self.expr = LogicalExpr(TerminalExpr(a)[0].expr, mapping=M, dim=M.rdim)
+        cache.clear_cache()
+
+    def time_metric_cse(self, form):
+        metric_cse(self.expr)
+
+    def track_nodes(self, form):
+        """ Number of nodes of the logical expression. """
+        return _size(self.expr)
+
+    def track_reduced_nodes(self, form):
+        """ Number of nodes of the temporaries and of the reduced expression. """
+        temps, reduced = metric_cse(self.expr)
+        return sum(_size(e) for _, e in temps) + _size(reduced)
+
+    track_nodes.unit         = 'nodes'
+    track_reduced_nodes.unit = 'nodes'
@@ -0,0 +1,39 @@
+# coding: utf-8
+"""
+Benchmarks of the parallel evaluation of a multipatch form with
+TerminalExpr(form, parallel='process', workers=N).
+
+The pool of worker processes is shut down after every sample, hence the
+timings include its start.
+
+"""
+from sympy.core import cache
+
+from sympde.expr            import TerminalExpr
+from sympde.expr.evaluation import shutdown_executor
+
+from .workloads import multipatch_channel, sip_form
+
+#==============================================================================
+class ParallelTerminalExprSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+    timeout     = 600
+
+    params      = ([16], [1, 2, 4])
+    param_names = ['patches', 'workers']
+
+    def setup(self, patches, workers):
+        cache.clear_cache()
+        self.form = sip_form(multipatch_channel(patches), coupled=True)
+        cache.clear_cache()
+
+    def teardown(self, patches, workers):
+        shutdown_executor()
+
+    def time_terminal_expr(self, patches, workers):
+        if workers == 1:
+            TerminalExpr(self.form)
+        else:
+            TerminalExpr(self.form, parallel='process', workers=workers)
@@ -0,0 +1,129 @@
+# coding: utf-8
+"""
+Benchmarks of the main stages of the symbolic pipeline: TerminalExpr,
+LogicalExpr, SymbolicExpr, TensorExpr, linearize and is_linear_expression.
+
+All the caches are cleared before every sample, hence the timings are those
+of a first evaluation.
+
+"""
+from sympy      import ImmutableDenseMatrix
+from sympy.core import cache
+
+from sympde.topology        import LogicalExpr, SymbolicExpr
+from sympde.expr            import TerminalExpr, linearize
+from sympde.expr.expr       import is_linear_expression
+from sympde.expr.evaluation import TensorExpr, DomainExpression
+
+from .workloads import WORKLOADS, MAPPINGS, DIMS, build
+
+#==============================================================================
+class _Pipeline(object):
+    """ Base class: one sample per call, no warm-up (it would fill the
+    caches). """
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+    timeout     = 600
+
+    params      = (sorted(WORKLOADS), MAPPINGS, DIMS)
+    param_names = ['workload', 'mapping', 'dim']
+
+    def setup(self, workload, mapping, dim):
+        cache.clear_cache()
+        self.workload = build(workload, mapping, dim)
+        self.dim      = dim
+
+    def _logical(self, terminal):
+        """ Pull-back of the domain expressions to the logical domain. """
+        exprs = []
+        for e in terminal:
+            if isinstance(e, DomainExpression) and e.target.mapping is not None:
+                exprs.append(LogicalExpr(e, mapping=e.target.mapping, dim=self.dim))
+        return exprs
+
+#==============================================================================
+class TerminalExprSuite(_Pipeline):
+
+    def setup(self, workload, mapping, dim):
+        super().setup(workload, mapping, dim)
+        cache.clear_cache()
+
+    def time_terminal_expr(self, workload, mapping, dim):
+        TerminalExpr(self.workload.form)
+
+    peakmem_terminal_expr = time_terminal_expr
+
+#==============================================================================
+class LogicalExprSuite(_Pipeline):
+
+    def setup(self, workload, mapping, dim):
+        super().setup(workload, mapping, dim)
+        self.terminal = TerminalExpr(self.workload.form)
+        cache.clear_cache()
+
+    def time_logical_expr(self, workload, mapping, dim):
+        self._logical(self.terminal)
+
+    peakmem_logical_expr = time_logical_expr
+
+#==============================================================================
+class SymbolicExprSuite(_Pipeline):
+
+    def setup(self, workload, mapping, dim):
+        super().setup(workload, mapping, dim)
+        self.logical = self._logical(TerminalExpr(self.workload.form))
+        cache.clear_cache()
+
+    def time_symbolic_expr(self, workload, mapping, dim):
+        for e in self.logical:
+            exprs = e.expr if isinstance(e.expr, ImmutableDenseMatrix) else [e.expr]
+            for a in exprs:
+                SymbolicExpr(a)
+
+    peakmem_symbolic_expr = time_symbolic_expr
+
+#==============================================================================
+class TensorExprSuite(_Pipeline):
+    # TensorExpr only handles single-patch forms of grad/div operators
+    params = (['poisson', 'stokes', 'vector_laplace'], MAPPINGS, DIMS)
+
+    def setup(self, workload, mapping, dim):
+        super().setup(workload, mapping, dim)
+        cache.clear_cache()
+
+    def time_tensor_expr(self, workload, mapping, dim):
+        TensorExpr(self.workload.form, mapping=self.workload.mapping)
+
+    peakmem_tensor_expr = time_tensor_expr
+
+#==============================================================================
+class LinearitySuite(_Pipeline):
+    params      = _Pipeline.params + (['structural', 'expand'],)
+    param_names = _Pipeline.param_names + ['method']
+
+    def setup(self, workload, mapping, dim, method):
+        super().setup(workload, mapping, dim)
+        cache.clear_cache()
+
+    def time_is_linear_expression(self, workload, mapping, dim, method):
+        w = self.workload
+        is_linear_expression(w.form.expr, w.trials, method=method, debug=False)
+        is_linear_expression(w.form.expr, w.tests, method=method, debug=False)
+
+    peakmem_is_linear_expression = time_is_linear_expression
+
+#==============================================================================
+class LinearizeSuite(_Pipeline):
+    params      = (MAPPINGS, DIMS)
+    param_names = ['mapping', 'dim']
+
+    def setup(self, mapping, dim):
+        super().setup('navier_stokes', mapping, dim)
+        cache.clear_cache()
+
+    def time_linearize(self, mapping, dim):
+        w = self.workload
+        linearize(w.residual, w.fields, trials=w.trials)
+
+    peakmem_linearize = time_linearize
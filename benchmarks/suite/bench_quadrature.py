@@ -0,0 +1,52 @@
+# coding: utf-8
+"""
+Benchmarks of the quadrature rules recommended by
+sympde.analysis.integrand_degree: time of the analysis, and number of
+quadrature points per element of the Gauss rule which integrates all the
+blocks of the form exactly, to be compared with a blind rule of
+(2*degree + 2)**dim points (enough for the product of two functions and of a
+coefficient of the same degree).
+
+"""
+from sympy.core import cache
+
+from sympde.analysis import integrand_degree, IntegrandDegree
+
+from .workloads import build, MAPPINGS, DIMS
+
+#==============================================================================
+def _blocks(degrees):
+    blocks = []
+    for d in degrees:
+        if isinstance(d, IntegrandDegree):
+            blocks.append(d)
+        else:
+            blocks += [b for row in d for b in row if b is not None]
+    return blocks
+
+#==============================================================================
+class QuadratureSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = (['poisson', 'vector_laplace', 'stokes', 'navier_stokes'], MAPPINGS, DIMS, [2, 3])
+    param_names = ['workload', 'mapping', 'dim', 'degree']
+
+    def setup(self, workload, mapping, dim, degree):
+        cache.clear_cache()
+        self.form   = build(workload, mapping, dim).form
+        self.blocks = _blocks(integrand_degree(self.form, degree))
+        cache.clear_cache()
+
+    def time_integrand_degree(self, workload, mapping, dim, degree):
+        integrand_degree(self.form, degree)
+
+    def track_points(self, workload, mapping, dim, degree):
+        """ Number of points per element of the exact Gauss rule. """
+        n = 1
+        for i in range(dim):
+            n *= max(b.gauss_points[i] for b in self.blocks)
+        return n
+
+    track_points.unit = 'points'
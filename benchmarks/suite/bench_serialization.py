@@ -0,0 +1,58 @@
+# coding: utf-8
+"""
+Benchmarks of the binary serialization format of sympde.serialization and of
+the pickle-based serialization of sympde.cache, on the workloads with a
+curved mapping: for every form and its evaluation by TerminalExpr, the size
+of the encoded data and the timings of the encoding, of the decoding and of
+the computation of a content-addressed key (digest and canonical_key).
+
+The caches are not cleared: the serialized objects are built once.
+
+"""
+from sympde.cache         import dumps, loads, canonical_key
+from sympde.serialization import encode, decode, digest
+from sympde.expr          import TerminalExpr
+
+from .workloads import WORKLOADS, DIMS, build
+
+#==============================================================================
+class SerializationSuite(object):
+    number      = 1
+    repeat      = 5
+    warmup_time = 0
+
+    params      = (sorted(WORKLOADS), DIMS, ['form', 'expr'])
+    param_names = ['workload', 'dim', 'obj']
+
+    def setup(self, workload, dim, obj):
+        form = build(workload, 'curved', dim).form
+        self.obj     = form if obj == 'form' else TerminalExpr(form)
+        self.pickled = dumps(self.obj)
+        self.encoded = encode(self.obj)
+
+    def time_encode(self, workload, dim, obj):
+        encode(self.obj)
+
+    def time_decode(self, workload, dim, obj):
+        decode(self.encoded)
+
+    def time_digest(self, workload, dim, obj):
+        digest(self.obj)
+
+    def time_dumps(self, workload, dim, obj):
+        dumps(self.obj)
+
+    def time_loads(self, workload, dim, obj):
+        loads(self.pickled)
+
+    def time_canonical_key(self, workload, dim, obj):
+        canonical_key(self.obj)
+
+    def track_encoded_size(self, workload, dim, obj):
+        return len(self.encoded)
+
+    def track_pickled_size(self, workload, dim, obj):
+        return len(self.pickled)
+
+    track_encoded_size.unit = 'B'
+    track_pickled_size.unit = 'B'
@@ -0,0 +1,52 @@
+# coding: utf-8
+"""
+Benchmarks of the construction of vector-valued expressions by the commutative
+and anti-commutative operators (Dot, Inner, Cross, ...), which sort their
+arguments by their memoized structural keys (see
+sympde.core.utils.structural_key).
+
+"""
+from collections import OrderedDict
+
+from sympy.core import cache
+
+from sympde.calculus import grad, dot, inner, cross, curl
+from sympde.topology import VectorFunctionSpace, Domain, elements_of
+
+from .workloads import build
+
+#==============================================================================
+def problems(n):
+    """ Builders of expressions, on sums of n vector functions. """
+    domain = Domain('Omega', dim=3)
+    V      = VectorFunctionSpace('V', domain)
+    us     = elements_of(V, names=', '.join('u{}'.format(i) for i in range(n)))
+    vs     = elements_of(V, names=', '.join('v{}'.format(i) for i in range(n)))
+    u, v   = sum(us[1:], us[0]), sum(vs[1:], vs[0])
+
+    d = OrderedDict()
+    d['dot']           = lambda: dot(u, v) + dot(curl(u), curl(v))
+    d['inner']         = lambda: inner(grad(u), grad(v))
+    d['cross']         = lambda: dot(cross(curl(u), u), v)
+    d['stokes']        = lambda: build('stokes', 'curved', 3)
+    d['maxwell']       = lambda: build('maxwell', 'curved', 3)
+    d['navier_stokes'] = lambda: build('navier_stokes', 'curved', 3)
+    return d
+
+#==============================================================================
+class SortKeySuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = ['dot', 'inner', 'cross', 'stokes', 'maxwell', 'navier_stokes']
+    param_names = ['problem']
+
+    terms       = 10
+
+    def setup(self, problem):
+        self.func = problems(self.terms)[problem]
+        cache.clear_cache()
+
+    def time_construct(self, problem):
+        self.func()
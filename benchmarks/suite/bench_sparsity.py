@@ -0,0 +1,42 @@
+# coding: utf-8
+"""
+Benchmarks of the analysis of the block structure of the terminal
+expressions of the workloads (see sympde.analysis.block_structure): time of
+the analysis (pattern, coupling graph and symmetry), once the terminal
+expression is computed, and number of non-zero blocks over all the kernel
+expressions.
+
+"""
+from sympde.expr     import TerminalExpr
+from sympde.analysis import block_structure
+
+from .workloads import build, WORKLOADS, DIMS
+
+#==============================================================================
+def _analyse(expr, tests, trials):
+    structures = block_structure(expr, tests, trials)
+    for s in structures:
+        s.coupling, s.is_symmetric
+    return structures
+
+#==============================================================================
+class BlockStructureSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = (sorted(WORKLOADS), DIMS)
+    param_names = ['workload', 'dim']
+
+    def setup(self, workload, dim):
+        w = build(workload, 'identity', dim)
+        self.tests, self.trials = w.tests, w.trials
+        self.expr = TerminalExpr(w.form)
+
+    def time_block_structure(self, workload, dim):
+        _analyse(self.expr, self.tests, self.trials)
+
+    def track_nonzero_blocks(self, workload, dim):
+        return sum(len(s.nonzero_blocks) for s in _analyse(self.expr, self.tests, self.trials))
+
+    track_nonzero_blocks.unit = 'blocks'
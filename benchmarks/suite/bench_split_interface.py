@@ -0,0 +1,51 @@
+# coding: utf-8
+"""
+Benchmarks of the splitting of interface integrals over the two sides of each
+interface (sympde.expr.evaluation._split_expr_over_interface), on the
+symmetric interior penalty form of a multipatch channel.
+
+"""
+from sympy.core import cache
+
+from sympde.expr            import evaluation
+from sympde.expr.evaluation import TerminalExpr
+from sympde.expr.evaluation import _split_expr_over_interface
+
+from .workloads import multipatch_channel, sip_form
+
+#==============================================================================
+class SplitInterfaceSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = [2, 4, 8]
+    param_names = ['patches']
+
+    def setup(self, patches):
+        cache.clear_cache()
+        self.form = sip_form(multipatch_channel(patches))
+
+        # Record the arguments of every call made by TerminalExpr
+        calls = []
+        def spy(*args, **kwargs):
+            calls.append((args, kwargs))
+            return _split_expr_over_interface(*args, **kwargs)
+
+        evaluation._split_expr_over_interface = spy
+        try:
+            TerminalExpr(self.form)
+        finally:
+            evaluation._split_expr_over_interface = _split_expr_over_interface
+
+        self.calls = calls
+        cache.clear_cache()
+
+    def time_split_expr_over_interface(self, patches):
+        for args, kwargs in self.calls:
+            _split_expr_over_interface(*args, **kwargs)
+
+    def time_terminal_expr(self, patches):
+        TerminalExpr(self.form)
+
+    peakmem_terminal_expr = time_terminal_expr
@@ -0,0 +1,55 @@
+# coding: utf-8
+"""
+Benchmarks of the Kronecker decomposition of bilinear forms (see
+sympde.expr.kronecker_decomposition), as needed by sum-factorized operators:
+time of the decomposition (including the terminal and logical expressions),
+number of non-zero blocks, largest rank of a block (number of Kronecker
+products) and number of blocks which are fully separable, i.e. without
+remainder.
+
+The workloads whose logical expression is not available (e.g. H(curl)
+pull-backs) are skipped.
+
+"""
+from sympy.core import cache
+
+from sympde.expr import kronecker_decomposition, KroneckerSum
+
+from .workloads import build, MAPPINGS, DIMS
+
+#==============================================================================
+class KroneckerSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = (['poisson', 'vector_laplace', 'stokes', 'maxwell', 'navier_stokes'],
+                   MAPPINGS, DIMS)
+    param_names = ['workload', 'mapping', 'dim']
+
+    def setup(self, workload, mapping, dim):
+        cache.clear_cache()
+        self.form = build(workload, mapping, dim).form
+
+        decomposition = kronecker_decomposition(self.form, measure=True)
+        if isinstance(decomposition, KroneckerSum):
+            decomposition = [[decomposition]]
+        self.blocks = [b for row in decomposition for b in row
+                       if b.rank or not b.is_separable]
+        cache.clear_cache()
+
+    def time_kronecker_decomposition(self, workload, mapping, dim):
+        kronecker_decomposition(self.form, measure=True)
+
+    def track_blocks(self, workload, mapping, dim):
+        return len(self.blocks)
+
+    def track_max_rank(self, workload, mapping, dim):
+        return max(b.rank for b in self.blocks)
+
+    def track_separable_blocks(self, workload, mapping, dim):
+        return sum(b.is_separable for b in self.blocks)
+
+    track_blocks.unit           = 'blocks'
+    track_max_rank.unit         = 'products'
+    track_separable_blocks.unit = 'blocks'
@@ -0,0 +1,62 @@
+# coding: utf-8
+"""
+Benchmarks of the conversion of the terminal expression of a bilinear form
+into its block-matrix representation (sympde.expr.evaluation._to_matrix_form),
+on multi-field 3D forms with many blocks.
+
+"""
+from sympy.core import cache
+
+from sympde.calculus import grad, div, dot, inner
+from sympde.topology import Cube, ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import elements_of
+from sympde.expr     import BilinearForm, integral
+from sympde.expr.evaluation import TerminalExpr, _get_trials_tests_flattened
+from sympde.expr.evaluation import _to_matrix_form
+
+#==============================================================================
+def stokes_3d():
+    domain = Cube()
+    V = VectorFunctionSpace('V', domain, kind='H1')
+    W = ScalarFunctionSpace('W', domain, kind='L2')
+
+    u, v = elements_of(V, names='u, v')
+    p, q = elements_of(W, names='p, q')
+
+    expr = inner(grad(u), grad(v)) - div(u)*q - p*div(v) + p*q
+    return BilinearForm(((u, p), (v, q)), integral(domain, expr))
+
+def elasticity_3d():
+    domain = Cube()
+    V = VectorFunctionSpace('V', domain, kind='H1')
+
+    u1, u2, v1, v2 = elements_of(V, names='u1, u2, v1, v2')
+
+    # Two coupled (Lame) elasticity problems
+    expr = inner(grad(u1), grad(v1)) + div(u1)*div(v1) \
+         + inner(grad(u2), grad(v2)) + div(u2)*div(v2) \
+         + dot(u1, v2) + dot(u2, v1)
+    return BilinearForm(((u1, u2), (v1, v2)), integral(domain, expr))
+
+FORMS = {'stokes_3d': stokes_3d, 'elasticity_3d': elasticity_3d}
+
+#==============================================================================
+class ToMatrixFormSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = sorted(FORMS)
+    param_names = ['form']
+
+    def setup(self, form):
+        cache.clear_cache()
+        a = FORMS[form]()
+        self.expr = TerminalExpr.eval(a.expr.expr, dim=a.ldim)
+        self.trials, self.tests = _get_trials_tests_flattened(a)
+        cache.clear_cache()
+
+    def time_to_matrix_form(self, form):
+        _to_matrix_form(self.expr, trials=self.trials, tests=self.tests)
+
+    peakmem_to_matrix_form = time_to_matrix_form
@@ -0,0 +1,67 @@
+# coding: utf-8
+"""
+Benchmarks of the export of multipatch domains to HDF5 files and of their
+reading, with the YAML layout and with the chunked 'hdf5' layout (see
+Domain.export), on chains of patches: the whole domain is read, or only one
+patch of it, as a worker of a distributed run would do.
+
+"""
+import os
+import shutil
+import tempfile
+
+from sympy.core import cache
+
+from sympde.topology import InteriorDomain, Boundary, Interface, Connectivity, Domain
+
+#==============================================================================
+def chain(n):
+    """ Domain made of n patches P0, ..., P(n-1) glued along the first axis. """
+    patches      = [InteriorDomain('P{}'.format(i), dim=2) for i in range(n)]
+    boundaries   = [Boundary(r'\Gamma_1', patches[0], axis=0, ext=-1),
+                    Boundary(r'\Gamma_2', patches[-1], axis=0, ext=1)]
+    connectivity = Connectivity()
+    for i, P in enumerate(patches):
+        boundaries += [Boundary(r'\Gamma_3', P, axis=1, ext=-1),
+                       Boundary(r'\Gamma_4', P, axis=1, ext=1)]
+        if i > 0:
+            name = 'P{}|P{}'.format(i-1, i)
+            connectivity[name] = Interface(name,
+                                           Boundary(r'\Gamma_2', patches[i-1], axis=0, ext=1),
+                                           Boundary(r'\Gamma_1', P, axis=0, ext=-1))
+
+    return Domain('Omega', interiors=patches, boundaries=boundaries, connectivity=connectivity)
+
+#==============================================================================
+class TopologyIOSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = ([10, 100, 1000], ['yaml', 'hdf5'])
+    param_names = ['patches', 'layout']
+
+    def setup(self, patches, layout):
+        cache.clear_cache()
+        self.path     = tempfile.mkdtemp()
+        self.filename = os.path.join(self.path, 'domain.h5')
+        self.domain   = chain(patches)
+        self.domain.export(self.filename, layout=layout)
+        cache.clear_cache()
+
+    def teardown(self, patches, layout):
+        shutil.rmtree(self.path)
+
+    def time_export(self, patches, layout):
+        self.domain.export(self.filename, layout=layout)
+
+    def time_read(self, patches, layout):
+        Domain.from_file(self.filename)
+
+    def time_read_one_patch(self, patches, layout):
+        Domain.from_file(self.filename, patches=[patches // 2])
+
+    def track_file_size(self, patches, layout):
+        return os.path.getsize(self.filename)
+
+    track_file_size.unit = 'B'
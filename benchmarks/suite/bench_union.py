@@ -0,0 +1,57 @@
+# coding: utf-8
+"""
+Benchmarks of the construction of Union objects on the patches, boundaries
+and interfaces of a chain of patches: the domains are sorted by their order
+key (see BasicDomain.order_key), which is computed once per domain ('first')
+and then reused ('next'); the sorted arguments of Union objects are merged
+without being sorted again.
+
+"""
+from collections import OrderedDict
+
+from sympy.core import cache
+
+from sympde.topology import BasicDomain, Union
+
+from .bench_topology_io import chain
+
+#==============================================================================
+def cases(domain):
+    interiors  = domain.interior.args
+    boundaries = domain.boundary.args
+    interfaces = tuple(domain.connectivity.values())
+    half       = len(interiors) // 2
+
+    d = OrderedDict()
+    d['interiors']   = interiors
+    d['boundaries']  = boundaries
+    d['interfaces']  = interfaces
+    d['unions']      = (Union(*interiors[:half]), Union(*interiors[half:]))
+    d['union_patch'] = (Union(*interiors[1:]), interiors[0])
+    return d
+
+#==============================================================================
+class UnionSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+
+    params      = ([100, 1000], ['interiors', 'boundaries', 'interfaces', 'unions', 'union_patch'],
+                   ['first', 'next'])
+    param_names = ['patches', 'arguments', 'order_key']
+
+    def setup(self, patches, arguments, order_key):
+        self.args = cases(chain(patches))[arguments]
+        cache.clear_cache()
+
+        if order_key == 'first':
+            domains = [e for a in self.args for e in (a.args if isinstance(a, Union) else [a])]
+            for e in domains:
+                for d in [e] + list(e.atoms(BasicDomain)):
+                    d._order_key = None
+        else:
+            Union(*self.args)
+            cache.clear_cache()
+
+    def time_union(self, patches, arguments, order_key):
+        Union(*self.args)
@@ -0,0 +1,60 @@
+# coding: utf-8
+"""
+Benchmarks of the construction of many variants of the same bilinear form,
+as in an optimization loop, with the validation modes 'eager' (with the
+structural and the expand-based linearity checks), 'lazy' and 'off' (see
+sympde.config.validate), on the workloads with a curved mapping.
+
+Every variant is the form of the workload with its integrands scaled by a
+different coefficient.
+
+"""
+from sympy.core import cache
+
+from sympde import config
+from sympde.expr.expr import BilinearForm, Integral, IntAdd
+
+from .workloads import WORKLOADS, DIMS, build
+
+#==============================================================================
+def _scale(expr, c):
+    if isinstance(expr, IntAdd):
+        return IntAdd(*[_scale(a, c) for a in expr.args])
+    assert isinstance(expr, Integral)
+    return Integral(c*expr.expr, expr.domain)
+
+# Validation mode and linearity method
+MODES = {
+    'eager'        : ('eager', 'structural'),
+    'eager_expand' : ('eager', 'expand'),
+    'lazy'         : ('lazy',  'structural'),
+    'off'          : ('off',   'structural'),
+}
+
+#==============================================================================
+class ValidationSuite(object):
+    number      = 1
+    repeat      = 3
+    warmup_time = 0
+    timeout     = 600
+
+    params      = (sorted(WORKLOADS), DIMS, list(MODES))
+    param_names = ['workload', 'dim', 'mode']
+
+    variants    = 100
+
+    def setup(self, workload, dim, mode):
+        cache.clear_cache()
+        w = build(workload, 'curved', dim)
+        self.args  = w.form.variables
+        self.exprs = [_scale(w.form.expr, k + 2) for k in range(self.variants)]
+        cache.clear_cache()
+
+    def time_construct(self, workload, dim, mode):
+        check, linearity = MODES[mode]
+        config.linearity = linearity
+        try:
+            for e in self.exprs:
+                BilinearForm(self.args, e, check=check)
+        finally:
+            config.linearity = 'structural'
@@ -0,0 +1,193 @@
+# coding: utf-8
+"""
+Representative workloads of the symbolic pipeline: variational forms of
+classical problems, on the image of the unit square (2D) or cube (3D) by an
+identity or a curved mapping.
+
+Every builder has the signature builder(mapping, dim) and returns a
+Workload, where mapping is 'identity' or 'curved'. The interior penalty forms
+on a multipatch channel (sip_form) scale with the number of patches.
+
+"""
+from collections import namedtuple
+
+from sympde.core     import Constant
+from sympde.calculus import grad, div, curl, dot, inner, cross, jump, avg, Dn
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import element_of, elements_of
+from sympde.topology import Square, Cube, NormalVector
+from sympde.topology import IdentityMapping, PolarMapping, TwistedTargetMapping
+from sympde.expr     import BilinearForm, LinearForm, integral
+from sympde.expr     import linearize
+
+__all__ = ('Workload', 'WORKLOADS', 'MAPPINGS', 'DIMS', 'build',
+           'multipatch_channel', 'sip_form')
+
+#==============================================================================
+Workload = namedtuple('Workload', ['form', 'mapping', 'trials', 'tests', 'residual', 'fields'])
+Workload.__new__.__defaults__ = (None, None)
+
+MAPPINGS = ('identity', 'curved')
+DIMS     = (2, 3)
+
+def _mapping(kind, dim, name='M'):
+    if kind == 'identity':
+        return IdentityMapping(name, dim)
+
+    elif kind == 'curved':
+        if dim == 2:
+            return PolarMapping(name, 2, c1=0., c2=0., rmin=0.5, rmax=1.)
+        else:
+            return TwistedTargetMapping(name, 3, c1=0., c2=0., c3=0., k=0.3, D=0.2)
+
+    raise ValueError('> Unknown mapping {}'.format(kind))
+
+def _domain(mapping, dim, name='Omega'):
+    M = _mapping(mapping, dim)
+    logical_domain = Square('A') if dim == 2 else Cube('A')
+    return M, M(logical_domain)
+
+#==============================================================================
+def poisson(mapping, dim):
+    M, domain = _domain(mapping, dim)
+
+    V    = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    return Workload(a, M, (u,), (v,))
+
+def vector_laplace(mapping, dim):
+    M, domain = _domain(mapping, dim)
+
+    V    = VectorFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, inner(grad(u), grad(v))))
+    return Workload(a, M, (u,), (v,))
+
+def stokes(mapping, dim):
+    M, domain = _domain(mapping, dim)
+
+    V    = VectorFunctionSpace('V', domain)
+    W    = ScalarFunctionSpace('W', domain)
+    u, v = elements_of(V, names='u, v')
+    p, q = elements_of(W, names='p, q')
+
+    expr = inner(grad(u), grad(v)) - div(u)*q - p*div(v)
+    a    = BilinearForm(((u, p), (v, q)), integral(domain, expr))
+    return Workload(a, M, (u, p), (v, q))
+
+def maxwell(mapping, dim):
+    M, domain = _domain(mapping, dim)
+
+    V    = VectorFunctionSpace('V', domain, kind='hcurl')
+    u, v = elements_of(V, names='u, v')
+    mu   = Constant('mu', is_real=True)
+
+    if dim == 2:
+        expr = curl(u)*curl(v) + mu*dot(u, v)
+    else:
+        expr = dot(curl(u), curl(v)) + mu*dot(u, v)
+    a    = BilinearForm((u, v), integral(domain, expr))
+    return Workload(a, M, (u,), (v,))
+
+def dg_multipatch(mapping, dim):
+    """ Symmetric interior penalty on two patches. """
+    M1 = _mapping(mapping, dim, name='M1')
+    M2 = _mapping(mapping, dim, name='M2')
+    if dim == 2:
+        A, B = Square('A'), Square('B', bounds1=(1., 2.))
+    else:
+        A, B = Cube('A'), Cube('B', bounds1=(1., 2.))
+
+    D1 = M1(A)
+    D2 = M2(B)
+    domain = D1.join(D2, name='Omega',
+                     bnd_minus=D1.get_boundary(axis=0, ext=1),
+                     bnd_plus =D2.get_boundary(axis=0, ext=-1))
+
+    V     = ScalarFunctionSpace('V', domain, kind=None)
+    u, v  = elements_of(V, names='u, v')
+    I     = domain.interfaces
+    nn    = NormalVector('nn')
+    kappa = Constant('kappa', is_real=True)
+
+    expr_I = (- jump(u)*jump(dot(grad(v), nn))
+              - jump(v)*jump(dot(grad(u), nn))
+              + kappa*jump(u)*jump(v))
+
+    expr = integral(domain, dot(grad(u), grad(v))) + integral(I, expr_I)
+    a    = BilinearForm((u, v), expr)
+    return Workload(a, None, (u,), (v,))
+
+def navier_stokes(mapping, dim):
+    """ Jacobian of the steady Navier-Stokes residual (Newton iteration).
+    The convection term is written in rotational form, curl(u) x u, with the
+    Bernoulli pressure p. """
+    M, domain = _domain(mapping, dim)
+
+    V    = VectorFunctionSpace('V', domain)
+    W    = ScalarFunctionSpace('W', domain)
+    u, v = elements_of(V, names='u, v')
+    p, q = elements_of(W, names='p, q')
+    du   = element_of(V, name='du')
+    dp   = element_of(W, name='dp')
+    nu   = Constant('nu', is_real=True)
+
+    if dim == 2:
+        conv = curl(u)*cross(u, v)
+    else:
+        conv = dot(cross(curl(u), u), v)
+    expr = conv + nu*inner(grad(u), grad(v)) - p*div(v) + div(u)*q
+    l    = LinearForm((v, q), integral(domain, expr))
+    a    = linearize(l, [u, p], trials=[du, dp])
+    return Workload(a, M, (du, dp), (v, q), residual=l, fields=(u, p))
+
+#==============================================================================
+def multipatch_channel(n_patches):
+    """ Rectangle [0, n_patches] x [0, 1] made of n_patches unit squares. """
+    patches = [Square('A{}'.format(i), bounds1=(i, i+1), bounds2=(0, 1))
+               for i in range(n_patches)]
+
+    domain = patches[0]
+    for i in range(1, n_patches):
+        domain = domain.join(patches[i], name='D{}'.format(i),
+                             bnd_minus=patches[i-1].get_boundary(axis=0, ext=1),
+                             bnd_plus =patches[i  ].get_boundary(axis=0, ext=-1))
+    return domain
+
+def sip_form(domain, coupled=False):
+    """ Symmetric interior penalty discretization of the Poisson problem, or
+    of a system of two Poisson problems coupled on the interfaces. """
+    V     = ScalarFunctionSpace('V', domain, kind=None)
+    kappa = Constant('kappa')
+    I     = domain.interfaces
+
+    def sip(u, v):
+        return - avg(Dn(u)) * jump(v) - avg(Dn(v)) * jump(u) + kappa * jump(u) * jump(v)
+
+    if not coupled:
+        u, v = elements_of(V, names='u, v')
+        return BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)))
+                                  + integral(I, sip(u, v)))
+
+    u, p = elements_of(V, names='u, p')
+    v, q = elements_of(V, names='v, q')
+    return BilinearForm(((u, p), (v, q)),
+                        integral(domain, dot(grad(u), grad(v)) + dot(grad(p), grad(q)))
+                      + integral(I, sip(u, v) + sip(p, q) + sip(u, q)))
+
+#==============================================================================
+WORKLOADS = {
+    'poisson'        : poisson,
+    'vector_laplace' : vector_laplace,
+    'stokes'         : stokes,
+    'maxwell'        : maxwell,
+    'dg_multipatch'  : dg_multipatch,
+    'navier_stokes'  : navier_stokes,
+}
+
+def build(name, mapping, dim):
+    """ Build the workload with the given name. """
+    return WORKLOADS[name](mapping, dim)
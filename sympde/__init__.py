@@ -1,5 +1,53 @@
-from .version   import __version__
-from .core      import *
-from .topology  import *
-from .exterior  import *
-from .printing  import *
+"""
+SymPDE: symbolic calculus for partial differential equations.
+
+The subpackages are imported on demand: importing `sympde` (or one of its
+subpackages, e.g. `sympde.expr`) does not import the others. The names of the
+subpackages core, topology, exterior and printing can still be accessed from
+the `sympde` namespace (e.g. `sympde.Square`, `from sympde import *`), in which
+case these subpackages are imported on first access.
+
+"""
+from importlib import import_module as _import_module
+
+from .version import __version__
+
+# Subpackages whose names are exported by sympde, by increasing precedence
+_exported = ('core', 'topology', 'exterior', 'printing')
+
+_submodules = _exported + ('analysis', 'calculus', 'expr', 'cache', 'config', 'serialization', 'version')
+
+_loaded = False
+
+def _load():
+    """ Import the exported subpackages, as `from .core import *` etc. """
+    global _loaded
+    namespace = globals()
+    for name in _exported:
+        module = _import_module('.' + name, __name__)
+        names  = getattr(module, '__all__', None)
+        if names is None:
+            names = [n for n in vars(module) if not n.startswith('_')]
+        namespace.update((n, getattr(module, n)) for n in names)
+    _loaded = True
+
+def __getattr__(name):
+    if name in _submodules:
+        return _import_module('.' + name, __name__)
+
+    if name == '__all__':
+        _load()
+        return [n for n in globals() if not n.startswith('_')]
+
+    if not _loaded and not name.startswith('__'):
+        _load()
+        try:
+            return globals()[name]
+        except KeyError:
+            pass
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+def __dir__():
+    _load()
+    return sorted(globals())
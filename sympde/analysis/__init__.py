@@ -0,0 +1,3 @@
+from .metrics    import *
+from .quadrature import *
+from .sparsity   import *
@@ -0,0 +1,260 @@
+# coding: utf-8
+
+"""
+Size and cost metrics of symbolic expressions, used to predict the cost of
+the code generated from a form before generating it.
+
+The metrics are computed on the expression tree of any SymPDE object: a form
+(whose expression is used), the output of `TerminalExpr` (tuple of kernel
+expressions), of `LogicalExpr` or of `SymbolicExpr`, a matrix, or a tuple of
+these. The expression is traversed once, every distinct node being visited
+once (hash-consing), and the counts on the tree follow from the number of
+occurrences of every node.
+
+"""
+
+from collections import OrderedDict
+
+from sympy import Add, Mul, Pow, Symbol, exp, log
+from sympy.core.basic import Basic
+from sympy.core.function import Function
+from sympy.matrices.matrices import MatrixBase
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+from sympy.functions.elementary.trigonometric import InverseTrigonometricFunction
+from sympy.functions.elementary.hyperbolic import HyperbolicFunction
+
+from sympde.core.utils           import function_pattern
+from sympde.topology.basic       import BasicDomain
+from sympde.topology.space       import BasicFunctionSpace
+from sympde.topology.space       import ScalarTestFunction, VectorTestFunction
+from sympde.topology.space       import ScalarField, VectorField
+from sympde.topology.mapping     import BasicMapping
+from sympde.topology.derivatives import _partial_derivatives
+from sympde.topology.derivatives import _logical_partial_derivatives
+from sympde.expr.basic           import BasicForm
+from sympde.expr.evaluation      import KernelExpression
+
+__all__ = ('ExpressionCost', 'cost')
+
+_operations = ('add', 'mul', 'div', 'pow', 'transcendental', 'function')
+
+_transcendental = (exp, log, TrigonometricFunction, InverseTrigonometricFunction,
+                   HyperbolicFunction)
+
+_derivatives = _partial_derivatives + _logical_partial_derivatives
+
+# Objects whose arguments are not part of the expression
+_leaves = (BasicDomain, BasicFunctionSpace, BasicMapping)
+
+_functions = (ScalarTestFunction, VectorTestFunction, ScalarField, VectorField)
+
+#==============================================================================
+class ExpressionCost(object):
+    """
+    Size and cost metrics of an expression (see cost).
+
+    Parameters
+    ----------
+    nodes : int
+        Number of nodes of the expression tree.
+
+    dag_size : int
+        Number of distinct nodes, i.e. size of the expression DAG.
+
+    operations : dict
+        Number of arithmetic operations in the expression tree, by type:
+        'add', 'mul', 'div', 'pow' (including roots), 'transcendental'
+        (calls to exp, log, trigonometric and hyperbolic functions) and
+        'function' (calls to other elementary functions, e.g. Abs).
+
+    derivatives : tuple
+        Distinct partial derivatives of the functions (or their symbols)
+        which are needed to evaluate the expression.
+
+    depth : int
+        Largest depth of the expression tree.
+
+    """
+    def __init__(self, nodes, dag_size, operations, derivatives, depth):
+        self._nodes       = nodes
+        self._dag_size    = dag_size
+        self._operations  = OrderedDict((k, operations.get(k, 0)) for k in _operations)
+        self._derivatives = tuple(derivatives)
+        self._depth       = depth
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def dag_size(self):
+        return self._dag_size
+
+    @property
+    def operations(self):
+        return self._operations
+
+    @property
+    def total_operations(self):
+        return sum(self._operations.values())
+
+    @property
+    def derivatives(self):
+        return self._derivatives
+
+    @property
+    def depth(self):
+        return self._depth
+
+    def as_dict(self):
+        d = OrderedDict()
+        d['nodes']       = self._nodes
+        d['dag_size']    = self._dag_size
+        d.update(self._operations)
+        d['derivatives'] = len(self._derivatives)
+        d['depth']       = self._depth
+        return d
+
+    def __repr__(self):
+        return 'ExpressionCost({})'.format(', '.join('{}={}'.format(k, v)
+                                           for k, v in self.as_dict().items()))
+
+#==============================================================================
+def _roots(expr):
+    """ Expression trees of a SymPDE object. """
+    if isinstance(expr, BasicForm):
+        return [expr.expr]
+
+    if isinstance(expr, KernelExpression):
+        return _roots(expr.expr)
+
+    if isinstance(expr, MatrixBase):
+        return list(expr)
+
+    if isinstance(expr, (tuple, list)):
+        return [r for e in expr for r in _roots(e)]
+
+    if isinstance(expr, Basic):
+        return [expr]
+
+    raise TypeError('> Cannot compute the cost of {}'.format(type(expr)))
+
+def _children(node):
+    if isinstance(node, MatrixBase):
+        return list(node)
+    if isinstance(node, _leaves):
+        return ()
+    return [a for a in node.args if isinstance(a, Basic)]
+
+def _operation_counts(node):
+    """ Arithmetic operations performed by a node (not by its arguments). """
+    if isinstance(node, Add):
+        return {'add': len(node.args) - 1}
+
+    if isinstance(node, Mul):
+        factors = [a for a in node.args if not (isinstance(a, Pow) and a.exp.is_negative)]
+        return {'mul': max(len(factors) - 1, 0)}
+
+    if isinstance(node, Pow):
+        if node.exp.is_negative:
+            return {'div': 1, 'pow': int(node.exp != -1)}
+        return {'pow': 1}
+
+    if isinstance(node, _transcendental):
+        return {'transcendental': 1}
+
+    if isinstance(node, Function) and type(node).__module__.startswith('sympy.functions'):
+        return {'function': 1}
+
+    return {}
+
+def _is_derivative(node, pattern):
+    """ True if node is a partial derivative of a function, or the symbol of
+    the derivative of one of the functions matched by pattern (see
+    function_pattern), as printed by SymbolicExpr. """
+    if isinstance(node, _derivatives):
+        return True
+    if pattern is None or not isinstance(node, Symbol):
+        return False
+    match = pattern.match(node.name)
+    return bool(match and match.group(3))
+
+#==============================================================================
+def cost(expr, functions=()):
+    """
+    Size and cost metrics of a SymPDE object.
+
+    Parameters
+    ----------
+    expr : BasicForm | tuple | KernelExpression | Matrix | sympy.Expr
+        A form, the output of TerminalExpr, LogicalExpr or SymbolicExpr, or
+        a tuple of these.
+
+    functions : iterable
+        Functions (or their names) whose derivatives appear as symbols in the
+        expression, e.g. in the output of SymbolicExpr, where the symbol u_x1
+        stands for the derivative of u. The test and trial functions and the
+        fields of the expression are always taken into account.
+
+    Returns
+    -------
+    cost : ExpressionCost
+        Metrics of the expression; the nodes shared by several expressions of
+        a tuple are counted once in the size of the DAG.
+
+    """
+    roots = _roots(expr)
+
+    # ... symbols of the derivatives of the functions
+    names = {f if isinstance(f, str) else str(f.name) for f in functions}
+    for r in roots:
+        names.update(str(f.name) for f in r.atoms(*_functions))
+    pattern = function_pattern(sorted(names))
+    # ...
+
+    # ... distinct nodes, children before parents
+    order   = []
+    visited = set()
+    stack   = [(r, False) for r in reversed(roots)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.append((node, True))
+        stack.extend((c, False) for c in reversed(_children(node)) if c not in visited)
+    # ...
+
+    # ... depth of every node
+    depth = {}
+    for node in order:
+        depth[node] = 1 + max([depth[c] for c in _children(node)], default=0)
+    # ...
+
+    # ... number of occurrences of every node in the trees, parents first
+    occurrences = dict.fromkeys(order, 0)
+    for r in roots:
+        occurrences[r] += 1
+
+    derivatives = OrderedDict((r, None) for r in roots if _is_derivative(r, pattern))
+    for node in reversed(order):
+        n = occurrences[node]
+        for c in _children(node):
+            occurrences[c] += n
+            if _is_derivative(c, pattern) and not isinstance(node, _derivatives):
+                derivatives[c] = None
+    # ...
+
+    operations = dict.fromkeys(_operations, 0)
+    for node in order:
+        for k, v in _operation_counts(node).items():
+            operations[k] += v * occurrences[node]
+
+    return ExpressionCost(nodes       = sum(occurrences.values()),
+                          dag_size    = len(order),
+                          operations  = operations,
+                          derivatives = sorted(derivatives, key=str),
+                          depth       = max([depth[r] for r in roots], default=0))
@@ -0,0 +1,299 @@
+# coding: utf-8
+
+"""
+Polynomial degree of the integrands of variational forms, and quadrature
+rules which integrate them exactly.
+
+The terminal expression of a form (see `sympde.expr.TerminalExpr`) is pulled
+back on the logical domain (see `sympde.topology.LogicalExpr`), multiplied by
+the measure of the mapping, and converted with `SymbolicExpr`. Along every
+logical axis, the test, trial and field functions are polynomials on every
+element (e.g. B-splines) of the given degree, lowered by the order of their
+derivatives, while the coefficients are classified as
+
+- 'polynomial' (constant or polynomial coefficients, affine mappings);
+
+- 'rational' (the metric of polynomial mappings, e.g. splines);
+
+- 'transcendental' (any other function of the coordinates, e.g. the metric
+  of a polar mapping along the angle, or the square root of the boundary
+  measure), in which case no quadrature rule is exact.
+
+"""
+
+from sympy import simplify, cancel, fraction, degree as _degree
+from sympy import Matrix, ImmutableDenseMatrix, Dummy, symbols
+
+from sympde.core.utils       import function_pattern, split_terms
+from sympde.topology.space   import ScalarTestFunction, VectorTestFunction
+from sympde.topology.space   import ScalarField, VectorField
+from sympde.topology.mapping import LogicalExpr, SymbolicExpr
+from sympde.expr.basic       import BasicForm
+from sympde.expr.evaluation  import TerminalExpr
+from sympde.expr.evaluation  import KernelExpression, DomainExpression, BoundaryExpression
+
+__all__ = ('IntegrandDegree', 'integrand_degree')
+
+_kinds = ('polynomial', 'rational', 'transcendental')
+
+#==============================================================================
+class IntegrandDegree(object):
+    """
+    Polynomial degree of (a block of) an integrand, along every logical axis.
+
+    Parameters
+    ----------
+    degree : tuple of int
+        Degree of the integrand along every axis; for non-polynomial
+        integrands, degree of the numerators of their coefficients.
+
+    test_degree : tuple of int
+        Largest degree of the test functions (or their derivatives), if any.
+
+    trial_degree : tuple of int
+        Largest degree of the trial functions (or their derivatives), if any.
+
+    kind : str
+        'polynomial', 'rational' or 'transcendental'.
+
+    axes : tuple of int
+        Axes of integration: all the axes of a domain, all but the normal
+        axis of a boundary.
+
+    """
+    def __init__(self, degree, test_degree, trial_degree, kind, axes):
+        self._degree       = tuple(int(d) for d in degree)
+        self._test_degree  = test_degree
+        self._trial_degree = trial_degree
+        self._kind         = kind
+        self._axes         = tuple(axes)
+
+    @property
+    def degree(self):
+        return self._degree
+
+    @property
+    def test_degree(self):
+        return self._test_degree
+
+    @property
+    def trial_degree(self):
+        return self._trial_degree
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def axes(self):
+        return self._axes
+
+    @property
+    def is_exact(self):
+        """ True if the Gauss rule given by gauss_points is exact. """
+        return self._kind == 'polynomial'
+
+    @property
+    def gauss_points(self):
+        """ Minimal number of Gauss-Legendre points along every axis of
+        integration (None along the normal axis of a boundary), which
+        integrates exactly polynomials of the given degree. """
+        return tuple(d//2 + 1 if i in self._axes else None
+                     for i, d in enumerate(self._degree))
+
+    def __repr__(self):
+        return 'IntegrandDegree(degree={}, kind={})'.format(self._degree, self._kind)
+
+#==============================================================================
+def _degrees(degree, name, index, dim):
+    """ Degrees along every axis of the function (or component) name. """
+    if isinstance(degree, dict):
+        keys = ['{}{}'.format(name, index or ''), name]
+        for k in keys:
+            if k in degree:
+                degree = degree[k]
+                break
+        else:
+            raise ValueError('> No degree given for {}'.format(keys[0]))
+
+    if isinstance(degree, int):
+        return (degree,)*dim
+
+    if len(degree) != dim:
+        raise ValueError('> Expecting {} degrees, given {}'.format(dim, degree))
+    return tuple(degree)
+
+def _orders(symbol, pattern, dim):
+    """ Orders of the logical derivatives along every axis of a function symbol. """
+    m = pattern.match(symbol.name)
+    orders = [0]*dim
+    for i in range(dim):
+        orders[i] = (m.group(3) or '').count('x{}'.format(i+1))
+    return m.group(1), m.group(2), orders
+
+def _basis_degree(symbol, pattern, degree, dim):
+    name, index, orders = _orders(symbol, pattern, dim)
+    p = _degrees(degree, name, index, dim)
+    return tuple(max(p[i] - orders[i], 0) for i in range(dim))
+
+def _coefficient_degree(c, t):
+    """ Degree in t (of the numerator) of c, and the kind of c. """
+    if not c.has(t):
+        return 0, 'polynomial'
+
+    if c.is_polynomial(t):
+        return _degree(c, t), 'polynomial'
+
+    if c.is_rational_function(t):
+        n, d = fraction(cancel(c))
+        return _degree(n, t), 'polynomial' if not d.has(t) else 'rational'
+
+    return 0, 'transcendental'
+
+def _entry_degree(expr, tests, trials, fields, degree, dim, axes):
+    """ Degree of an entry of a symbolic expression. """
+    if expr == 0:
+        return None
+
+    coordinates = symbols('x1:{}'.format(dim + 1))
+
+    # ... (test, trial, coefficient) terms
+    terms = split_terms(expr, tests, trials)
+    if tests is None:
+        terms = [(None, None, terms)]
+    elif trials is None:
+        terms = [(v, None, c) for v, c in terms]
+    else:
+        terms = [(v, u, c) for v, coeffs in terms for u, c in coeffs]
+    # ...
+
+    t = Dummy('t')
+    result = [0]*dim
+    test_degree  = [0]*dim if tests  else None
+    trial_degree = [0]*dim if trials else None
+    kind = 0
+
+    for v, u, c in terms:
+        if not c.is_rational_function(*coordinates):
+            c = simplify(c)
+
+        p_v = _basis_degree(v, tests,  degree, dim) if v is not None else (0,)*dim
+        p_u = _basis_degree(u, trials, degree, dim) if u is not None else (0,)*dim
+
+        functions = [s for s in c.free_symbols if fields and fields.match(s.name)]
+        p_f = {s: _basis_degree(s, fields, degree, dim) for s in functions}
+
+        for i in range(dim):
+            # every function is replaced by a generic polynomial in t
+            subs = {s: s*t**p[i] + Dummy() for s, p in p_f.items()}
+            subs[coordinates[i]] = t
+            d, k = _coefficient_degree(c.xreplace(subs), t)
+
+            result[i] = max(result[i], p_v[i] + p_u[i] + d)
+            kind      = max(kind, _kinds.index(k) if i in axes else 0)
+            if v is not None:
+                test_degree[i] = max(test_degree[i], p_v[i])
+            if u is not None:
+                trial_degree[i] = max(trial_degree[i], p_u[i])
+
+    test_degree  = tuple(test_degree)  if tests  else None
+    trial_degree = tuple(trial_degree) if trials else None
+    return IntegrandDegree(result, test_degree, trial_degree, _kinds[kind], axes)
+
+#==============================================================================
+def integrand_degree(expr, degree, tests=(), trials=(), mapping=None, measure=True):
+    """
+    Polynomial degree of the integrand of a form along every logical axis,
+    from which the minimal Gauss quadrature rule which integrates it exactly
+    follows (see IntegrandDegree.gauss_points).
+
+    Parameters
+    ----------
+    expr : BasicForm | tuple | DomainExpression | BoundaryExpression
+        A form (whose test and trial functions are then used), its terminal
+        expression (in which case a tuple is returned), or one of the
+        elements of the latter.
+
+    degree : int | tuple | dict
+        Degree of the functions along every axis (all the axes if an int);
+        a dict gives the degree of every function, or of its components
+        (e.g. {'u': 2, 'p': 1} or {'u_0': (2, 1), 'u_1': (1, 2)}), as well
+        as of the components of a non-analytical mapping (e.g. 'x', 'y').
+
+    tests : iterable
+        Test functions of the form; empty for a functional.
+
+    trials : iterable
+        Trial functions of the form; empty for a linear form or a functional.
+
+    mapping : Mapping
+        Mapping of the domain; by default the mapping of the domain of
+        integration, if any.
+
+    measure : bool
+        Whether to include the measure of the mapping (Jacobian determinant,
+        or boundary measure) in the integrand, as done by the quadrature.
+
+    Returns
+    -------
+    degree : IntegrandDegree | tuple
+        Degree of the integrand, nested tuples (rows for the test functions,
+        columns for the trial functions) of degrees of its blocks, with None
+        for the zero blocks, or a tuple of the latter for a tuple of
+        expressions.
+
+    """
+    if isinstance(expr, BasicForm):
+        tests  = getattr(expr, 'test_functions',  ())
+        trials = getattr(expr, 'trial_functions', ())
+        expr   = TerminalExpr(expr)
+
+    if isinstance(expr, (tuple, list)):
+        return tuple(integrand_degree(e, degree, tests, trials, mapping, measure)
+                     for e in expr)
+
+    if not isinstance(expr, (DomainExpression, BoundaryExpression)):
+        if isinstance(expr, KernelExpression):
+            raise NotImplementedError('> {} is not available'.format(type(expr).__name__))
+        raise TypeError('> Expecting a DomainExpression or a BoundaryExpression, '
+                        'given {}'.format(type(expr)))
+
+    target = expr.target
+    dim    = target.dim
+    axes   = tuple(range(dim))
+    if isinstance(expr, BoundaryExpression):
+        axes = tuple(i for i in axes if i != target.axis)
+
+    # ... pull-back on the logical domain
+    names = [str(f.name) for f in expr.expr.atoms(ScalarTestFunction, VectorTestFunction,
+                                                  ScalarField, VectorField)]
+    if mapping is None:
+        mapping = getattr(target, 'mapping', None)
+
+    expr = expr.expr
+    if mapping is not None:
+        subs = mapping.is_analytical
+        expr = LogicalExpr(expr, mapping=mapping, dim=dim, subs=subs)
+        if not subs:
+            names += [str(x) for x in mapping.coordinates]
+
+        if measure:
+            if len(axes) == dim:
+                m = mapping.jacobian_det_expr
+            else:
+                m = mapping.boundary_measure_expr(target.axis)
+            expr = expr*simplify(LogicalExpr(m, mapping=mapping, dim=dim, subs=subs))
+    # ...
+
+    tests  = function_pattern(tests)
+    trials = function_pattern(trials)
+    names  = [n for n in set(names) if not any(p and p.match(n) for p in (tests, trials))]
+    fields = function_pattern(sorted(names))
+
+    expr = SymbolicExpr(expr)
+    if isinstance(expr, (Matrix, ImmutableDenseMatrix)):
+        n_rows, n_cols = expr.shape
+        return tuple(tuple(_entry_degree(expr[i,j], tests, trials, fields, degree, dim, axes)
+                           for j in range(n_cols)) for i in range(n_rows))
+
+    return _entry_degree(expr, tests, trials, fields, degree, dim, axes)
@@ -0,0 +1,240 @@
+# coding: utf-8
+
+"""
+Block structure of the terminal expressions of variational forms.
+
+The terminal expression of a form (see `sympde.expr.TerminalExpr`) is a
+matrix of blocks, whose rows correspond to the (scalar components of the)
+test functions and whose columns correspond to the (scalar components of
+the) trial functions; many of these blocks are exactly zero, e.g. the
+off-diagonal blocks of the vector Laplacian or the pressure-pressure block
+of the Stokes problem. The block structure of every domain, boundary and
+interface expression gives the non-zero blocks, the coupling graph between
+the test and trial functions, and whether the blocks are symmetric, so that
+an assembler only allocates and computes the needed blocks.
+
+"""
+
+from collections import OrderedDict
+
+from sympy import Matrix, ImmutableDenseMatrix
+
+from sympde.topology.space  import IndexedTestTrial
+from sympde.expr.basic      import BasicForm
+from sympde.expr.evaluation import TerminalExpr, _unpack_functions
+from sympde.expr.evaluation import KernelExpression
+from sympde.expr.evaluation import BoundaryExpression, InterfaceExpression
+
+__all__ = ('BlockStructure', 'block_structure')
+
+#==============================================================================
+def _base(f):
+    return f.base if isinstance(f, IndexedTestTrial) else f
+
+def _equal(a, b):
+    return a == b or (a - b).expand() == 0
+
+#==============================================================================
+class BlockStructure(object):
+    """
+    Block structure of a kernel expression (see block_structure).
+
+    Parameters
+    ----------
+    kernel : KernelExpression
+        Domain, boundary or interface expression.
+
+    tests : tuple
+        Scalar test functions (or components of vector test functions),
+        corresponding to the rows of the blocks.
+
+    trials : tuple
+        Scalar trial functions (or components), corresponding to the columns
+        of the blocks.
+
+    swap : dict
+        Substitution of the trial functions by the test functions and
+        conversely, if the test and trial spaces are the same.
+
+    transpose : KernelExpression
+        Kernel expression whose blocks are the transposes of the blocks of
+        kernel: kernel itself, except for interface expressions, in which case
+        the sides of the test and trial functions are swapped.
+
+    """
+    def __init__(self, kernel, tests, trials, swap=None, transpose=None):
+        expr = kernel.expr
+        if not isinstance(expr, (Matrix, ImmutableDenseMatrix)):
+            expr = ImmutableDenseMatrix([[expr]])
+
+        self._kernel    = kernel
+        self._blocks    = expr
+        self._tests     = tuple(tests)
+        self._trials    = tuple(trials)
+        self._swap      = swap
+        self._transpose = transpose if transpose is not None else kernel
+        self._pattern   = tuple(tuple(expr[i,j] != 0 for j in range(expr.shape[1]))
+                                for i in range(expr.shape[0]))
+        self._is_symmetric = None
+
+    @property
+    def target(self):
+        return self._kernel.target
+
+    @property
+    def kind(self):
+        """ 'domain', 'boundary' or 'interface'. """
+        if isinstance(self._kernel, InterfaceExpression):
+            return 'interface'
+        if isinstance(self._kernel, BoundaryExpression):
+            return 'boundary'
+        return 'domain'
+
+    @property
+    def tests(self):
+        return self._tests
+
+    @property
+    def trials(self):
+        return self._trials
+
+    @property
+    def shape(self):
+        return self._blocks.shape
+
+    @property
+    def pattern(self):
+        """ Nested tuples of booleans, True for the non-zero blocks. """
+        return self._pattern
+
+    @property
+    def nonzero_blocks(self):
+        """ Indices (row, column) of the non-zero blocks. """
+        return tuple((i, j) for i, row in enumerate(self._pattern)
+                            for j, nz in enumerate(row) if nz)
+
+    @property
+    def density(self):
+        n_rows, n_cols = self.shape
+        return len(self.nonzero_blocks) / (n_rows * n_cols)
+
+    @property
+    def coupling(self):
+        """
+        Coupling graph: dictionary which maps every test function to the trial
+        functions whose blocks with it are non-zero (vector functions are not
+        decomposed into their components); the test functions of a linear
+        form are mapped to an empty tuple, and a functional has no coupling.
+
+        """
+        graph = OrderedDict((_base(v), []) for v in self._tests)
+        if not self._trials:
+            return OrderedDict((v, ()) for v in graph)
+
+        for i, j in self.nonzero_blocks:
+            v, u = _base(self._tests[i]), _base(self._trials[j])
+            if u not in graph[v]:
+                graph[v].append(u)
+        return OrderedDict((v, tuple(us)) for v, us in graph.items())
+
+    @property
+    def is_structurally_symmetric(self):
+        """ True if the pattern of the transposed expression is the transpose
+        of the pattern. """
+        if self._swap is None:
+            return False
+        other = BlockStructure(self._transpose, self._tests, self._trials)
+        n_rows, n_cols = self.shape
+        return all(self._pattern[i][j] == other._pattern[j][i]
+                   for i in range(n_rows) for j in range(n_cols))
+
+    @property
+    def is_symmetric(self):
+        """ True if every block (i, j) is the block (j, i) of the transposed
+        expression, where the test and trial functions are swapped. """
+        if self._is_symmetric is None:
+            self._is_symmetric = self.is_structurally_symmetric
+            if self._is_symmetric:
+                other = BlockStructure(self._transpose, self._tests, self._trials)
+                self._is_symmetric = all(
+                    _equal(self._blocks[i,j].xreplace(self._swap), other._blocks[j,i])
+                    for i, j in self.nonzero_blocks)
+        return self._is_symmetric
+
+    def __repr__(self):
+        return 'BlockStructure({}, {}, {}/{} blocks)'.format(
+               self.kind, self.target, len(self.nonzero_blocks),
+               self.shape[0] * self.shape[1])
+
+#==============================================================================
+def _swap(tests, trials):
+    """ Substitution of the trial functions by the test functions, and
+    conversely, if their spaces are the same. """
+    if len(tests) != len(trials) or not tests:
+        return None
+    if any(u.space != v.space for u, v in zip(trials, tests)):
+        return None
+
+    swap = {}
+    for u, v in zip(trials, tests):
+        swap[u] = v
+        swap[v] = u
+    return swap
+
+def _transpose(kernel, kernels):
+    """ Interface expression with the sides of the test and trial functions
+    swapped. """
+    for k in kernels:
+        if (isinstance(k, InterfaceExpression) and k.target == kernel.target and
+            type(k.trial) is type(kernel.test) and type(k.test) is type(kernel.trial)):
+            return k
+    return None
+
+def block_structure(expr, tests=(), trials=()):
+    """
+    Block structure of the terminal expression of a form (see BlockStructure).
+
+    Parameters
+    ----------
+    expr : BasicForm | tuple | KernelExpression
+        A form (whose test and trial functions are then used), its terminal
+        expression, or one of the elements of the latter.
+
+    tests : iterable
+        Test functions of the form; empty for a functional.
+
+    trials : iterable
+        Trial functions of the form; empty for a linear form or a functional.
+
+    Returns
+    -------
+    structure : BlockStructure | tuple
+        Block structure of the expression, or a tuple of block structures for
+        a tuple of expressions.
+
+    """
+    if isinstance(expr, BasicForm):
+        tests  = getattr(expr, 'test_functions',  ())
+        trials = getattr(expr, 'trial_functions', ())
+        expr   = TerminalExpr(expr)
+
+    kernels = tuple(expr) if isinstance(expr, (tuple, list)) else (expr,)
+    for k in kernels:
+        if not isinstance(k, KernelExpression):
+            raise TypeError('> Expecting a KernelExpression, given {}'.format(type(k)))
+
+    swap        = _swap(tuple(tests), tuple(trials))
+    test_funcs  = _unpack_functions(tests)
+    trial_funcs = _unpack_functions(trials)
+
+    structures = []
+    for k in kernels:
+        transpose = k
+        if isinstance(k, InterfaceExpression):
+            transpose = _transpose(k, kernels)
+        s = swap if transpose is not None else None
+        structures.append(BlockStructure(k, test_funcs, trial_funcs, s, transpose))
+
+    if isinstance(expr, (tuple, list)):
+        return tuple(structures)
+    return structures[0]
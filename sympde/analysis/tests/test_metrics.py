@@ -0,0 +1,87 @@
+# coding: utf-8
+
+import pytest
+
+from sympy import symbols, sin, Abs
+
+from sympde.calculus import grad, dot
+from sympde.topology import Square, PolarMapping
+from sympde.topology import ScalarFunctionSpace, elements_of
+from sympde.topology import LogicalExpr, SymbolicExpr
+from sympde.expr     import BilinearForm, integral
+from sympde.expr     import TerminalExpr
+from sympde.analysis import ExpressionCost, cost
+
+#==============================================================================
+def test_cost_sympy():
+
+    x, y = symbols('x, y')
+    expr = x*y + sin(x)/y**2 + Abs(x)
+
+    c = cost(expr)
+    assert isinstance(c, ExpressionCost)
+    assert c.nodes    == 12
+    assert c.dag_size == 9
+    assert c.depth    == 4
+    assert c.operations == {'add': 2, 'mul': 1, 'div': 1, 'pow': 1,
+                            'transcendental': 1, 'function': 1}
+    assert c.total_operations == 7
+    assert c.derivatives == ()
+
+    # Shared nodes are counted once in the DAG
+    c2 = cost((expr, expr))
+    assert c2.nodes == 2*c.nodes and c2.dag_size == c.dag_size
+
+    with pytest.raises(TypeError):
+        cost(1.5)
+
+#==============================================================================
+def test_cost_pipeline():
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+    t = TerminalExpr(a)
+
+    c = cost(t)
+    assert len(c.derivatives) == 4
+    assert c.operations['add'] == 2 and c.operations['mul'] == 3
+    assert cost(a).nodes < c.nodes
+
+    c = cost(SymbolicExpr(t[0].expr), functions=(u, v))
+    assert [str(d) for d in c.derivatives] == ['u_x1', 'u_x2', 'v_x1', 'v_x2']
+
+    # Only the symbols of the derivatives of the given functions are counted
+    k_x, u_x1, u_0_x2 = symbols('k_x, u_x1, u_0_x2')
+    assert cost(k_x*u_x1).derivatives == ()
+    assert cost(k_x*u_x1*u_0_x2, functions=['u']).derivatives == (u_0_x2, u_x1)
+    assert cost(k_x*u_x1, functions=(u,)).derivatives == (u_x1,)
+
+    # Curved mappings increase the cost of the logical expression
+    M      = PolarMapping('M', 2, c1=0, c2=0, rmin=1, rmax=2)
+    domain = M(Square())
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+    l = LogicalExpr(TerminalExpr(a)[0].expr, mapping=M, dim=2, subs=True)
+
+    c_l = cost(l)
+    assert len(c_l.derivatives) == 4
+    assert c_l.operations['transcendental'] > 0
+    assert c_l.operations['div'] > 0
+    assert c_l.nodes > c.nodes and c_l.depth > c.depth
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,123 @@
+# coding: utf-8
+
+import pytest
+
+from sympde.core     import Constant
+from sympde.calculus import grad, dot, div, inner
+from sympde.topology import Square, Cube, Mapping, PolarMapping, AffineMapping
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import NormalVector, elements_of
+from sympde.expr     import BilinearForm, LinearForm, Functional, integral
+from sympde.expr     import TerminalExpr
+from sympde.analysis import IntegrandDegree, integrand_degree
+
+#==============================================================================
+def test_integrand_degree_2d():
+
+    domain = Square()
+    x1, x2 = domain.coordinates
+    B      = domain.get_boundary(axis=0, ext=1)
+    nn     = NormalVector('nn')
+    kappa  = Constant('kappa')
+
+    V = ScalarFunctionSpace('V', domain)
+    u, v, f = elements_of(V, names='u, v, f')
+
+    a = BilinearForm((u, v), integral(domain, kappa*dot(grad(u), grad(v)) + x1**2*f*u*v) +
+                             integral(B, dot(grad(u), nn)*v))
+    d, d_B = integrand_degree(a, 3)
+
+    assert isinstance(d, IntegrandDegree)
+    assert d.kind == 'polynomial' and d.is_exact
+    assert d.test_degree == d.trial_degree == (3, 3)
+    assert d.degree       == (11, 9)
+    assert d.gauss_points == (6, 5)
+
+    # The normal axis of a boundary is not integrated
+    assert d_B.axes         == (1,)
+    assert d_B.degree[1]    == 6
+    assert d_B.gauss_points == (None, 4)
+
+    # Degrees per axis, and terminal expressions
+    d = integrand_degree(TerminalExpr(a)[0], (2, 1), tests=[v], trials=[u])
+    assert d.degree == (8, 3)
+
+    # Linear forms and functionals
+    l = LinearForm(v, integral(domain, f*v))
+    d, = integrand_degree(l, {'v': 3, 'f': 2})
+    assert d.degree == (5, 5) and d.trial_degree is None
+
+    F = Functional(f**2, domain)
+    d, = integrand_degree(F, 2)
+    assert d.degree == (4, 4) and d.test_degree is None
+
+    with pytest.raises(ValueError):
+        integrand_degree(l, {'v': 3})
+
+#==============================================================================
+def test_integrand_degree_blocks():
+
+    domain = Cube()
+    V = VectorFunctionSpace('V', domain)
+    W = ScalarFunctionSpace('W', domain)
+    u, v = elements_of(V, names='u, v')
+    p, q = elements_of(W, names='p, q')
+
+    a = BilinearForm(((u, p), (v, q)), integral(domain, inner(grad(u), grad(v)) - div(u)*q - p*div(v)))
+    blocks, = integrand_degree(a, {'u': 3, 'v': 3, 'p': 2, 'q': 2})
+
+    assert blocks[0][1] is None and blocks[3][3] is None
+    assert blocks[0][0].degree == (6, 6, 6)
+    assert blocks[3][0].degree == (4, 5, 5)
+    assert blocks[0][3].degree == (4, 5, 5)
+
+#==============================================================================
+def test_integrand_degree_mapping():
+
+    # Affine mapping: polynomial integrand
+    A = AffineMapping('A', 2, c1=0, c2=0, a11=2, a12=1, a21=0, a22=3)
+    domain = A(Square())
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    d, = integrand_degree(BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)))), 3)
+    assert d.kind == 'polynomial' and d.degree == (6, 6)
+
+    # Polar mapping: rational in the radius, polynomial in the angle
+    P = PolarMapping('P', 2, c1=0, c2=0, rmin=1, rmax=2)
+    domain = P(Square())
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    d, = integrand_degree(BilinearForm((u, v), integral(domain, u*v)), 3)
+    assert d.kind == 'polynomial' and d.degree == (7, 6)
+
+    d, = integrand_degree(BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)))), 3)
+    assert d.kind == 'rational' and not d.is_exact
+
+    # Generic mapping: rational metric
+    M = Mapping('M', 2)
+    domain = M(Square())
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, u*v))
+    d, = integrand_degree(a, {'u': 3, 'v': 3, 'x': 2, 'y': 2})
+    assert d.kind == 'polynomial' and d.degree == (9, 9)
+    d, = integrand_degree(a, 3, measure=False)
+    assert d.degree == (6, 6)
+
+    d, = integrand_degree(BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)))), 3)
+    assert d.kind == 'rational'
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,121 @@
+# coding: utf-8
+
+import pytest
+
+from sympde.core     import Constant
+from sympde.calculus import grad, dot, div, inner, jump, avg
+from sympde.topology import Square, Domain, NormalVector
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import element_of, elements_of
+from sympde.expr     import BilinearForm, LinearForm, integral
+from sympde.expr     import TerminalExpr
+from sympde.analysis import BlockStructure, block_structure
+
+#==============================================================================
+def test_block_structure_stokes():
+
+    domain = Square()
+    V = VectorFunctionSpace('V', domain)
+    W = ScalarFunctionSpace('W', domain)
+    u, v = elements_of(V, names='u, v')
+    p, q = elements_of(W, names='p, q')
+
+    a = BilinearForm(((u, p), (v, q)), integral(domain, inner(grad(u), grad(v)) - div(u)*q - p*div(v)))
+    s, = block_structure(a)
+
+    assert isinstance(s, BlockStructure)
+    assert s.kind  == 'domain'
+    assert s.shape == (3, 3)
+    assert s.tests == (v[0], v[1], q) and s.trials == (u[0], u[1], p)
+    assert s.pattern == ((True, False, True), (False, True, True), (True, True, False))
+    assert s.nonzero_blocks == ((0, 0), (0, 2), (1, 1), (1, 2), (2, 0), (2, 1))
+    assert s.coupling == {v: (u, p), q: (u,)}
+    assert s.is_structurally_symmetric and s.is_symmetric
+
+    # Non-symmetric blocks
+    b = Constant('b')
+    a = BilinearForm(((u, p), (v, q)), integral(domain, inner(grad(u), grad(v)) + b*dot(grad(p), v) + div(u)*q))
+    s, = block_structure(TerminalExpr(a), tests=(v, q), trials=(u, p))
+    assert s.is_structurally_symmetric and not s.is_symmetric
+
+    # Linear forms
+    l = LinearForm((v, q), integral(domain, div(v) + q))
+    s, = block_structure(l)
+    assert s.shape == (3, 1)
+    assert not s.is_symmetric
+
+#==============================================================================
+def test_block_structure_interfaces():
+
+    A = Square('A')
+    B = Square('B', bounds1=(1., 2.))
+    domain = A.join(B, name='Omega',
+                    bnd_minus=A.get_boundary(axis=0, ext=1),
+                    bnd_plus=B.get_boundary(axis=0, ext=-1))
+
+    V     = ScalarFunctionSpace('V', domain, kind=None)
+    u, v  = elements_of(V, names='u, v')
+    I     = domain.interfaces
+    nn    = NormalVector('nn')
+    kappa = Constant('kappa', is_real=True)
+
+    # Symmetric interior penalty
+    expr = - jump(u)*avg(dot(grad(v), nn)) - jump(v)*avg(dot(grad(u), nn)) + kappa*jump(u)*jump(v)
+    a    = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))) + integral(I, expr))
+
+    structures = block_structure(a)
+    kinds = [s.kind for s in structures]
+    assert kinds.count('interface') == 2 and kinds.count('domain') == 2
+    assert all(s.is_symmetric for s in structures)
+
+    # Non-symmetric interior penalty
+    expr = jump(u)*avg(dot(grad(v), nn)) - jump(v)*avg(dot(grad(u), nn)) + kappa*jump(u)*jump(v)
+    a    = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))) + integral(I, expr))
+
+    structures = block_structure(a)
+    assert not any(s.is_symmetric for s in structures if s.kind != 'domain')
+    assert all(s.is_structurally_symmetric for s in structures)
+
+#==============================================================================
+def test_block_structure_linear_forms():
+
+    domain = Square()
+    V = ScalarFunctionSpace('V', domain)
+    W = VectorFunctionSpace('W', domain)
+    v = element_of(V, name='v')
+    w = element_of(W, name='w')
+
+    s, = block_structure(LinearForm(v, integral(domain, v)))
+    assert s.shape == (1, 1) and s.trials == ()
+    assert s.coupling == {v: ()}
+    assert not s.is_symmetric
+
+    s, = block_structure(LinearForm((w, v), integral(domain, w[1] + v)))
+    assert s.shape == (3, 1)
+    assert s.pattern == ((False,), (True,), (True,))
+    assert s.coupling == {w: (), v: ()}
+
+    structures = block_structure(LinearForm(v, integral(domain.boundary, v)))
+    assert all(s.kind == 'boundary' and s.coupling == {v: ()} for s in structures)
+
+#==============================================================================
+def test_block_structure_errors():
+
+    domain = Domain('Omega', dim=2)
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    with pytest.raises(TypeError):
+        block_structure(u*v)
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
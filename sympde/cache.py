@@ -0,0 +1,721 @@
+# coding: utf-8
+"""
+Caching facilities for SymPDE.
+
+In-memory caches
+****************
+
+The expensive symbolic functions of SymPDE (evaluation of forms, pull-backs,
+partial derivatives, ...) are memoized with the `cacheit` decorator defined
+here, rather than with the global SymPy cache. Each subsystem owns a separate
+bounded LRU cache, which keeps statistics about its usage:
+
+>>> import sympde.cache
+>>> sympde.cache.stats()['terminal_expr']
+{'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 4096, 'memory': 0}
+>>> sympde.cache.set_maxsize('derivatives', 10000)
+>>> sympde.cache.clear('logical_expr')
+
+The default size of all caches can be set with the environment variable
+SYMPDE_CACHE_MAXSIZE. For backward compatibility, `sympy.core.cache.clear_cache`
+also clears all the SymPDE caches.
+
+On-disk cache
+*************
+
+Evaluating a variational form (see `sympde.expr.evaluation.TerminalExpr`) is a
+purely symbolic operation whose cost is paid again by every new Python process.
+This module provides a persistent, content-addressed cache on disk, which is
+shared by all processes that point to the same directory:
+
+>>> from sympde.cache import enable_disk_cache
+>>> enable_disk_cache('/tmp/sympde_cache', max_size=2**28)
+
+The cache can also be enabled by setting the environment variable
+SYMPDE_CACHE_DIR (and optionally SYMPDE_CACHE_SIZE, in bytes) before importing
+SymPDE.
+
+The entries are keyed on a canonical representation of the evaluated object
+(a form, together with its domain, mapping, spaces and functions), and the
+cache directory is bounded in size with a least-recently-used eviction policy.
+New entries are written to a temporary file which is then atomically renamed,
+hence several processes can safely read and write the same directory at the
+same time.
+
+Notes
+-----
+The cached values are stored with the `pickle` module: only use directories
+which are not writable by untrusted users.
+
+"""
+
+import os
+import io
+import sys
+import pickle
+import hashlib
+import types
+import tempfile
+import threading
+
+from collections import OrderedDict
+from functools   import wraps
+from numbers     import Number
+
+from sympy.core           import Basic
+from sympy.core.singleton import Singleton
+from sympy.core.cache     import CACHE as _sympy_cache_registry
+from sympy                import __version__ as sympy_version
+
+from sympde.version import __version__ as sympde_version
+
+__all__ = (
+    'DiskCache',
+    'LRUCache',
+    'cacheit',
+    'canonical_key',
+    'clear',
+    'disable_disk_cache',
+    'dumps',
+    'enable_disk_cache',
+    'get_cache',
+    'get_disk_cache',
+    'loads',
+    'set_maxsize',
+    'stats',
+)
+
+#==============================================================================
+# In-memory caches
+#==============================================================================
+_default_maxsize = int(os.environ.get('SYMPDE_CACHE_MAXSIZE', 4096))
+
+class LRUCache(object):
+    """
+    A bounded, thread-safe mapping which discards the least recently used
+    entries, and keeps track of its hits, misses and evictions.
+
+    Parameters
+    ----------
+    name : str
+        Name of the subsystem which owns the cache.
+
+    maxsize : int
+        Maximum number of entries.
+
+    """
+    def __init__(self, name, maxsize=_default_maxsize):
+        if maxsize <= 0:
+            raise ValueError('> maxsize must be positive')
+
+        self._name      = name
+        self._maxsize   = int(maxsize)
+        self._data      = OrderedDict()
+        self._lock      = threading.RLock()
+        self.hits       = 0
+        self.misses     = 0
+        self.evictions  = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        if value <= 0:
+            raise ValueError('> maxsize must be positive')
+        with self._lock:
+            self._maxsize = int(value)
+            self._shrink()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """ Return the value stored with key (marking it as recently used),
+        or default. Raise TypeError if the key is not hashable. """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """ Store a value, evicting the least recently used entries if needed.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._shrink()
+
+    def _shrink(self):
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """ Remove all entries and reset the statistics. """
+        with self._lock:
+            self._data.clear()
+            self.hits      = 0
+            self.misses    = 0
+            self.evictions = 0
+
+    def memory(self):
+        """
+        Estimate the memory used by the cache, in bytes.
+
+        All the objects reachable from the keys and values are visited (SymPy
+        objects through their arguments), and the objects which are shared
+        between several entries are only counted once.
+        """
+        with self._lock:
+            stack = [self._data]
+
+        seen  = set()
+        total = 0
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+
+            if isinstance(obj, Basic):
+                stack.extend(obj.args)
+            elif isinstance(obj, (tuple, list, set, frozenset)):
+                stack.extend(obj)
+            elif isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+        return total
+
+    def info(self):
+        """ Return a dictionary with the statistics of the cache. """
+        return dict(hits      = self.hits,
+                    misses    = self.misses,
+                    evictions = self.evictions,
+                    size      = len(self._data),
+                    maxsize   = self._maxsize,
+                    memory    = self.memory())
+
+    def __repr__(self):
+        return 'LRUCache({!r}, maxsize={})'.format(self._name, self._maxsize)
+
+#==============================================================================
+_registry = OrderedDict()
+_missing  = object()
+
+def get_cache(subsystem):
+    """ Return the LRUCache of a subsystem, creating it if needed. """
+    try:
+        return _registry[subsystem]
+    except KeyError:
+        cache = LRUCache(subsystem)
+        _registry[subsystem] = cache
+        return cache
+
+def cacheit(subsystem):
+    """
+    Decorator which memoizes a function in the cache of the given subsystem.
+
+    This is a drop-in replacement for sympy.cacheit: the arguments (and their
+    types) are used as key, the result must be immutable, and the function is
+    called without caching if some argument is not hashable.
+
+    Examples
+    --------
+    >>> @cacheit('derivatives')
+    ... def f(expr):
+    ...     return expr.expand()
+
+    """
+    cache = get_cache(subsystem)
+
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func, args, tuple(type(a) for a in args))
+            if kwargs:
+                items = tuple(sorted(kwargs.items()))
+                key  += (items, tuple(type(v) for _, v in items))
+
+            try:
+                value = cache.get(key, _missing)
+            except TypeError:
+                cache.misses += 1
+                return func(*args, **kwargs)
+
+            if value is _missing:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+
+            return value
+
+        wrapper.cache       = cache
+        wrapper.cache_info  = cache.info
+        wrapper.cache_clear = cache.clear
+
+        # Let sympy.core.cache.clear_cache() clear our caches too
+        _sympy_cache_registry.append(wrapper)
+
+        return wrapper
+
+    return decorator
+
+def stats(subsystem=None):
+    """
+    Return the statistics of the in-memory caches.
+
+    Parameters
+    ----------
+    subsystem : str
+        If given, only the statistics of this subsystem are returned.
+
+    Returns
+    -------
+    info : dict
+        Number of hits, misses and evictions, current and maximum number of
+        entries, and estimated memory in bytes. If no subsystem is given, a
+        dictionary of such dictionaries is returned, indexed by subsystem.
+
+    """
+    if subsystem is not None:
+        return _get_registered(subsystem).info()
+
+    return OrderedDict((name, cache.info()) for name, cache in _registry.items())
+
+def clear(subsystem=None):
+    """ Clear the in-memory cache of one subsystem, or all of them. """
+    if subsystem is not None:
+        _get_registered(subsystem).clear()
+    else:
+        for cache in _registry.values():
+            cache.clear()
+
+def set_maxsize(subsystem, maxsize):
+    """ Set the maximum number of entries in the cache of a subsystem. """
+    _get_registered(subsystem).maxsize = maxsize
+
+def _get_registered(subsystem):
+    try:
+        return _registry[subsystem]
+    except KeyError:
+        raise ValueError("Unknown cache subsystem '{}', available: {}".format(
+            subsystem, ', '.join(_registry.keys()))) from None
+
+#==============================================================================
+# Serialization of SymPy/SymPDE objects
+#==============================================================================
+def _slot_descriptors(cls, _cache={}):
+    """
+    Return the (name, descriptor) pairs of all the slots defined along the MRO
+    of a class. The descriptors are needed because some SymPDE classes shadow
+    a slot with a read-only property (e.g. 'name' in ScalarTestFunction).
+    """
+    try:
+        return _cache[cls]
+    except KeyError:
+        pass
+
+    # A slot may be redefined by a subclass (e.g. 'p' in Rational and
+    # Integer), in which case only the most derived descriptor is used
+    slots = []
+    names = set()
+    for klass in cls.__mro__:
+        klass_slots = klass.__dict__.get('__slots__', ())
+        if isinstance(klass_slots, str):
+            klass_slots = (klass_slots,)
+        for name in klass_slots:
+            if name in names or name in ('__dict__', '__weakref__'):
+                continue
+            names.add(name)
+            slots.append((name, klass.__dict__[name]))
+
+    _cache[cls] = tuple(slots)
+    return _cache[cls]
+
+def _get_slots(obj):
+    """ Return the values of all the slots which are set, except for the
+    cached hash.
+    """
+    slots = []
+    for name, descriptor in _slot_descriptors(type(obj)):
+        if name == '_mhash':
+            continue
+        try:
+            slots.append((name, descriptor.__get__(obj, type(obj))))
+        except AttributeError:
+            pass
+    return tuple(slots)
+
+def _get_state(obj):
+    """ Return the full state of a SymPy object, i.e. all its slots and all
+    the attributes in its instance dictionary. The cached hash is dropped.
+    """
+    state = dict(_get_slots(obj))
+    state.update(getattr(obj, '__dict__', {}))
+    return state
+
+def _new_instance(cls, slots):
+    """ Create an instance of a SymPy class from the values of its slots,
+    without calling __new__.
+    """
+    obj = object.__new__(cls)
+    descriptors = dict(_slot_descriptors(cls))
+    descriptors['_mhash'].__set__(obj, None)
+    for name, value in slots:
+        descriptors[name].__set__(obj, value)
+    return obj
+
+def _reduce_basic(obj):
+    # The slots (which include the arguments) are needed to create the new
+    # object, while the instance dictionary is restored afterwards: in this
+    # way the pickler can resolve reference cycles like the one between a
+    # Mapping and its JacobianSymbol.
+    return _new_instance, (type(obj), _get_slots(obj)), getattr(obj, '__dict__', None) or None
+
+class _BasicDispatchTable(dict):
+    """
+    Dispatch table for the pickler, which handles all subclasses of Basic.
+
+    SymPDE objects keep part of their state in private attributes and often
+    have constructors whose signature differs from their `args`, hence the
+    default SymPy pickling (which calls `cls(*obj.args)`) cannot rebuild them.
+    Here the objects are rebuilt structurally instead: an empty instance is
+    created and its slots and attributes are restored. Singletons (S.Zero,
+    S.One, ...) are left to the default mechanism.
+
+    """
+    def __missing__(self, cls):
+        if issubclass(cls, Basic) and not isinstance(cls, Singleton):
+            return _reduce_basic
+        raise KeyError(cls)
+
+    def get(self, cls, default=None):
+        try:
+            return self[cls]
+        except KeyError:
+            return default
+
+_dispatch_table = _BasicDispatchTable()
+
+def dumps(obj):
+    """ Serialize a SymPDE object (or any container of them) to bytes.
+    """
+    f = io.BytesIO()
+    p = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    p.dispatch_table = _dispatch_table
+    p.dump(obj)
+    return f.getvalue()
+
+def loads(data):
+    """ Rebuild a SymPDE object from the bytes returned by `dumps`.
+    """
+    return pickle.loads(data)
+
+#==============================================================================
+# Canonical keys
+#==============================================================================
+# Attributes which only cache derived information, and hence must not
+# contribute to the key of an object
+_transient_attributes = ('_args', '_assumptions', '_kwargs', '_is_symmetric', 'index',
+                         '_check_pending', '_binding', '_adjacency', '_interfaces',
+                         '_order_key')
+
+def _canonical(obj, memo):
+
+    if isinstance(obj, Basic):
+        k = id(obj)
+        if k in memo:
+            return memo[k]
+
+        # Protect against reference cycles
+        memo[k] = '<cycle>'
+
+        cls  = type(obj)
+        name = '{}.{}'.format(cls.__module__, cls.__name__)
+        args = ','.join(_canonical(a, memo) for a in obj.args)
+
+        state = _get_state(obj)
+        for attr in _transient_attributes:
+            state.pop(attr, None)
+
+        # User-specified assumptions are part of the identity of a Symbol
+        if obj.is_Symbol:
+            state['assumptions0'] = obj.assumptions0
+
+        state = _canonical(state, memo) if state else ''
+        memo[k] = '{}({};{})'.format(name, args, state)
+        return memo[k]
+
+    elif isinstance(obj, (str, Number, bool, type(None))):
+        return repr(obj)
+
+    elif isinstance(obj, type):
+        return '{}.{}'.format(obj.__module__, obj.__qualname__)
+
+    elif isinstance(obj, (tuple, list)):
+        return '[{}]'.format(','.join(_canonical(a, memo) for a in obj))
+
+    elif isinstance(obj, (set, frozenset)):
+        return '{{{}}}'.format(','.join(sorted(_canonical(a, memo) for a in obj)))
+
+    elif isinstance(obj, dict) or hasattr(obj, 'items'):
+        items = sorted('{}:{}'.format(_canonical(k, memo), _canonical(v, memo))
+                       for k, v in obj.items())
+        return '{{{}}}'.format(','.join(items))
+
+    elif isinstance(obj, (types.FunctionType, types.BuiltinFunctionType)):
+        # A function is identified by its name, hence lambdas and closures,
+        # whose behaviour is not determined by their name, cannot be keyed
+        name = getattr(obj, '__qualname__', obj.__name__)
+        if '<lambda>' in name or '<locals>' in name or getattr(obj, '__closure__', None):
+            raise TypeError('> Cannot compute the canonical key of {!r}'.format(obj))
+        return '{}.{}'.format(obj.__module__, name)
+
+    else:
+        raise TypeError('> Cannot compute the canonical key of {!r}'.format(obj))
+
+def canonical_key(*objs):
+    """
+    Compute a content-addressed key for the given objects.
+
+    Two objects which are structurally identical (same class, arguments and
+    private attributes, e.g. domain, mapping and space of a test function)
+    have the same key, even when they are created by different processes.
+    The versions of SymPDE and SymPy are also part of the key.
+
+    Returns
+    -------
+    key : str
+        Hexadecimal SHA-256 digest.
+
+    Raises
+    ------
+    TypeError
+        If an object cannot be keyed by its content, like a lambda, a closure
+        or an instance of a class which is not a SymPy object.
+
+    """
+    memo = {}
+    text = ';'.join(_canonical(o, memo) for o in objs)
+    text = 'sympde-{}|sympy-{}|{}'.format(sympde_version, sympy_version, text)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+#==============================================================================
+# On-disk cache
+#==============================================================================
+class DiskCache(object):
+    """
+    A size-bounded, persistent cache stored in a directory.
+
+    Each entry is stored in a separate file, whose name is the key of the
+    entry. Writers create a temporary file and atomically rename it, hence
+    readers never see partial entries and concurrent writers of the same key
+    do not corrupt each other. The access time of an entry is recorded in the
+    modification time of its file, which is used for the least-recently-used
+    eviction when the total size exceeds `max_size`.
+
+    Parameters
+    ----------
+    path : str
+        Cache directory (created if needed).
+
+    max_size : int
+        Maximum total size of the entries, in bytes.
+
+    """
+    _suffix = '.pkl'
+
+    def __init__(self, path, max_size=2**30):
+        if max_size <= 0:
+            raise ValueError('> max_size must be positive')
+
+        os.makedirs(path, exist_ok=True)
+
+        self._path     = os.path.abspath(path)
+        self._max_size = int(max_size)
+        self.hits      = 0
+        self.misses    = 0
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def _filename(self, key):
+        return os.path.join(self._path, key + self._suffix)
+
+    def _entries(self):
+        """ Return the list of (mtime, size, filename) of all entries. """
+        entries = []
+        for name in os.listdir(self._path):
+            if not name.endswith(self._suffix):
+                continue
+            filename = os.path.join(self._path, name)
+            try:
+                st = os.stat(filename)
+            except OSError:
+                # Entry removed by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, filename))
+        return entries
+
+    @property
+    def size(self):
+        """ Total size of the entries, in bytes. """
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return os.path.exists(self._filename(key))
+
+    def get(self, key, default=None):
+        """ Return the value stored with the given key, or default. """
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+            value = loads(data)
+        except (OSError, EOFError):
+            self.misses += 1
+            return default
+        except Exception:
+            # Corrupted or incompatible entry: discard it
+            self._remove(filename)
+            self.misses += 1
+            return default
+
+        # Mark entry as recently used
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """
+        Store a value with the given key. Values which cannot be serialized
+        are silently skipped.
+
+        Returns
+        -------
+        stored : bool
+            True if the value was written to disk.
+
+        """
+        try:
+            data = dumps(value)
+        except Exception:
+            return False
+
+        if len(data) > self._max_size:
+            return False
+
+        fd, tmp = tempfile.mkstemp(dir=self._path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._filename(key))
+        except OSError:
+            self._remove(tmp)
+            return False
+
+        self._evict()
+        return True
+
+    def clear(self):
+        """ Remove all entries. """
+        for _, _, filename in self._entries():
+            self._remove(filename)
+        self.hits   = 0
+        self.misses = 0
+
+    def _evict(self):
+        """ Remove the least recently used entries until the total size is
+        below max_size. """
+        entries = self._entries()
+        total   = sum(size for _, size, _ in entries)
+        if total <= self._max_size:
+            return
+
+        for _, size, filename in sorted(entries):
+            self._remove(filename)
+            total -= size
+            if total <= self._max_size:
+                break
+
+    @staticmethod
+    def _remove(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def __repr__(self):
+        return 'DiskCache({!r}, max_size={})'.format(self._path, self._max_size)
+
+#==============================================================================
+_disk_cache = None
+
+def enable_disk_cache(path=None, max_size=None):
+    """
+    Enable the persistent cache of evaluated forms.
+
+    Parameters
+    ----------
+    path : str
+        Cache directory. If not given, the environment variable
+        SYMPDE_CACHE_DIR is used, or '~/.cache/sympde' as a last resort.
+
+    max_size : int
+        Maximum size of the cache in bytes. If not given, the environment
+        variable SYMPDE_CACHE_SIZE is used, or 1 GiB as a last resort.
+
+    Returns
+    -------
+    cache : DiskCache
+        The new active cache.
+
+    """
+    global _disk_cache
+
+    if path is None:
+        path = os.environ.get('SYMPDE_CACHE_DIR',
+                              os.path.join('~', '.cache', 'sympde'))
+    path = os.path.expanduser(path)
+
+    if max_size is None:
+        max_size = int(os.environ.get('SYMPDE_CACHE_SIZE', 2**30))
+
+    _disk_cache = DiskCache(path, max_size=max_size)
+    return _disk_cache
+
+def disable_disk_cache():
+    """ Disable the persistent cache of evaluated forms. """
+    global _disk_cache
+    _disk_cache = None
+
+def get_disk_cache():
+    """ Return the active DiskCache, or None if the cache is disabled. """
+    return _disk_cache
+
+if os.environ.get('SYMPDE_CACHE_DIR'):
+    enable_disk_cache()
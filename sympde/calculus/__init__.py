@@ -1,3 +1,7 @@
+# sympde.topology.derivatives imports sympde.calculus.core while the latter
+# imports sympde.topology.space: sympde.topology must be imported first
+import sympde.topology
+
 from .core     import *
 from .errors   import *
 from .matrices import *
@@ -101,6 +101,7 @@ from sympy.core.singleton  import S
 
 from sympde.core.basic import CalculusFunction
 from sympde.core.basic import _coeffs_registery
+from sympde.core.utils import structural_key
 
 from sympde.topology.space import ScalarTestFunction, VectorTestFunction, IndexedTestTrial
 from sympde.topology.space import ScalarField, VectorField, IndexedVectorField
@@ -114,16 +115,16 @@ from .errors import ArgumentTypeError
 from sympy.core.decorators import call_highest_priority
 from operator  import mul,add
 from functools import reduce
-from sympy import cacheit
+from sympde.cache import cacheit
 
-@cacheit
+@cacheit('calculus')
 def has(obj, types):
     if hasattr(obj, 'args'):
         return isinstance(obj, types) or any(has(i, types) for i in obj.args)
     else:
         return isinstance(obj, types)
 
-@cacheit
+@cacheit('calculus')
 def is_zero(x):
     if isinstance(x, (Matrix, ImmutableDenseMatrix)):
         return all( i==0 for i in x[:])
@@ -302,7 +303,7 @@ class Dot(BasicOperator):
         b = reduce(mul, args_2)
         c = Mul(*c1)*Mul(*c2)
 
-        if str(a) > str(b):
+        if structural_key(a) > structural_key(b):
             a,b = b,a
 
         obj = Basic.__new__(cls, a, b)
@@ -372,7 +373,7 @@ class Cross(BasicOperator):
         b = reduce(mul, args_2)
         c = Mul(*c1)*Mul(*c2)
 
-        if str(a) > str(b):
+        if structural_key(a) > structural_key(b):
             a,b = b,a
             c   = -c
 
@@ -457,7 +458,7 @@ class Inner(BasicOperator):
         b = reduce(mul, args_2)
         c = Mul(*c1)*Mul(*c2)
 
-        if str(a) > str(b):
+        if structural_key(a) > structural_key(b):
             a,b = b,a
 
         obj = Basic.__new__(cls, a, b)
@@ -1222,7 +1223,7 @@ class Bracket(DiffOperator):
 
         # Automatic evaluation to canonical form: reorder arguments by using
         # anti-commutativity property [v, u] = -[u, v] and stop recursion.
-        if str(arg1) > str(arg2):
+        if structural_key(arg1) > structural_key(arg2):
             return -cls(arg2, arg1, evaluate=False)
 
         # Stop recursion
@@ -1341,7 +1342,7 @@ class Convolution(BasicOperator):
         # ... this is a hack to ensure commutativity
         #     TODO to be improved
         try:
-            if str(right) < str(left):
+            if structural_key(right) < structural_key(left):
                 return alpha*cls(right, left, evaluate=False)
 
         except:
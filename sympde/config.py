@@ -0,0 +1,38 @@
+# coding: utf-8
+"""
+Global settings of SymPDE. They can be changed at run time, e.g.
+
+>>> from sympde import config
+>>> config.linearity = 'expand'
+
+linearity : str
+    Default method used by sympde.expr.expr.is_linear_expression to check
+    the linearity of forms:
+
+    - 'structural' : propagate the degree of the expression with respect to
+      the arguments through the expression tree, and use the 'expand' method
+      only when the degree cannot be determined;
+
+    - 'expand' : compare f(u + w) with f(u) + f(w) and f(alpha*u) with
+      alpha*f(u), after expansion.
+
+validate : str
+    Default validation mode of LinearForm, BilinearForm, Equation, find and
+    EssentialBC, which can be overridden in each of them by the keyword
+    argument check (True for 'eager' and False for 'off'):
+
+    - 'eager' : check the linearity of forms and analyse the boundary
+      conditions at construction;
+
+    - 'lazy' : check the linearity of forms on their first evaluation by
+      TerminalExpr, and analyse the boundary conditions on the first access
+      to their properties;
+
+    - 'off' : do not check the linearity of forms (it can still be done by
+      calling their validate method), and analyse the boundary conditions on
+      the first access to their properties.
+
+"""
+
+linearity = 'structural'
+validate  = 'eager'
@@ -1,6 +1,5 @@
 # coding: utf-8
 
-import numpy as np
 from itertools import groupby
 from collections import OrderedDict
 
@@ -1,4 +1,10 @@
+import pytest
+
+from sympy import symbols
+
 from sympde.core.utils import expand_name_patterns
+from sympde.core.utils import structural_key
+from sympde.core.utils import function_pattern, linear_coefficients, split_terms
 
 #==============================================================================
 def test_expand_name_patterns():
@@ -31,3 +37,46 @@ def test_expand_name_patterns():
 
     assert expand_name_patterns('x((a:b))') == ('x(a)', 'x(b)')
     assert expand_name_patterns(r'x(:1\,:2)') == ('x(0,0)', 'x(0,1)')
+
+#==============================================================================
+def test_structural_key():
+
+    from sympde.calculus import grad, dot, inner, cross
+    from sympde.topology import Domain, VectorFunctionSpace, elements_of
+
+    domain = Domain('Omega', dim=3)
+    V      = VectorFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    # Equal expressions built independently have the same key
+    assert structural_key(grad(u)) == structural_key(grad(u))
+    assert structural_key(grad(u)) != structural_key(grad(v))
+
+    # Atoms are sorted by name, compound expressions by class
+    assert structural_key(u) < structural_key(v)
+    assert structural_key(grad(v)) < structural_key(u)
+
+    # Canonical order of the arguments of (anti-)commutative operators
+    assert dot(v, u).args == (u, v)
+    assert inner(grad(v), grad(u)).args == (grad(u), grad(v))
+    assert cross(v, u) == -cross(u, v)
+
+#==============================================================================
+def test_split_terms():
+
+    u, u_x1, v, v_0_x2, w, k_x = symbols('u, u_x1, v, v_0_x2, w, k_x')
+
+    tests  = function_pattern(['v'])
+    trials = function_pattern(['u'])
+    assert tests.match('v_0_x2x2').groups()[:3] == ('v', '_0', '_x2x2')
+    assert not tests.match('vv') and not tests.match('v_t')
+    assert function_pattern([]) is None
+
+    expr = k_x*u*v + w*u_x1*v_0_x2
+    assert linear_coefficients(expr, tests) == [(v, k_x*u), (v_0_x2, w*u_x1)]
+    assert split_terms(expr, tests, trials) == [(v, [(u, k_x)]), (v_0_x2, [(u_x1, w)])]
+    assert split_terms(expr, None, None) == expr
+
+    with pytest.raises(ValueError):
+        linear_coefficients(u*v**2, tests)
+
@@ -3,9 +3,14 @@
 import re
 import string
 import random
+from sympy                     import S
+from sympy.core                import Basic
 from sympy.utilities.iterables import cartes
 
-__all__ = ('random_string', 'expand_name_patterns')
+from sympde.cache import cacheit
+
+__all__ = ('random_string', 'expand_name_patterns', 'structural_key',
+           'function_pattern', 'linear_coefficients', 'split_terms')
 
 #==============================================================================
 def random_string( n ):
@@ -161,3 +166,119 @@ def expand_name_patterns(names, *, seq=None):
             result.append(expand_name_patterns(name))
 
         return type(names)(result)
+
+#==============================================================================
+@cacheit('sort_key')
+def structural_key(expr):
+    """
+    Return a key which defines a canonical order between expressions,
+    without printing them.
+
+    The key of a compound expression is made of the name of its class and of
+    the keys of its arguments, that of an atom is its name (or its string
+    representation), hence the order of the arguments of commutative
+    operators (e.g. Dot, Inner) is close to the alphabetical order of their
+    string representations. The keys are memoized, so that equal
+    subexpressions which appear in many expressions are only visited once.
+
+    Parameters
+    ----------
+    expr : sympy.Basic
+        Any expression; arguments which are not sympy objects (e.g. strings)
+        are accepted as well.
+
+    Results
+    -------
+    key : tuple
+        Nested tuples of strings, which can be compared to each other.
+
+    """
+    kind = type(expr).__name__
+
+    if not isinstance(expr, Basic):
+        return (str(expr), (), kind)
+
+    elif expr.is_Symbol:
+        return (expr.name, (), kind)
+
+    elif not expr.args:
+        return (str(expr), (), kind)
+
+    return (kind, tuple(structural_key(a) for a in expr.args), '')
+
+#==============================================================================
+def function_pattern(functions):
+    """
+    Regular expression matching the symbols of the given functions and of
+    their derivatives, as printed by SymbolicExpr (e.g. u, u_x1, u_0_x2x2).
+
+    Parameters
+    ----------
+    functions : iterable
+        Functions (test or trial functions, fields) or their names.
+
+    Results
+    -------
+    pattern : re.Pattern
+        Pattern whose groups are the name of the function, the index of the
+        component (if any) and the derivatives (if any); None if no function
+        is given.
+
+    """
+    names = [f if isinstance(f, str) else str(f.name) for f in functions]
+    if not names:
+        return None
+    names = '|'.join(re.escape(n) for n in names)
+    return re.compile(r'^({})(_\d+)?(_(x1|x2|x3|x|y|z)+)?$'.format(names))
+
+def linear_coefficients(expr, pattern):
+    """
+    Coefficients of an expression which is linear in the symbols matching
+    pattern (see function_pattern): returns a list of pairs (symbol,
+    coefficient), sorted by symbol, for the non-zero coefficients.
+
+    Raises
+    ------
+    ValueError
+        If the expression is not linear in these symbols.
+
+    """
+    symbols = sorted([s for s in expr.free_symbols if pattern.match(s.name)], key=str)
+
+    if expr.xreplace({s: S.Zero for s in symbols}) != 0:
+        raise ValueError('> Expression is not linear in the functions {}'.format(pattern.pattern))
+
+    coeffs = []
+    for s in symbols:
+        c = expr.diff(s)
+        if any(pattern.match(t.name) for t in c.free_symbols):
+            raise ValueError('> Expression is not linear in the functions {}'.format(pattern.pattern))
+        if c != 0:
+            coeffs.append((s, c))
+
+    return coeffs
+
+def split_terms(expr, tests, trials):
+    """
+    Decompose an entry of a terminal expression, converted by SymbolicExpr:
+    returns a list of pairs (test symbol, [(trial symbol, coefficient)]) for
+    a bilinear form, a list of pairs (test symbol, coefficient) for a linear
+    form and the expression itself for a functional.
+
+    Parameters
+    ----------
+    tests : re.Pattern
+        Pattern of the test functions (see function_pattern), or None.
+
+    trials : re.Pattern
+        Pattern of the trial functions, or None.
+
+    """
+    if tests is None:
+        return expr
+
+    terms = linear_coefficients(expr, tests)
+    if trials is None:
+        return terms
+
+    return [(v, linear_coefficients(c, trials)) for v, c in terms]
@@ -1,6 +1,9 @@
 # coding: utf-8
 
-from sympy.core import Expr
+from collections import OrderedDict
+
+from sympy import sympify
+from sympy.core import Expr, Symbol
 from sympy.core.containers import Tuple
 
 from sympde.core.basic     import Constant
@@ -58,6 +61,34 @@ def _sanitize_arguments(arguments, is_bilinear=False, is_linear=False):
     args = Tuple(trial_functions, test_functions) if is_bilinear else Tuple(*test_functions)
     return args
 
+#==============================================================================
+def _terminal_placeholder(value, like=None):
+    """
+    Expression which represents a free variable of a form in its terminal
+    expression: the fields are represented by ScalarField/VectorField
+    objects, the constants by themselves.
+
+    If like is given, returns None when value cannot replace the free
+    variable like in a terminal expression, i.e. when it is not a field of
+    the same space (for a field), or when it is not an expression of
+    constants (for a constant).
+    """
+    fields = (ScalarTestFunction, VectorTestFunction, ScalarField, VectorField)
+
+    if isinstance(like, fields):
+        if not (isinstance(value, fields) and value.space == like.space):
+            return None
+
+    elif like is not None:
+        value = sympify(value)
+        if not all(isinstance(i, Constant) for i in value.atoms(Symbol)):
+            return None
+
+    if isinstance(value, fields):
+        return value.space.field(value.name)
+
+    return value
+
 #==============================================================================
 class BasicExpr(Expr):
     is_Function   = True
@@ -144,6 +175,8 @@ class BasicForm(Expr):
     _ldim        = None
     _body       = None
     _kwargs     = None
+    _check_pending = False
+    _binding      = None
 
     @property
     def fields(self):
@@ -172,6 +205,19 @@ class BasicForm(Expr):
     def ldim(self):
         return self._ldim
 
+    def validate(self):
+        """ Check the consistency of the form and return it. """
+        self._check_pending = False
+        return self
+
+    def _set_validation(self, mode):
+        """ Validate the form now ('eager'), on its first evaluation ('lazy')
+        or only on an explicit call to validate ('off'). """
+        if mode == 'eager':
+            self.validate()
+        elif mode == 'lazy':
+            self._check_pending = True
+
     def get_free_variables(self):
         if self._kwargs is None:
             fields = self.fields
@@ -204,6 +250,39 @@ class BasicForm(Expr):
         # ...
 
         return expr
+
+    def bind(self, **kwargs):
+        """
+        Return the form obtained by replacing the given free variables
+        (constants and fields, given by name) with new values.
+
+        If every constant is replaced with a number or an expression of
+        constants, and every field with a field of the same space, the
+        terminal expression of the new form is obtained by patching the
+        terminal expression of this form (see TerminalExpr and
+        kernel_dependencies) instead of being recomputed.
+        """
+        expr = self._update_free_variables(**kwargs)
+
+        if self.is_norm:
+            raise NotImplementedError('> bind is not available for norms')
+        elif self.is_functional:
+            obj = self.func(expr, self.domain, evaluate=False)
+        else:
+            obj = self.func(self.variables, expr)
+
+        _kwargs  = self.get_free_variables()
+        bindings = OrderedDict()
+        for name, value in kwargs.items():
+            old = _terminal_placeholder(_kwargs[name])
+            new = _terminal_placeholder(value, like=_kwargs[name])
+            if new is None:
+                return obj
+
+            bindings[name] = (old, new)
+
+        obj._binding = (self, bindings)
+        return obj
         
     def annotate(self):
     
@@ -222,9 +301,17 @@ class BasicForm(Expr):
             indexed             = [f for f in indexed if f.base in vector_fields]
             new_indexed         = [VectorField(f.base.space, f.base.name)[f.indices[0]] for f in indexed]
             
-            expr = self.subs(zip(indexed, new_indexed))
+            expr = self.expr.subs(zip(indexed, new_indexed))
             expr = expr.subs(zip(vector_fields, new_vector_fields))
             expr = expr.subs(zip(scalar_fields, new_scalar_fields))
+
+            # The new form is linear if and only if this form is: it is
+            # checked if the check of this form is pending, and never again
+            if expr is self.expr:
+                expr = self
+            else:
+                check = 'lazy' if self._check_pending else 'off'
+                expr  = self.func(self.variables, expr, check=check)
             
         elif self.is_functional:
             domain = self.domain
@@ -16,6 +16,7 @@ from sympde.core.utils import random_string
 
 from .expr import BilinearForm, LinearForm
 from .expr import linearize
+from .expr import _validation_mode
 from .errors import ( UnconsistentLhsError, UnconsistentRhsError,
                       UnconsistentArgumentsError, UnconsistentBCError )
 
@@ -34,7 +35,26 @@ class EssentialBC(BasicBoundaryCondition):
     _normal_component = None
     _position = None
 
-    def __new__(cls, lhs, rhs, boundary, position=None, index_component=None):
+    def __new__(cls, lhs, rhs, boundary, position=None, index_component=None, check=None):
+
+        obj = Basic.__new__(cls, lhs, rhs, boundary)
+
+        obj._index_component = index_component
+        obj._position = position
+
+        # The analysis of lhs is needed by the properties, hence it is only
+        # deferred to their first access in the modes 'lazy' and 'off'
+        if _validation_mode(check) == 'eager':
+            obj._analyze()
+
+        return obj
+
+    def _analyze(self):
+        """ Check the lhs of the boundary condition and compute its order,
+        variable, normal and indexed components. """
+        lhs             = self.lhs
+        index_component = self._index_component
+
         # ...
         normal_component = False
         # ...
@@ -119,15 +139,10 @@ class EssentialBC(BasicBoundaryCondition):
 #                    # TODO shall we use the ext for the sign?
 #        # ...
 
-        obj = Basic.__new__(cls, lhs, rhs, boundary)
-
-        obj._order = order
-        obj._variable = variable
-        obj._normal_component = normal_component
-        obj._index_component = index_component
-        obj._position = position
-
-        return obj
+        self._order = order
+        self._variable = variable
+        self._normal_component = normal_component
+        self._index_component = index_component
 
     @property
     def lhs(self):
@@ -143,18 +158,26 @@ class EssentialBC(BasicBoundaryCondition):
 
     @property
     def order(self):
+        if self._order is None:
+            self._analyze()
         return self._order
 
     @property
     def variable(self):
+        if self._order is None:
+            self._analyze()
         return self._variable
 
     @property
     def normal_component(self):
+        if self._order is None:
+            self._analyze()
         return self._normal_component
 
     @property
     def index_component(self):
+        if self._order is None:
+            self._analyze()
         return self._index_component
 
     @property
@@ -190,7 +213,9 @@ class Mean(BasicConstraint):
 #        formulation and strong condition
 class Equation(Basic):
 
-    def __new__(cls, lhs, rhs, trials, tests, bc=None, constraint=None):
+    def __new__(cls, lhs, rhs, trials, tests, bc=None, constraint=None, check=None):
+        # ...
+        check = _validation_mode(check)
         # ...
         if not isinstance(lhs, BilinearForm):
             raise UnconsistentLhsError('> lhs must be a bilinear')
@@ -211,7 +236,8 @@ class Equation(Basic):
             assert(isinstance(tests, (list, tuple, Tuple)))
             tests = [*tests]
 
-            assert(all([_is_test_function(i) for i in tests]))
+            if check == 'eager':
+                assert(all([_is_test_function(i) for i in tests]))
         # ...
 
         # ...
@@ -222,7 +248,8 @@ class Equation(Basic):
             assert(isinstance(trials, (list, tuple, Tuple)))
             trials = [*trials]
 
-            assert(all([_is_test_function(i) for i in trials]))
+            if check == 'eager':
+                assert(all([_is_test_function(i) for i in trials]))
         # ...
 
 #        # ...
@@ -318,7 +345,8 @@ class Equation(Basic):
                 if isinstance(i.boundary, Union):
                     if isinstance(i, EssentialBC):
                         newbc += [EssentialBC(i.lhs, i.rhs, j, position=i.position,
-                                              index_component=i.index_component)
+                                              index_component=i.index_component,
+                                              check=check)
                                   for j in i.boundary._args]
 
                 else:
@@ -377,10 +405,10 @@ class NewtonIteration(Equation):
 
 #==============================================================================
 # user friendly function to create Equation objects
-def find(trials, *, forall, lhs, rhs, bc=None, constraint=None):
+def find(trials, *, forall, lhs, rhs, bc=None, constraint=None, check=None):
 
     tests = forall
-    lhs = BilinearForm((trials, tests), lhs)
-    rhs =   LinearForm(         tests , rhs)
+    lhs = BilinearForm((trials, tests), lhs, check=check)
+    rhs =   LinearForm(         tests , rhs, check=check)
 
-    return Equation(lhs, rhs, trials, tests, bc=bc, constraint=constraint)
+    return Equation(lhs, rhs, trials, tests, bc=bc, constraint=constraint, check=check)
@@ -1,10 +1,13 @@
 # coding: utf-8
 
+import re
+import atexit
 from itertools import product
 from collections import OrderedDict
-from sympy import Abs, S, cacheit
+from sympy import Abs, S
 from sympy import Indexed, Matrix, ImmutableDenseMatrix
-from sympy import expand
+from sympy.matrices.matrices import MatrixBase
+from sympy import expand, separatevars, symbols
 from sympy.core import Basic
 from sympy.core import Add, Mul, Pow
 from sympy.core.expr import AtomicExpr
@@ -13,17 +16,20 @@ from sympy.simplify.simplify import simplify
 
 from sympde.core.basic import _coeffs_registery
 from sympde.core.basic import CalculusFunction
+from sympde.core.basic import Constant
 from sympde.core.algebra import (Dot_1d,
                                  Dot_2d, Inner_2d, Cross_2d,
                                  Dot_3d, Inner_3d, Cross_3d)
-from sympde.core.utils import random_string
+from sympde.core.utils import random_string, function_pattern, split_terms
+from sympde.cache      import cacheit, canonical_key, get_disk_cache
+from sympde.cache      import dumps, loads
 
 from sympde.calculus import jump, avg, minus, plus
 from sympde.calculus import Jump
 from sympde.calculus.core import _generic_ops, _diff_ops
 
 from sympde.calculus.matrices import SymbolicDeterminant, Inverse, Transpose
-from sympde.calculus.matrices import MatPow, MatrixElement, SymbolicTrace
+from sympde.calculus.matrices import MatMul, MatPow, MatrixElement, SymbolicTrace
 
 from sympde.topology.mapping import Jacobian, JacobianSymbol, InterfaceMapping
 
@@ -31,7 +37,7 @@ from sympde.topology.basic   import BasicDomain, Union, Interval
 from sympde.topology.domain  import NormalVector, TangentVector
 from sympde.topology.basic   import Boundary, Interface
 from sympde.topology.basic   import InteriorDomain
-from sympde.topology.mapping import LogicalExpr, PullBack
+from sympde.topology.mapping import LogicalExpr, PullBack, SymbolicExpr
 
 # TODO fix circular dependency between sympde.expr.evaluation and sympde.topology.mapping
 
@@ -40,7 +46,7 @@ from sympde.topology.space import VectorTestFunction
 from sympde.topology.space import IndexedTestTrial
 from sympde.topology.space import Trace
 from sympde.topology.space import element_of
-from sympde.topology.space import VectorField
+from sympde.topology.space import ScalarField, VectorField
 
 from sympde.topology.derivatives import _partial_derivatives
 from sympde.topology.derivatives import _logical_partial_derivatives
@@ -71,7 +77,6 @@ from .expr  import Integral
 from .expr  import Functional
 from .expr  import _get_domain
 
-import numpy as np
 #==============================================================================
 def is_sequence(a):
     return isinstance(a, (list,tuple,Tuple))
@@ -133,6 +138,70 @@ def _get_trials_tests_flattened(expr):
 
     return trials, tests
 
+#==============================================================================
+_linear_operators = _partial_derivatives + _logical_partial_derivatives
+
+def _scan_term(expr, funcs):
+    """
+    Find which of the given functions appear in an expression, and check
+    whether the expression is guaranteed to vanish when all of them are
+    replaced by zero.
+
+    The check is structural and conservative: only products, powers with a
+    positive exponent, sums and partial derivatives of the functions are
+    recognized.
+
+    Parameters
+    ----------
+    expr : sympy.Expr
+        Expression to be scanned.
+
+    funcs : set
+        Scalar test or trial functions.
+
+    Returns
+    -------
+    found : set
+        Functions of funcs which appear in expr.
+
+    vanishes : bool
+        True if expr.subs({f: 0 for f in found}) is known to be zero.
+
+    """
+    if not isinstance(expr, Basic):
+        return set(), False
+
+    if expr in funcs:
+        return {expr}, True
+
+    found   = set()
+    results = []
+    for a in expr.args:
+        f, z = _scan_term(a, funcs)
+        found |= f
+        results.append((f, z))
+
+    if not found:
+        return found, False
+
+    if isinstance(expr, _linear_operators):
+        vanishes = results[0][1]
+
+    elif isinstance(expr, Mul):
+        vanishes = all(z for f, z in results if f)
+
+    elif isinstance(expr, Add):
+        vanishes = all(z for f, z in results)
+
+    elif isinstance(expr, Pow):
+        (_, z), (f, _) = results
+        vanishes = z and not f and expr.exp.is_positive is True
+
+    else:
+        vanishes = False
+
+    return found, vanishes
+
 #==============================================================================
 def _to_matrix_form(expr, *, trials=None, tests=None):
     """
@@ -150,6 +219,14 @@ def _to_matrix_form(expr, *, trials=None, tests=None):
     3. if neither the trial nor the test functions are given, we treat the
        expression as a scalar functional and convert it to a 1x1 matrix.
 
+    The entry (i, j) is the expression where all the test functions but the
+    i-th one, and all the trial functions but the j-th one, are replaced by
+    zero. Instead of substituting the whole expression for every entry, each
+    additive term is scanned once and sent to the entries it contributes to;
+    the functions are only replaced (with xreplace) in the terms which are not
+    products of the test and trial functions (or of their partial
+    derivatives).
+
     Parameters
     ----------
     expr : sympy.Expr
@@ -167,26 +244,60 @@ def _to_matrix_form(expr, *, trials=None, tests=None):
         Matrix representation of input expression.
 
     """
-    # Bilinear form
-    if trials and tests:
-        M = Matrix.zeros(len(tests), len(trials))
-        for i, test in enumerate(tests):
-            subs_i = {v:0 for v in tests if v != test}
-            expr_i = expr.subs(subs_i)
-            for j, trial in enumerate(trials):
-                subs_j  = {u:0 for u in trials if u != trial}
-                M[i, j] = expr_i.subs(subs_j)
-
-    # Linear form
-    elif tests:
-        M = Matrix.zeros(len(tests), 1)
-        for i, test in enumerate(tests):
-            subs_i = {v:0 for v in tests if v != test}
-            M[i, 0] = expr.subs(subs_i)
-
     # Functional
-    else:
-        M = [[expr]]
+    if not tests:
+        return ImmutableDenseMatrix([[expr]])
+
+    tests  = tuple(tests)
+    trials = tuple(trials) if trials else ()
+
+    n_rows = len(tests)
+    n_cols = len(trials) if trials else 1
+
+    test_set  = set(tests)
+    trial_set = set(trials)
+
+    terms = expr.args if isinstance(expr, Add) else (expr,)
+    parts = [[[] for j in range(n_cols)] for i in range(n_rows)]
+
+    # None stands for the rows (columns) whose test (trial) function does not
+    # appear in the term
+    for term in terms:
+        ts, ts_vanish = _scan_term(term, test_set)
+        us, us_vanish = _scan_term(term, trial_set)
+
+        row_keys = [v for v in tests  if v in ts]
+        col_keys = [u for u in trials if u in us]
+        if len(row_keys) < n_rows: row_keys.append(None)
+        if len(col_keys) < n_cols: col_keys.append(None)
+
+        for v in row_keys:
+            subs_i = {t:S.Zero for t in ts if t != v}
+            rows   = [tests.index(v)] if v is not None else \
+                     [i for i, t in enumerate(tests) if t not in ts]
+
+            for u in col_keys:
+                subs_j = {t:S.Zero for t in us if t != u}
+
+                if (v is None and ts and ts_vanish) or (u is None and us and us_vanish):
+                    continue
+
+                elif subs_i or subs_j:
+                    newterm = term.xreplace({**subs_i, **subs_j})
+                    if newterm == 0:
+                        continue
+
+                else:
+                    newterm = term
+
+                cols = [trials.index(u)] if u is not None else \
+                       [j for j in range(n_cols) if not trials or trials[j] not in us]
+
+                for i in rows:
+                    for j in cols:
+                        parts[i][j].append(newterm)
+
+    M = [[Add(*p) for p in row] for row in parts]
 
     return ImmutableDenseMatrix(M)
 
@@ -197,6 +308,10 @@ def _split_expr_over_interface(expr, interface, tests=None, trials=None):
     expressions where the test and trial functions are defined on each side of
     the interface.
 
+    The jumps are first expanded with a single replacement; then every
+    additive term is scanned once and classified by the (trial side, test side)
+    pairs it contributes to (see _to_matrix_form).
+
     Parameters:
         expr: sympde expression
 
@@ -222,54 +337,40 @@ def _split_expr_over_interface(expr, interface, tests=None, trials=None):
     # ...
     # we replace all jumps
     jumps = expr.atoms(Jump)
-    args = [j._args[0] for j in jumps]
-
-    for a in args:
-        expr = expr.subs({jump(a): minus(a) - plus(a)})
+    if jumps:
+        args = [j._args[0] for j in jumps]
+        expr = expr.xreplace({jump(a): minus(a) - plus(a) for a in args})
     # ...
 
     # ...
-    d_trials = OrderedDict()
-    for u in trials:
-        u_minus = minus(u)
-        u_plus  = plus(u)
-        d_trials[u] = {'-': u_minus, '+': u_plus}
-
-#        # TODO add sub for avg
-#        expr = expr.subs({jump(u): u_minus - u_plus})
-
-    d_tests  = OrderedDict()
-    for v in tests:
-        v_minus = minus(v)
-        v_plus  = plus(v)
-        d_tests[v] = {'-': v_minus, '+': v_plus}
-
-#        # TODO add sub for avg
-#        expr = expr.subs({jump(v): v_minus - v_plus})
-    # ...
+    d_trials = OrderedDict((u, {'-': minus(u), '+': plus(u)}) for u in trials)
+    d_tests  = OrderedDict((v, {'-': minus(v), '+': plus(v)}) for v in tests)
 
-    # ...
-    trials = []
-    for u in d_trials.keys():
-        u_minus = d_trials[u]['-']
-        u_plus  = d_trials[u]['+']
-        trials += [u_minus, u_plus]
-
-    tests = []
-    for u in d_tests.keys():
-        u_minus = d_tests[u]['-']
-        u_plus  = d_tests[u]['+']
-        tests += [u_minus, u_plus]
+    trials = [d[k] for d in d_trials.values() for k in '-+']
+    tests  = [d[k] for d in d_tests.values()  for k in '-+']
     # ...
 
-    # ...
-    def _nullify(expr, u, us):
-        """nullifies all symbols in us except u."""
-        others = list(set(us) - set([u]))
-        for other in others:
-            expr = expr.subs({other: 0})
+    # ... classify the terms of every entry by (test, trial) pair
+    is_matrix = isinstance(expr, (Matrix, ImmutableDenseMatrix))
+    entries   = list(expr) if is_matrix else [expr]
+    blocks    = [_to_matrix_form(e, trials=trials or None, tests=tests) for e in entries] if tests else []
+
+    def _extract(v_side, u_side=None):
+        """returns the expression where only u_side and v_side are kept."""
+        i = tests.index(v_side)
+        j = trials.index(u_side) if u_side is not None else 0
+        if is_matrix:
+            return ImmutableDenseMatrix(*expr.shape, [b[i, j] for b in blocks])
+        return blocks[0][i, j]
+
+    def _replace_mapping(expr, side):
+        mapping = expr.atoms(InterfaceMapping)
+        if mapping:
+            mapping = list(mapping)[0]
+            expr    = expr.subs(mapping, getattr(mapping, side))
         return expr
     # ...
+
     if is_bilinear:
         for u in d_trials.keys():
             u_minus = d_trials[u]['-']
@@ -279,44 +380,27 @@ def _split_expr_over_interface(expr, interface, tests=None, trials=None):
                 v_plus  = d_tests[v]['+']
 
                 # ...
-                newexpr = _nullify(expr, u_minus, trials)
-                newexpr = _nullify(newexpr, v_minus, tests)
-                newexpr = newexpr.subs({u_minus: u, v_minus: v})
-                mapping = newexpr.atoms(InterfaceMapping)
-                if mapping and not newexpr.is_zero:
-                    mapping = list(mapping)[0]
-                    newexpr = newexpr.subs(mapping, mapping.minus)
+                newexpr = _extract(v_minus, u_minus)
+                newexpr = newexpr.xreplace({u_minus: u, v_minus: v})
+                if not newexpr.is_zero:
+                    newexpr = _replace_mapping(newexpr, 'minus')
 
                 if not newexpr.is_zero:
                     bnd_expressions[interface.minus] = newexpr
                 # ...
                 # TODO must call InterfaceExpression afterward
-                newexpr = _nullify(expr, u_minus, trials)
-                newexpr = _nullify(newexpr, v_plus, tests)
-                mapping = newexpr.atoms(InterfaceMapping)
-                if mapping:
-                    mapping = list(mapping)[0]
-                    newexpr = newexpr.subs(mapping, mapping.plus)
+                newexpr = _replace_mapping(_extract(v_plus, u_minus), 'plus')
                 if not newexpr.is_zero:
                     int_expressions += [InterfaceExpression(interface, u_minus, v_plus, newexpr)]
                 # ...
                 # TODO must call InterfaceExpression afterward
-                newexpr = _nullify(expr, u_plus, trials)
-                newexpr = _nullify(newexpr, v_minus, tests)
-                mapping = newexpr.atoms(InterfaceMapping)
-                if mapping:
-                    mapping = list(mapping)[0]
-                    newexpr = newexpr.subs(mapping, mapping.plus)
+                newexpr = _replace_mapping(_extract(v_minus, u_plus), 'plus')
                 if not newexpr.is_zero:
                     int_expressions += [InterfaceExpression(interface, u_plus, v_minus, newexpr)]
                 # ...
-                newexpr = _nullify(expr, u_plus, trials)
-                newexpr = _nullify(newexpr, v_plus, tests)
-                newexpr = newexpr.subs({u_plus: u, v_plus: v})
-                mapping = newexpr.atoms(InterfaceMapping)
-                if mapping:
-                    mapping = list(mapping)[0]
-                    newexpr = newexpr.subs(mapping, mapping.plus)
+                newexpr = _extract(v_plus, u_plus)
+                newexpr = newexpr.xreplace({u_plus: u, v_plus: v})
+                newexpr = _replace_mapping(newexpr, 'plus')
                 if not newexpr.is_zero:
                     bnd_expressions[interface.plus] = newexpr
                 # ...
@@ -327,29 +411,92 @@ def _split_expr_over_interface(expr, interface, tests=None, trials=None):
             v_plus  = d_tests[v]['+']
 
             # ...
-            newexpr = _nullify(expr, v_minus, tests)
-            newexpr = newexpr.subs({v_minus: v})
-            mapping = newexpr.atoms(InterfaceMapping)
-            if mapping:
-                mapping = list(mapping)[0]
-                newexpr = newexpr.subs(mapping, mapping.minus)
+            newexpr = _extract(v_minus)
+            newexpr = newexpr.xreplace({v_minus: v})
+            newexpr = _replace_mapping(newexpr, 'minus')
             if not newexpr.is_zero:
                 bnd_expressions[interface.minus] = newexpr
             # ...
 
             # ...
-            newexpr = _nullify(expr, v_plus, tests)
-            newexpr = newexpr.subs({v_plus: v})
-            mapping = newexpr.atoms(InterfaceMapping)
-            if mapping:
-                mapping = list(mapping)[0]
-                newexpr = newexpr.subs(mapping, mapping.plus)
+            newexpr = _extract(v_plus)
+            newexpr = newexpr.xreplace({v_plus: v})
+            newexpr = _replace_mapping(newexpr, 'plus')
             if not newexpr.is_zero:
                 bnd_expressions[interface.plus] = newexpr
             # ...
 
     return int_expressions, bnd_expressions
 
+#==============================================================================
+# Pool of worker processes shared by all the parallel evaluations, as a pair
+# (workers, executor); it is rebuilt when another number of workers is asked
+_executor = [None, None]
+
+def _get_executor(workers=None):
+    """ Return the shared pool of worker processes. """
+    if _executor[1] is None or _executor[0] != workers:
+        from concurrent.futures import ProcessPoolExecutor
+        shutdown_executor()
+        _executor[:] = [workers, ProcessPoolExecutor(max_workers=workers)]
+    return _executor[1]
+
+def shutdown_executor(wait=True):
+    """
+    Shut down the pool of worker processes used by TerminalExpr(...,
+    parallel='process'), if any. A new pool is created by the next parallel
+    evaluation. This is done automatically at the exit of the interpreter.
+
+    Parameters
+    ----------
+    wait : bool
+        If True, wait for the pending jobs and for the processes to exit.
+
+    """
+    executor = _executor[1]
+    _executor[:] = [None, None]
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+atexit.register(shutdown_executor)
+
+def _run_job(data):
+    """ Run a serialized job in a worker process, and serialize its result. """
+    func, args, kwargs = loads(data)
+    return dumps(func(*args, **kwargs))
+
+def _map_jobs(func, jobs, parallel=None, workers=None):
+    """
+    Apply a function to a list of independent jobs, serially or in a pool of
+    worker processes. The results are returned in the order of the jobs.
+
+    Parameters
+    ----------
+    func : callable
+        Function defined at the top level of a module.
+
+    jobs : list
+        List of tuples (args, kwargs).
+
+    parallel : str
+        None for a serial evaluation, or 'process' to use a pool of processes.
+
+    workers : int
+        Maximum number of processes (by default, the number of CPUs).
+
+    Returns
+    -------
+    results : list
+        List of func(*args, **kwargs).
+
+    """
+    if parallel is None or len(jobs) < 2 or workers == 1:
+        return [func(*args, **kwargs) for args, kwargs in jobs]
+
+    # SymPDE objects are transferred with the structural pickler of sympde.cache
+    executor = _get_executor(workers)
+    data     = [dumps((func, args, kwargs)) for args, kwargs in jobs]
+    return [loads(r) for r in executor.map(_run_job, data)]
 
 #==============================================================================
 class KernelExpression(Basic):
@@ -392,6 +539,57 @@ class InterfaceExpression(KernelExpression):
     def trial(self):
         return self._trial
 
+#==============================================================================
+def _rebuild_kernel(kernel, expr):
+    """ Kernel expression of the same type and target as kernel, with a new
+    expression. """
+    if isinstance(kernel, InterfaceExpression):
+        return InterfaceExpression(kernel.target, kernel.trial, kernel.test, expr)
+    return type(kernel)(kernel.target, expr)
+
+def _is_zero(expr):
+    """ True if an expression (or every entry of a matrix) is zero. """
+    if isinstance(expr, MatrixBase):
+        return all(e == 0 for e in expr)
+    return expr == 0
+
+def _free_variable_atoms(expr):
+    """ Constants and fields which appear in an expression. """
+    atoms = set()
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, (Constant, ScalarField, VectorField)):
+            atoms.add(e)
+        elif isinstance(e, Basic):
+            stack.extend(e.args)
+    return atoms
+
+@cacheit('terminal_expr')
+def _form_terminal_expr(form):
+    """ Terminal expression of a form, without the annotation step once it
+    is cached. """
+    return TerminalExpr(form)
+
+@cacheit('terminal_expr')
+def kernel_dependencies(form):
+    """
+    Dependency record of the terminal expression of a form: dictionary
+    which maps the name of every free variable of the form (constants and
+    fields) to the indices of the kernel expressions of TerminalExpr(form)
+    in which it appears. It is computed once and cached.
+    """
+    terminal = _form_terminal_expr(form)
+    names    = form.get_free_variables().keys()
+
+    dependencies = OrderedDict((name, []) for name in names)
+    for i, e in enumerate(terminal):
+        for atom in _free_variable_atoms(e.expr):
+            if atom.name in dependencies:
+                dependencies[atom.name].append(i)
+
+    return OrderedDict((k, tuple(v)) for k, v in dependencies.items())
+
 #==============================================================================
 class TerminalExpr(CalculusFunction):
 
@@ -399,8 +597,20 @@ class TerminalExpr(CalculusFunction):
         # (Try to) sympify args first
 
         if options.pop('evaluate', True):
-            args = cls._annotate(*args)
-            r = cls.eval(*args, **options)
+            # The terminal expression of a form obtained by binding free
+            # variables of another form (see BasicForm.bind) is obtained from
+            # the one of the other form
+            form = args[0] if len(args) == 1 and isinstance(args[0], BasicForm) else None
+            if form is not None and any(k not in ('parallel', 'workers') for k in options):
+                form = None
+
+            if form is not None and form._binding is not None:
+                if form._check_pending:
+                    form.validate()
+                r = cls._eval_binding(form)
+            else:
+                args = cls._annotate(*args)
+                r = cls._eval_persistent(*args, **options)
         else:
             r = None
         if r is None:
@@ -415,11 +625,72 @@ class TerminalExpr(CalculusFunction):
         else:
             return Indexed(self, indices, **kw_args)
 
+    @classmethod
+    def _eval_persistent(cls, *args, **options):
+        """
+        Evaluate a form through the on-disk cache, if it is enabled (see
+        sympde.cache.enable_disk_cache); any other expression is evaluated
+        directly.
+        """
+        cache = get_disk_cache()
+        if cache is None or not (len(args) == 1 and isinstance(args[0], BasicForm)):
+            return cls.eval(*args, **options)
+
+        # The evaluation mode does not change the result; the forms which
+        # contain objects without a canonical key are not cached
+        try:
+            key = canonical_key(cls.__name__, args,
+                    {k: v for k, v in options.items() if k not in ('parallel', 'workers')})
+        except TypeError:
+            return cls.eval(*args, **options)
+
+        r   = cache.get(key)
+        if r is None:
+            r = cls.eval(*args, **options)
+            cache.set(key, r)
+        return r
+
+    @classmethod
+    @cacheit('terminal_expr')
+    def _eval_binding(cls, form):
+        """
+        Terminal expression of a form obtained by binding free variables of
+        another form (see BasicForm.bind): only the kernel expressions which
+        depend on these free variables are patched.
+        """
+        parent, bindings = form._binding
+
+        terminal     = _form_terminal_expr(parent)
+        dependencies = kernel_dependencies(parent)
+
+        subs    = dict(bindings.values())
+        patched = set()
+        for name in bindings:
+            patched.update(dependencies.get(name, ()))
+
+        # ... the kernel expressions which vanish are removed, as they are by
+        #     the evaluation of the new form
+        kernels = []
+        for i, e in enumerate(terminal):
+            if i in patched:
+                expr = e.expr.xreplace(subs)
+                if _is_zero(expr):
+                    continue
+                e = _rebuild_kernel(e, expr)
+            kernels.append(e)
+        # ...
+
+        return tuple(kernels)
+
     # TODO should we keep it?
     def _annotate(*args):
         args = list(args)
         expr = args[0]
         if isinstance(expr, BasicForm):
+            # Forms built with the lazy validation mode are checked now
+            if expr._check_pending:
+                expr.validate()
+
             if not expr.is_annotated:
                 expr = expr.annotate()
         else:
@@ -437,7 +708,7 @@ class TerminalExpr(CalculusFunction):
         return args
 
     @classmethod
-    @cacheit
+    @cacheit('terminal_expr')
     def eval(cls, *_args, **kwargs):
         """."""
 
@@ -453,6 +724,12 @@ class TerminalExpr(CalculusFunction):
         dim     = kwargs.pop('dim', None)
         logical = kwargs.pop('logical', None)
 
+        parallel = kwargs.pop('parallel', None)
+        workers  = kwargs.pop('workers', None)
+
+        if parallel not in (None, 'process'):
+            raise ValueError("> parallel must be None or 'process', given {}".format(parallel))
+
         if isinstance(expr, Add):
             args = [cls.eval(a, dim=dim, logical=logical) for a in expr.args]
             o = args[0]
@@ -477,14 +754,26 @@ class TerminalExpr(CalculusFunction):
 
         elif isinstance(expr, JacobianSymbol):
             axis = expr.axis
-            J    = Jacobian(expr.mapping)
+            J    = expr.mapping.jacobian_expr
             if axis is None:
                 return J
             else:
                 return J.col_del(axis)
 
         elif isinstance(expr, SymbolicDeterminant):
-            return cls.eval(expr.arg, dim=dim, logical=logical).det().factor()
+            # The determinants of the Jacobian matrix and of the metric tensor
+            # are stored in the mapping
+            arg = expr.arg
+            if isinstance(arg, JacobianSymbol) and arg.axis is None:
+                return arg.mapping.jacobian_det_expr
+
+            elif (isinstance(arg, MatMul) and len(arg.args) == 2 and
+                  isinstance(arg.args[1], JacobianSymbol) and
+                  arg.args[0] == Transpose(arg.args[1])):
+                J = arg.args[1]
+                return J.mapping._metric('det_G', J.axis)
+
+            return cls.eval(arg, dim=dim, logical=logical).det().factor()
 
         elif isinstance(expr, SymbolicTrace):
             return cls.eval(expr.arg, dim=dim, logical=logical).trace()
@@ -493,6 +782,8 @@ class TerminalExpr(CalculusFunction):
             return cls.eval(expr.arg, dim=dim, logical=logical).T
 
         elif isinstance(expr, Inverse):
+            if isinstance(expr.arg, JacobianSymbol) and expr.arg.axis is None:
+                return expr.arg.mapping.jacobian_inv_expr
             return cls.eval(expr.arg, dim=dim, logical=logical).inv()
 
         elif isinstance(expr, (ScalarTestFunction, VectorTestFunction)):
@@ -566,33 +857,35 @@ class TerminalExpr(CalculusFunction):
                     if not isinstance(domain, (Boundary, Interface, InteriorDomain)):
                         domain = domain.interior
 
-                    d_new[domain] = _to_matrix_form(newexpr, trials=trials, tests=tests)
+                    d_new[domain] = newexpr
+
+            # ... the domains are independent: they may be treated in parallel
+            jobs   = [((newexpr,), dict(trials=trials, tests=tests)) for newexpr in d_new.values()]
+            values = _map_jobs(_to_matrix_form, jobs, parallel=parallel, workers=workers)
+            d_new  = OrderedDict(zip(d_new.keys(), values))
+            # ...
 
             # ...
             ls = []
             d_all = OrderedDict()
 
             # ... treating interfaces
-            keys = [k for k in d_new.keys() if isinstance(k, Interface)]
-            for interface in keys:
-                # ...
-                trials = None
-                tests  = None
-                if expr.is_bilinear:
-                    trials = list(expr.variables[0])
-                    tests  = list(expr.variables[1])
-
-                elif expr.is_linear:
-                    tests  = list(expr.variables)
-                # ...
-
-                # ...
-                newexpr = d_new[interface]
-                ls_int, d_bnd = _split_expr_over_interface(newexpr, interface,
-                                                       tests=tests,
-                                                       trials=trials)
-                # ...
-
+            trials = None
+            tests  = None
+            if expr.is_bilinear:
+                trials = list(expr.variables[0])
+                tests  = list(expr.variables[1])
+
+            elif expr.is_linear:
+                tests  = list(expr.variables)
+
+            keys   = [k for k in d_new.keys() if isinstance(k, Interface)]
+            jobs   = [((d_new[interface], interface), dict(tests=tests, trials=trials))
+                      for interface in keys]
+            values = _map_jobs(_split_expr_over_interface, jobs,
+                               parallel=parallel, workers=workers)
+
+            for ls_int, d_bnd in values:
                 ls += ls_int
                 # ...
                 for k, v in d_bnd.items():
@@ -804,6 +1097,13 @@ def _tensorize_atomic_expr(expr, d_atoms):
 
 #==============================================================================
 class Basic1dForm(AtomicExpr):
+    """
+    1D bilinear form along the given axis, whose integrand is the product of
+    the weight and of derivatives of the 1D trial and test functions, of
+    orders given by the attribute `orders` (trial order, test order).
+
+    """
+    _orders = None
 
     def __new__(cls, name, axis, weight=S.One):
         return Basic.__new__(cls, name, axis, weight)
@@ -820,6 +1120,10 @@ class Basic1dForm(AtomicExpr):
     def weight(self):
         return self._args[2]
 
+    @property
+    def orders(self):
+        return self._orders
+
     def _sympystr(self, printer):
         sstr = printer.doprint
         name = sstr(self.name)
@@ -835,6 +1139,7 @@ class Basic1dForm(AtomicExpr):
 
 
 class Mass(Basic1dForm):
+    _orders = (0, 0)
 
     def __new__(cls, axis, weight=S.One):
 #        name = 'Mass'
@@ -842,6 +1147,7 @@ class Mass(Basic1dForm):
         return Basic.__new__(cls, name, axis, weight)
 
 class Stiffness(Basic1dForm):
+    _orders = (1, 1)
 
     def __new__(cls, axis, weight=S.One):
 #        name = 'Stiffness'
@@ -849,6 +1155,7 @@ class Stiffness(Basic1dForm):
         return Basic.__new__(cls, name, axis, weight)
 
 class Advection(Basic1dForm):
+    _orders = (1, 0)
 
     def __new__(cls, axis, weight=S.One):
 #        name = 'Advection'
@@ -856,6 +1163,7 @@ class Advection(Basic1dForm):
         return Basic.__new__(cls, name, axis, weight)
 
 class AdvectionT(Basic1dForm):
+    _orders = (0, 1)
 
     def __new__(cls, axis, weight=S.One):
 #        name = 'AdvectionT'
@@ -863,12 +1171,24 @@ class AdvectionT(Basic1dForm):
         return Basic.__new__(cls, name, axis, weight)
 
 class Bilaplacian(Basic1dForm):
+    _orders = (2, 2)
 
     def __new__(cls, axis, weight=S.One):
 #        name = 'Bilaplacian'
         name = 'B'
         return Basic.__new__(cls, name, axis, weight)
 
+class Form1d(Basic1dForm):
+    """ 1D form with arbitrary orders of derivatives, named F{trial}{test}. """
+
+    def __new__(cls, axis, trial_order, test_order, weight=S.One):
+        name = 'F{}{}'.format(trial_order, test_order)
+        return Basic.__new__(cls, name, axis, weight, trial_order, test_order)
+
+    @property
+    def orders(self):
+        return tuple(self._args[3:5])
+
 
 Mass_0 = Mass(0)
 Mass_1 = Mass(1)
@@ -890,51 +1210,198 @@ Bilaplacian_0 = Bilaplacian(0)
 Bilaplacian_1 = Bilaplacian(1)
 Bilaplacian_2 = Bilaplacian(2)
 
+_forms_1d = {cls._orders: cls for cls in (Mass, Stiffness, Advection, AdvectionT, Bilaplacian)}
+
+def form_1d(axis, orders, weight=S.One):
+    """ 1D form along axis, given the orders (trial order, test order). """
+    if orders in _forms_1d:
+        return _forms_1d[orders](axis, weight)
+    return Form1d(axis, *orders, weight=weight)
+
 #==============================================================================
-def _replace_atomic_expr(expr, trials, tests, d_atoms, logical=False, expand=False):
+class KroneckerSum(object):
+    """
+    Decomposition of (a block of) the terminal expression of a bilinear form
+    as a sum of Kronecker products of 1D forms, i.e. as a sum of terms
 
-    expr   = expr.expand(deep=expand)
-    masses = [Mass_0, Mass_1, Mass_2]
-    stiffs = [Stiffness_0, Stiffness_1, Stiffness_2]
-    advs   = [Advection_0, Advection_1, Advection_2]
-    advts  = [AdvectionT_0, AdvectionT_1, AdvectionT_2]
-    bils   = [Bilaplacian_0, Bilaplacian_1, Bilaplacian_2]
+        coeff * F^(0) x F^(1) x ... x F^(d-1)
 
-    if not logical:
-        ops = [dx, dy, dz]
+    where coeff is a constant and F^(i) is a 1D form along the axis i, with a
+    weight which depends only on the coordinate x_{i+1}.
 
-    else:
-        ops = [dx1, dx2, dx3]
+    The terms which could not be factorized (non-separable or non-constant
+    coefficients, physical derivatives) are gathered in the remainder, a
+    symbolic expression (see SymbolicExpr) of the test and trial functions.
+
+    """
+    def __init__(self, terms=(), remainder=S.Zero):
+        self._terms     = tuple(terms)
+        self._remainder = remainder
+
+    @property
+    def terms(self):
+        """ Tuple of pairs (coeff, tuple of 1D forms). """
+        return self._terms
+
+    @property
+    def remainder(self):
+        return self._remainder
 
-    for u in trials:
-        u_atoms = d_atoms[u]
-        for v in tests:
-            v_atoms = d_atoms[v]
+    @property
+    def rank(self):
+        return len(self._terms)
+
+    @property
+    def is_separable(self):
+        return self._remainder == 0
+
+    def as_expr(self):
+        expr = Add(*[Mul(c, *forms) for c, forms in self._terms])
+        if self._remainder != 0:
+            expr += TensorExpr(self._remainder, evaluate=False)
+        return expr
+
+    def __str__(self):
+        return str(self.as_expr())
+
+    def __repr__(self):
+        return 'KroneckerSum(rank={}, separable={})'.format(self.rank, self.is_separable)
+
+#==============================================================================
+def _derivative_orders(name, pattern, dim):
+    """
+    Orders of the logical derivatives along every axis of the symbol name
+    (e.g. u_0_x1x1x2), or None if it contains physical derivatives.
 
-            for i,(ui,vi) in enumerate(zip(u_atoms, v_atoms)):
+    """
+    code  = pattern.match(name).group(3) or ''
+    codes = re.findall(r'x[1-3]|[xyz]', code)
+    if any(len(c) == 1 for c in codes):
+        return None
+
+    orders = [0]*dim
+    for c in codes:
+        orders[int(c[1]) - 1] += 1
+    return tuple(orders)
 
-                mass  = masses[i]
-                stiff = stiffs[i]
-                adv   = advs[i]
-                advt  = advts[i]
-                bil   = bils[i]
+def _separate(expr, coordinates, constants):
+    """
+    Decompose expr as a sum of terms coeff * w_1(x1) * ... * w_d(xd), where
+    coeff depends only on the constants (given by their names). Returns a
+    list of pairs (coeff, weights) and the sum of the non-separable terms.
+
+    """
+    def separate(e):
+        r = separatevars(e, symbols=coordinates, dict=True)
+        if r is None or not {s.name for s in r['coeff'].free_symbols} <= constants:
+            return None
+        weights = tuple(r[x] for x in coordinates)
+        if any(not w.free_symbols <= {x} for w, x in zip(weights, coordinates)):
+            return None
+        weights = tuple(w if w.is_polynomial(x) else simplify(w)
+                        for w, x in zip(weights, coordinates))
+        return r['coeff'], weights
+
+    r = separate(expr)
+    if r is not None:
+        return [r], S.Zero
+
+    parts     = []
+    remainder = S.Zero
+    for e in Add.make_args(expand(expr)):
+        r = separate(e)
+        if r is None:
+            remainder += e
+        else:
+            parts.append(r)
+    return parts, remainder
+
+def _kronecker_sum(expr, tests, trials, coordinates, constants):
+    """ Kronecker decomposition of an entry of a symbolic expression. """
+    dim       = len(coordinates)
+    terms     = OrderedDict()
+    remainder = S.Zero
+
+    for v, coeffs in split_terms(expr, tests, trials):
+        v_orders = _derivative_orders(v.name, tests, dim)
+        for u, c in coeffs:
+            u_orders = _derivative_orders(u.name, trials, dim)
+            if u_orders is None or v_orders is None:
+                remainder += c*u*v
+                continue
+
+            parts, rest = _separate(c, coordinates, constants)
+            remainder  += rest*u*v
+
+            for coeff, weights in parts:
+                if any(w == 0 for w in weights):
+                    continue
+                forms = tuple(form_1d(i, (u_orders[i], v_orders[i]), w)
+                              for i, w in enumerate(weights))
+                terms[forms] = terms.get(forms, S.Zero) + coeff
+
+    terms = [(c, forms) for forms, c in terms.items() if c != 0]
+    return KroneckerSum(terms, remainder)
+
+def kronecker_decomposition(form, mapping=None, measure=False):
+    """
+    Decompose the terminal expression of a bilinear form on the logical
+    domain as a sum of Kronecker products of 1D forms (see KroneckerSum), as
+    needed by sum-factorization.
 
-                d = ops[i]
-                # Mass
-                expr = expr.subs(vi*ui, mass)
+    Parameters
+    ----------
+    form : BilinearForm
+        Bilinear form, defined on a single patch.
 
-                # Stiffness
-                expr = expr.subs(d(vi)*d(ui), stiff)
+    mapping : Mapping
+        Mapping of the domain; by default the mapping of the domain of the
+        form, if any. The coefficients are separable only if the mapping is
+        analytical, its metric being otherwise unknown.
 
-                # Advection
-                expr = expr.subs(vi*d(ui), adv)
+    measure : bool
+        Whether to include the Jacobian determinant of the mapping (assumed
+        to be positive) in the integrand, which is otherwise left to the
+        quadrature weights.
 
-                # Transpose of Advection
-                expr = expr.subs(d(vi)*ui, advt)
+    Returns
+    -------
+    decomposition : KroneckerSum | tuple
+        Decomposition of the expression, or nested tuples (rows for the test
+        functions, columns for the trial functions) of decompositions of its
+        blocks.
 
-                # Bilaplacian
-                expr = expr.subs(d(d(vi))*d(d(ui)), bil)
-    return expr
+    """
+    if not isinstance(form, BilinearForm):
+        raise TypeError('> Expecting a BilinearForm, given {}'.format(type(form)))
+
+    terminal = [e for e in TerminalExpr(form) if isinstance(e, DomainExpression)]
+    if len(terminal) != 1:
+        raise NotImplementedError('> Only bilinear forms on a single patch are available')
+    terminal = terminal[0]
+
+    dim  = form.ldim
+    expr = terminal.expr
+    if mapping is None:
+        mapping = getattr(terminal.target, 'mapping', None)
+    if mapping is not None:
+        subs = mapping.is_analytical
+        expr = LogicalExpr(expr, mapping=mapping, dim=dim, subs=subs)
+        if measure:
+            expr = expr*LogicalExpr(mapping.jacobian_det_expr, mapping=mapping, dim=dim, subs=subs)
+
+    constants   = {str(c) for c in expr.atoms(Constant)}
+    coordinates = symbols('x1:{}'.format(dim + 1))
+    trials      = function_pattern(form.variables[0])
+    tests       = function_pattern(form.variables[1])
+
+    expr = SymbolicExpr(expr)
+    if isinstance(expr, (Matrix, ImmutableDenseMatrix)):
+        n_rows, n_cols = expr.shape
+        return tuple(tuple(_kronecker_sum(expr[i,j], tests, trials, coordinates, constants)
+                           for j in range(n_cols)) for i in range(n_rows))
+
+    return _kronecker_sum(expr, tests, trials, coordinates, constants)
 
 #==============================================================================
 class TensorExpr(CalculusFunction):
@@ -972,7 +1439,7 @@ class TensorExpr(CalculusFunction):
         expr = _args[0]
         d_atoms = kwargs.pop('d_atoms', OrderedDict())
         mapping = kwargs.pop('mapping', None)
-        expand    = kwargs.pop('expand', False)
+        expand  = kwargs.pop('expand', False)
 
         if isinstance(expr, Add):
             args = [cls.eval(a, d_atoms=d_atoms, mapping=mapping) for a in expr.args]
@@ -1037,48 +1504,16 @@ class TensorExpr(CalculusFunction):
             return cls.eval(expr, d_atoms=d_atoms, mapping=mapping)
 
         elif isinstance(expr, BilinearForm):
-            trials = list(expr.variables[0])
-            tests  = list(expr.variables[1])
-
-            # ... # TODO improve
-            terminal_expr = TerminalExpr(expr)[0]
-            # ...
-
-            # ...
-            variables  = list(terminal_expr.atoms(ScalarTestFunction))
-            variables += list(terminal_expr.atoms(IndexedTestTrial))
-            # ...
-
-            # ...
-            if not(mapping is None):
-                dim           = expr.ldim
-                terminal_expr = LogicalExpr(terminal_expr.expr, mapping=mapping, dim=dim)
-                variables     = [LogicalExpr(e, mapping=mapping, dim=dim) for e in variables ]
-                trials        = [LogicalExpr(e, mapping=mapping, dim=dim) for e in trials ]
-                tests         = [LogicalExpr(e, mapping=mapping, dim=dim) for e in tests ]
-            # ...
-
-            d_atoms = OrderedDict()
-            for a in variables:
-                new = _split_test_function(a)
-                d_atoms[a] = new[a]
-
-            # ...
-            expr = cls.eval(terminal_expr, d_atoms=d_atoms, mapping=mapping)
-            # ...
+            # The coefficients of the 1D forms are expanded if requested
+            def as_expr(b):
+                b = b.as_expr()
+                return b.expand(deep=True) if expand else b
 
-            # ...
-            trials = [a for a in variables if ((isinstance(a, ScalarTestFunction) and a in trials) or
-                                               (isinstance(a, IndexedTestTrial) and a.base in trials))]
-
-            tests = [a for a in variables if ((isinstance(a, ScalarTestFunction) and a in tests) or
-                                              (isinstance(a, IndexedTestTrial) and a.base in tests))]
-            # ...
+            blocks = kronecker_decomposition(expr, mapping=mapping)
+            if isinstance(blocks, KroneckerSum):
+                return as_expr(blocks)
 
-            expr = _replace_atomic_expr(expr, trials, tests, d_atoms,
-                                        logical=True, expand=expand)
-
-            return expr
+            return ImmutableDenseMatrix([[as_expr(b) for b in row] for row in blocks])
 
         if expr.atoms(ScalarTestFunction) or expr.atoms(IndexedTestTrial):
             return _tensorize_atomic_expr(expr, d_atoms)
@@ -1,9 +1,11 @@
 # coding: utf-8
 
 from sympy import Dummy
+from sympy import Abs, Function, Indexed, log, sign
+from sympy.core.function import ArgumentIndexError
 from sympy import Matrix, ImmutableDenseMatrix
 from sympy.core import Basic, S
-from sympy.core import Expr, Add, Mul
+from sympy.core import Expr, Add, Mul, Pow
 from sympy.core.expr import AtomicExpr
 from sympy.core.numbers import Zero as sy_Zero
 from sympy.core.containers import Tuple
@@ -12,8 +14,10 @@ from sympy.core.compatibility import is_sequence
 from sympde.core.basic import CalculusFunction
 from sympde.core.basic import Constant
 from sympde.core.utils import random_string
+from sympde import config
 from sympde.calculus import Dot, Inner, BasicOperator
 from sympde.calculus import Grad, Hessian
+from sympde.calculus.core import DiffOperator, is_zero
 from sympde.topology import BasicDomain, Union
 from sympde.topology import NormalVector
 from sympde.topology import Boundary, Interface, Domain, InteriorDomain
@@ -23,6 +27,8 @@ from sympde.topology.space import ScalarTestFunction
 from sympde.topology.space import VectorTestFunction
 from sympde.topology.space import Trace, trace_0, trace_1
 from sympde.topology.space import ScalarField, VectorField
+from sympde.topology.space import IndexedTestTrial, IndexedVectorField
+from sympde.topology.derivatives import DifferentialOperator
 
 from .errors import UnconsistentLinearExpressionError
 from .basic  import BasicForm
@@ -33,6 +39,29 @@ from sympy   import cacheit
 from operator  import mul, add
 from functools import reduce
 
+#==============================================================================
+_validation_modes = ('eager', 'lazy', 'off')
+
+def _validation_mode(check):
+    """
+    Validation mode given by the keyword argument check of a constructor:
+    None for the default mode (sympde.config.validate), True for 'eager',
+    False for 'off', or the name of the mode.
+    """
+    if check is None:
+        check = config.validate
+    elif check is True:
+        check = 'eager'
+    elif check is False:
+        check = 'off'
+
+    if check not in _validation_modes:
+        msg = '> check must be a boolean or one of {}, given {}'
+        raise ValueError(msg.format(_validation_modes, check))
+
+    return check
+
+#==============================================================================
 class IntAdd(Add):
     _op_priority  = 20
     def __new__(cls, *args, **options):
@@ -308,7 +337,7 @@ class Functional(BasicForm):
 class LinearForm(BasicForm):
     is_linear = True
 
-    def __new__(cls, arguments, expr, **options):
+    def __new__(cls, arguments, expr, check=None, **options):
 
         # Trivial case: null expression
         if expr == 0:
@@ -321,11 +350,6 @@ class LinearForm(BasicForm):
         # TODO: why do we 'sanitize' here?
         args = _sanitize_arguments(arguments, is_linear=True)
 
-        # Check linearity with respect to the given arguments
-        if not is_linear_expression(expr, args):
-            msg = 'Expression is not linear w.r.t [{}]'.format(args)
-            raise UnconsistentLinearExpressionError(msg)
-
         # Create new object of type LinearForm
         obj = Basic.__new__(cls, args, expr)
 
@@ -333,8 +357,21 @@ class LinearForm(BasicForm):
         # TODO: is this is useful?
         obj._domain = _get_domain(expr)
 
+        # Check linearity with respect to the given arguments, now or on the
+        # first evaluation
+        obj._set_validation(_validation_mode(check))
+
         return obj
 
+    def validate(self):
+        """ Check the linearity of the form and return it. """
+        args = self.variables
+        if not is_linear_expression(self.expr, args):
+            msg = 'Expression is not linear w.r.t [{}]'.format(args)
+            raise UnconsistentLinearExpressionError(msg)
+
+        return BasicForm.validate(self)
+
     @property
     def variables(self):
         return self._args[0]
@@ -388,7 +425,7 @@ class BilinearForm(BasicForm):
     is_bilinear = True
     _is_symmetric = None
 
-    def __new__(cls, arguments, expr, **options):
+    def __new__(cls, arguments, expr, check=None, **options):
 
         # Trivial case: null expression
         if expr == 0:
@@ -402,29 +439,39 @@ class BilinearForm(BasicForm):
         # TODO: why do we 'sanitize' here?
         args = _sanitize_arguments(arguments, is_bilinear=True)
 
+        # Create new object of type BilinearForm
+        obj = Basic.__new__(cls, args, expr)
+
+        # Compute 'domain' property (scalar or tuple)
+        # TODO: is this is useful?
+        obj._domain = _get_domain(expr)
+
+        # Check linearity with respect to trial and test functions, now or on
+        # the first evaluation
+        obj._set_validation(_validation_mode(check))
+
+        return obj
+
+    def validate(self):
+        """ Check the linearity of the form w.r.t. its trial and test
+        functions and return it. """
+
         # Distinguish between trial and test functions
-        trial_functions, test_functions = args
+        trial_functions, test_functions = self.variables
 
         # Check linearity with respect to trial functions
-        if not is_linear_expression(expr, trial_functions):
+        if not is_linear_expression(self.expr, trial_functions):
             msg = ' Expression is not linear w.r.t trial functions {}'\
                     .format(trial_functions)
             raise UnconsistentLinearExpressionError(msg)
 
         # Check linearity with respect to test functions
-        if not is_linear_expression(expr, test_functions):
+        if not is_linear_expression(self.expr, test_functions):
             msg = ' Expression is not linear w.r.t test functions {}'\
                     .format(test_functions)
             raise UnconsistentLinearExpressionError(msg)
 
-        # Create new object of type BilinearForm
-        obj = Basic.__new__(cls, args, expr)
-
-        # Compute 'domain' property (scalar or tuple)
-        # TODO: is this is useful?
-        obj._domain = _get_domain(expr)
-
-        return obj
+        return BasicForm.validate(self)
 
     @property
     def variables(self):
@@ -618,19 +665,19 @@ def linearize(form, fields, trials=None):
 
     # ...
 
-    eps        = Constant('eps_' + random_string(4))
-    new_fields = [field + eps*trial for field, trial in zip(fields, trials)]
+    directions = dict(zip(fields, trials))
 
     integrals     = form.expr.args if isinstance(form.expr, Add) else [form.expr]
     new_integrals = []
 
     for I in integrals:
 
-        g0 = I.expr
-        g1 = I.expr.subs(zip(fields, new_fields)).expand()
-        dg_du = ((g1-g0)/eps).series(eps, 0, 2).subs(eps, 0)
+        try:
+            dg_du = _gateaux_derivative(I.expr, directions, {})
+        except NotImplementedError:
+            dg_du = _series_derivative(I.expr, directions)
 
-        if dg_du:
+        if not is_zero(dg_du):
             new_I = integral(I.domain, dg_du)
             new_integrals.append(new_I)
 
@@ -640,7 +687,201 @@ def linearize(form, fields, trials=None):
     return BilinearForm((trials, tests), bilinear_expr)
 
 #==============================================================================
-def is_linear_expression(expr, args, integral=True, debug=True):
+# Operators which are linear with respect to each of their arguments; their
+# derivative is the sum of the operators applied to the derivative of one
+# argument and to the other arguments
+_derivable_types = (Mul, BasicOperator, DiffOperator, DifferentialOperator, Trace, Indexed)
+
+def _gateaux_derivative(expr, directions, memo):
+    """
+    Gateaux derivative of an expression, i.e. the derivative of
+    expr(u + eps*du) with respect to eps at eps = 0, where directions maps
+    every field u to its direction du.
+
+    The derivative is obtained by differentiating the expression tree: the
+    products and the (multi-)linear operators (grad, div, curl, dot, inner,
+    convect, traces, ...) are differentiated argument by argument, and the
+    chain rule is used for powers, absolute values and elementary functions.
+
+    Raises NotImplementedError if an expression cannot be differentiated.
+    """
+    if not isinstance(expr, Basic):
+        return S.Zero
+
+    if expr in memo:
+        return memo[expr]
+
+    derivative = lambda e: _gateaux_derivative(e, directions, memo)
+
+    if expr in directions:
+        d = directions[expr]
+
+    elif not expr.args or isinstance(expr, BasicDomain):
+        d = S.Zero
+
+    elif isinstance(expr, (Matrix, ImmutableDenseMatrix)):
+        d = expr.applyfunc(derivative)
+
+    elif isinstance(expr, Tuple):
+        d = Tuple(*[derivative(a) for a in expr.args])
+
+    elif isinstance(expr, Add):
+        d = Add(*[derivative(a) for a in expr.args])
+
+    elif isinstance(expr, _derivable_types):
+        args  = expr.args
+        terms = []
+        for i, a in enumerate(args):
+            da = derivative(a)
+            if not is_zero(da):
+                terms.append(expr.func(*args[:i], da, *args[i+1:]))
+
+        d = Add(*terms)
+
+    elif isinstance(expr, Pow):
+        b, e   = expr.args
+        db, de = derivative(b), derivative(e)
+        if not b.is_commutative:
+            raise NotImplementedError('> Power of a non commutative expression')
+
+        if is_zero(de):
+            d = e*b**(e-1)*db
+        else:
+            d = expr*(de*log(b) + e*db/b)
+
+    elif isinstance(expr, Abs):
+        d = sign(expr.args[0])*derivative(expr.args[0])
+
+    elif isinstance(expr, Function) and not isinstance(expr, CalculusFunction):
+        # Chain rule
+        terms = []
+        for i, a in enumerate(expr.args):
+            da = derivative(a)
+            if not is_zero(da):
+                try:
+                    terms.append(expr.fdiff(i+1)*da)
+                except ArgumentIndexError:
+                    raise NotImplementedError('> Cannot differentiate {}'.format(expr.func))
+
+        d = Add(*terms)
+
+    else:
+        raise NotImplementedError('> Cannot differentiate {}'.format(type(expr)))
+
+    memo[expr] = d
+    return d
+
+def _series_derivative(expr, directions):
+    """
+    Gateaux derivative of an expression, computed by a series expansion of
+    expr(u + eps*du) with respect to eps.
+    """
+    eps     = Constant('eps_' + random_string(4))
+    subs    = [(u, u + eps*du) for u, du in directions.items()]
+    g1      = expr.subs(subs).expand()
+
+    return ((g1-expr)/eps).series(eps, 0, 2).subs(eps, 0)
+
+#==============================================================================
+def _linear_degree(expr, args, memo):
+    """
+    Degree of an expression with respect to the arguments, obtained by
+    propagating the degrees of the leaves through the expression tree: the
+    arguments have degree 1 and the other atoms degree 0, the degrees of
+    the factors of a product are added, and the (multi-)linear operators
+    (differential operators, dot, inner, jump, traces, integrals, ...) are
+    treated as products of their arguments.
+
+    Returns None when the degree cannot be determined structurally, e.g. for
+    sums of terms of different degrees, negative or symbolic powers, or
+    nonlinear functions of the arguments.
+    """
+    try:
+        return memo[expr]
+    except (KeyError, TypeError):
+        pass
+
+    if expr in args:
+        d = 1
+
+    elif not isinstance(expr, Basic) or isinstance(expr, BasicDomain) or not expr.args:
+        d = 0
+
+    elif isinstance(expr, (Add, Tuple, Matrix, ImmutableDenseMatrix)):
+        # zero entries of vectors and matrices are of any degree
+        entries = [a for a in expr.args if not a == 0]
+        degrees = set(_linear_degree(a, args, memo) for a in entries)
+        d = degrees.pop() if len(degrees) == 1 else (0 if not degrees else None)
+
+    elif isinstance(expr, _multilinear_types):
+        d = 0
+        for a in expr.args:
+            da = _linear_degree(a, args, memo)
+            if da is None:
+                d = None
+                break
+            d += da
+
+    elif isinstance(expr, Pow):
+        db = _linear_degree(expr.base, args, memo)
+        de = _linear_degree(expr.exp , args, memo)
+        if de != 0 or db is None:
+            d = None
+        elif db == 0:
+            d = 0
+        elif expr.exp.is_Integer and expr.exp > 0:
+            d = db*int(expr.exp)
+        else:
+            d = None
+
+    else:
+        # Any other function is nonlinear in its arguments
+        degrees = [_linear_degree(a, args, memo) for a in expr.args]
+        d = 0 if all(i == 0 for i in degrees) else None
+
+    try:
+        memo[expr] = d
+    except TypeError:
+        pass
+
+    return d
+
+def is_linear_expression(expr, args, integral=True, debug=True, method=None):
+    """
+    Checks if an expression is linear with respect to the given arguments.
+
+    Parameters
+    ----------
+    expr : sympy.Expr
+        Expression to check.
+
+    args : iterable of ScalarTestFunction | VectorTestFunction
+        Arguments with respect to which the expression must be linear.
+
+    method : str
+        'structural' or 'expand' (see sympde.config.linearity, which gives
+        the default value). The structural method only proves linearity: the
+        'expand' method is used whenever it cannot conclude.
+
+    """
+    if method is None:
+        method = config.linearity
+
+    if method not in ('structural', 'expand'):
+        raise ValueError("> method must be 'structural' or 'expand', given {}".format(method))
+
+    if method == 'structural':
+        args = tuple(args)
+        for arg in args:
+            if not isinstance(arg, (ScalarTestFunction, VectorTestFunction)):
+                raise TypeError('argument must be a TestFunction')
+
+        if _linear_degree(expr, frozenset(args), {}) == 1:
+            return True
+
+    return _is_linear_expression_expand(expr, args, debug=debug)
+
+def _is_linear_expression_expand(expr, args, debug=True):
     """checks if an expression is linear with respect to the given arguments."""
     # ...
     left_args  = []
@@ -710,6 +951,10 @@ def is_linear_expression(expr, args, integral=True, debug=True):
 
     return True
 
+# Operators whose degree is the sum of the degrees of their arguments
+_multilinear_types = (Mul, Integral, BasicOperator, DiffOperator, DifferentialOperator,
+                      Trace, IndexedTestTrial, IndexedVectorField)
+
 #==============================================================================
 def integral(domain, expr):
     return Integral(expr, domain)
@@ -0,0 +1,221 @@
+# coding: utf-8
+
+import tempfile
+
+import pytest
+
+from sympde.calculus import grad, dot, jump
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import elements_of
+from sympde.topology import Square, PolarMapping
+from sympde.expr     import BilinearForm, integral
+from sympde.expr     import TerminalExpr
+from sympde.cache    import DiskCache, canonical_key, dumps, loads
+from sympde.cache    import enable_disk_cache, disable_disk_cache, get_disk_cache
+from sympde.cache    import LRUCache, cacheit, stats, clear, set_maxsize
+
+#==============================================================================
+def _poisson_form(name='Omega'):
+    domain = Square(name)
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+    return BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+
+def _multipatch_form():
+    A  = Square('A')
+    B  = Square('B')
+    M1 = PolarMapping('M1', 2, c1=0, c2=0, rmin=0, rmax=1)
+    M2 = PolarMapping('M2', 2, c1=0, c2=0, rmin=1, rmax=2)
+    D1 = M1(A)
+    D2 = M2(B)
+    domain = D1.join(D2, name='D',
+                     bnd_minus=D1.get_boundary(axis=0, ext=1),
+                     bnd_plus =D2.get_boundary(axis=0, ext=-1))
+
+    V    = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+    I    = domain.interfaces
+    expr = integral(domain, dot(grad(u), grad(v))) + integral(I, jump(u)*jump(v))
+    return BilinearForm((u, v), expr)
+
+def _closure(c):
+    def f(x):
+        return c*x
+    return f
+
+#==============================================================================
+def test_canonical_key():
+
+    a1 = _poisson_form()
+    a2 = _poisson_form()
+    a3 = _poisson_form(name='Gamma')
+
+    # Identical forms built independently share the same key
+    assert canonical_key(a1) == canonical_key(a2)
+
+    # The domain is part of the key
+    assert canonical_key(a1) != canonical_key(a3)
+
+    # Extra objects (e.g. options) are part of the key
+    assert canonical_key(a1, {'dim': 2}) != canonical_key(a1, {'dim': 3})
+
+    # Functions are keyed by name, other callables cannot be keyed
+    assert canonical_key(_poisson_form) == canonical_key(_poisson_form)
+    assert canonical_key(_poisson_form) != canonical_key(_multipatch_form)
+
+    for obj in [lambda x: x, lambda x: 2*x, _closure(1), object()]:
+        with pytest.raises(TypeError):
+            canonical_key(a1, obj)
+
+#==============================================================================
+def test_dumps_loads():
+
+    a = _multipatch_form()
+    r = TerminalExpr(a)
+
+    for e1, e2 in zip(r, loads(dumps(r))):
+        assert e1 == e2
+        assert e1.target.dim     == e2.target.dim
+        assert e1.target.mapping == e2.target.mapping
+
+    for domain in a.domain.args:
+        assert loads(dumps(domain)) == domain
+        assert loads(dumps(domain)).mapping == domain.mapping
+
+#==============================================================================
+def test_disk_cache_eviction():
+
+    with tempfile.TemporaryDirectory() as path:
+        cache = DiskCache(path, max_size=3000)
+
+        for i in range(5):
+            assert cache.set('key{}'.format(i), 'x' * 1000)
+
+        # Least recently used entries are evicted first
+        assert cache.size <= 3000
+        assert 'key4' in cache
+        assert 'key0' not in cache
+        assert cache.get('key0') is None
+        assert cache.get('key4') == 'x' * 1000
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Values larger than the cache are not stored
+        assert not cache.set('big', 'x' * 4000)
+
+        cache.clear()
+        assert len(cache) == 0
+
+#==============================================================================
+def test_terminal_expr_disk_cache():
+
+    from sympy.core import cache as sympy_cache
+
+    with tempfile.TemporaryDirectory() as path:
+        cache = enable_disk_cache(path)
+        try:
+            assert get_disk_cache() is cache
+
+            expected = TerminalExpr(_poisson_form())
+            assert (cache.hits, cache.misses) == (0, 1)
+            assert len(cache) == 1
+
+            # Simulate a new process: in-memory cache is empty, objects are new
+            sympy_cache.clear_cache()
+            result = TerminalExpr(_poisson_form())
+            assert (cache.hits, cache.misses) == (1, 1)
+            assert result == expected
+
+            a = _multipatch_form()
+            expected = TerminalExpr(a)
+            sympy_cache.clear_cache()
+            result = TerminalExpr(a)
+            assert cache.hits == 2
+            assert result == expected
+
+        finally:
+            disable_disk_cache()
+
+    assert get_disk_cache() is None
+
+#==============================================================================
+def test_lru_cache():
+
+    cache = LRUCache('test', maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    # 'b' is the least recently used entry
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+
+    cache.maxsize = 1
+    assert len(cache) == 1
+    assert cache.evictions == 2
+
+    info = cache.info()
+    assert info['size'] == 1
+    assert info['memory'] > 0
+
+    cache.clear()
+    assert cache.info()['size'] == 0
+    assert cache.info()['hits'] == 0
+
+#==============================================================================
+def test_cache_registry():
+
+    calls = []
+
+    @cacheit('test_registry')
+    def f(x, y=1):
+        calls.append(x)
+        return x + y
+
+    assert f(1) == f(1) == 2
+    assert f(1, y=2) == 3
+    assert f([1], y=[2]) == [1, 2]    # unhashable: not cached
+    assert len(calls) == 3
+
+    info = stats('test_registry')
+    assert (info['hits'], info['misses'], info['size']) == (1, 3, 2)
+
+    set_maxsize('test_registry', 1)
+    assert stats('test_registry')['evictions'] == 1
+
+    clear('test_registry')
+    assert stats('test_registry')['size'] == 0
+
+    # The sympde subsystems are registered
+    TerminalExpr(_poisson_form())
+    info = stats()
+    for name in ['terminal_expr', 'logical_expr', 'symbolic_expr', 'mapping',
+                 'derivatives', 'calculus']:
+        assert name in info
+
+    assert info['terminal_expr']['misses'] > 0
+
+    # SymPy's clear_cache also clears the sympde caches
+    from sympy.core import cache as sympy_cache
+    sympy_cache.clear_cache()
+    assert all(i['size'] == 0 for i in stats().values())
+
+    try:
+        stats('unknown')
+    except ValueError:
+        pass
+    else:
+        assert False
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
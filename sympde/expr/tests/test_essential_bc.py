@@ -1,11 +1,14 @@
 # coding: utf-8
 
+import pytest
+
 from sympde.core     import Constant
 from sympde.calculus import grad, dot
 from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
 from sympde.topology import element_of
 from sympde.topology import Domain, Boundary, NormalVector
 from sympde.expr     import EssentialBC
+from sympde.expr     import BilinearForm, LinearForm, integral, find
 
 #==============================================================================
 def test_essential_bc_1():
@@ -63,6 +66,54 @@ def test_essential_bc_1():
     assert( bc.index_component == [0] )
     # ...
 
+#==============================================================================
+def test_essential_bc_deferred_1():
+    domain = Domain('Omega', dim=2)
+
+    V = ScalarFunctionSpace('V', domain)
+    W = VectorFunctionSpace('W', domain)
+
+    u, v = [element_of(V, name=i) for i in ['u', 'v']]
+    w    = element_of(W, name='w')
+
+    B1 = Boundary(r'\Gamma_1', domain)
+    nn = NormalVector('nn')
+
+    # ... the analysis is deferred to the first access to the properties
+    for lhs in [v, dot(grad(v), nn), w, dot(w, nn), w[0]]:
+        bc_eager = EssentialBC(lhs, 0, B1)
+        bc_lazy  = EssentialBC(lhs, 0, B1, check='lazy')
+        bc_off   = EssentialBC(lhs, 0, B1, check=False)
+
+        assert( bc_lazy._order is None )
+        assert( bc_off._order is None )
+
+        for bc in [bc_lazy, bc_off]:
+            assert( bc.variable == bc_eager.variable )
+            assert( bc.order == bc_eager.order )
+            assert( bc.normal_component == bc_eager.normal_component )
+            assert( bc.index_component == bc_eager.index_component )
+    # ...
+
+    # ... errors are raised on first access
+    bc = EssentialBC(u*v, 0, B1, check=False)
+    with pytest.raises(ValueError):
+        bc.order
+    # ...
+
+    # ... the equation gives the same boundary conditions
+    a = integral(domain, dot(grad(u), grad(v)))
+    l = integral(domain, v)
+    bc = EssentialBC(u, 0, domain.boundary)
+
+    eq_eager = find(u, forall=v, lhs=a, rhs=l, bc=bc)
+    eq_off   = find(u, forall=v, lhs=a, rhs=l, bc=bc, check=False)
+
+    assert( eq_off.lhs == eq_eager.lhs )
+    assert( eq_off.rhs == eq_eager.rhs )
+    assert( eq_off.bc == eq_eager.bc )
+    assert( [i.position for i in eq_off.bc] == [i.position for i in eq_eager.bc] )
+    # ...
 
 #==============================================================================
 # CLEAN UP SYMPY NAMESPACE
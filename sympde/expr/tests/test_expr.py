@@ -3,16 +3,19 @@
 # TODO: - add assert to every test
 
 import pytest
+from collections import OrderedDict
 
 from sympy.core.containers import Tuple
 from sympy import Function
-from sympy import pi, cos, sin, exp
+from sympy import pi, cos, sin, exp, sqrt, Abs, sign
 from sympy import ImmutableDenseMatrix as Matrix
+from sympy import zeros
 
 from sympde.core     import Constant
 from sympde.calculus import grad, dot, inner, rot, div
 from sympde.calculus import laplace, bracket, convect
 from sympde.calculus import jump, avg, Dn, minus, plus
+from sympde.calculus import Jump
 
 from sympde.topology import dx1, dx2, dx3
 from sympde.topology import dx, dy, dz
@@ -26,13 +29,200 @@ from sympde.topology import trace_1
 from sympde.topology import Square
 from sympde.topology import ElementDomain
 from sympde.topology import Area
+from sympde.topology import InterfaceMapping
 
 from sympde.expr.expr import LinearExpr
 from sympde.expr.expr import LinearForm, BilinearForm
 from sympde.expr.expr import integral
 from sympde.expr.expr import Functional, Norm
 from sympde.expr.expr import linearize
+from sympde.expr.expr import is_linear_expression
 from sympde.expr.evaluation import TerminalExpr
+from sympde.expr.evaluation import _to_matrix_form
+from sympde.expr.evaluation import _split_expr_over_interface
+from sympde.expr.evaluation import InterfaceExpression
+from sympde.expr.evaluation import shutdown_executor, _get_executor
+
+#==============================================================================
+def _to_matrix_form_subs(expr, *, trials=None, tests=None):
+    """
+    Reference implementation of _to_matrix_form, which substitutes the full
+    expression once per row and once per entry of the matrix.
+
+    """
+    # Bilinear form
+    if trials and tests:
+        M = zeros(len(tests), len(trials))
+        for i, test in enumerate(tests):
+            subs_i = {v:0 for v in tests if v != test}
+            expr_i = expr.subs(subs_i)
+            for j, trial in enumerate(trials):
+                subs_j  = {u:0 for u in trials if u != trial}
+                M[i, j] = expr_i.subs(subs_j)
+
+    # Linear form
+    elif tests:
+        M = zeros(len(tests), 1)
+        for i, test in enumerate(tests):
+            subs_i = {v:0 for v in tests if v != test}
+            M[i, 0] = expr.subs(subs_i)
+
+    # Functional
+    else:
+        M = [[expr]]
+
+    return Matrix(M)
+
+#==============================================================================
+def _split_expr_over_interface_subs(expr, interface, tests=None, trials=None):
+    """
+    Reference implementation of _split_expr_over_interface, which nullifies
+    the functions of the other side through repeated substitutions of the full
+    expression.
+
+    """
+    # ...
+    is_bilinear = not( trials is None ) and not( tests is None )
+    is_linear   =    ( trials is None ) and not( tests is None )
+
+    if trials is None: trials = []
+    if tests  is None: tests  = []
+    # ...
+
+    int_expressions = []
+    bnd_expressions = OrderedDict()
+
+    # ...
+    # we replace all jumps
+    jumps = expr.atoms(Jump)
+    args = [j._args[0] for j in jumps]
+
+    for a in args:
+        expr = expr.subs({jump(a): minus(a) - plus(a)})
+    # ...
+
+    # ...
+    d_trials = OrderedDict()
+    for u in trials:
+        u_minus = minus(u)
+        u_plus  = plus(u)
+        d_trials[u] = {'-': u_minus, '+': u_plus}
+
+#        # TODO add sub for avg
+#        expr = expr.subs({jump(u): u_minus - u_plus})
+
+    d_tests  = OrderedDict()
+    for v in tests:
+        v_minus = minus(v)
+        v_plus  = plus(v)
+        d_tests[v] = {'-': v_minus, '+': v_plus}
+
+#        # TODO add sub for avg
+#        expr = expr.subs({jump(v): v_minus - v_plus})
+    # ...
+
+    # ...
+    trials = []
+    for u in d_trials.keys():
+        u_minus = d_trials[u]['-']
+        u_plus  = d_trials[u]['+']
+        trials += [u_minus, u_plus]
+
+    tests = []
+    for u in d_tests.keys():
+        u_minus = d_tests[u]['-']
+        u_plus  = d_tests[u]['+']
+        tests += [u_minus, u_plus]
+    # ...
+
+    # ...
+    def _nullify(expr, u, us):
+        """nullifies all symbols in us except u."""
+        others = list(set(us) - set([u]))
+        for other in others:
+            expr = expr.subs({other: 0})
+        return expr
+    # ...
+    if is_bilinear:
+        for u in d_trials.keys():
+            u_minus = d_trials[u]['-']
+            u_plus  = d_trials[u]['+']
+            for v in d_tests.keys():
+                v_minus = d_tests[v]['-']
+                v_plus  = d_tests[v]['+']
+
+                # ...
+                newexpr = _nullify(expr, u_minus, trials)
+                newexpr = _nullify(newexpr, v_minus, tests)
+                newexpr = newexpr.subs({u_minus: u, v_minus: v})
+                mapping = newexpr.atoms(InterfaceMapping)
+                if mapping and not newexpr.is_zero:
+                    mapping = list(mapping)[0]
+                    newexpr = newexpr.subs(mapping, mapping.minus)
+
+                if not newexpr.is_zero:
+                    bnd_expressions[interface.minus] = newexpr
+                # ...
+                # TODO must call InterfaceExpression afterward
+                newexpr = _nullify(expr, u_minus, trials)
+                newexpr = _nullify(newexpr, v_plus, tests)
+                mapping = newexpr.atoms(InterfaceMapping)
+                if mapping:
+                    mapping = list(mapping)[0]
+                    newexpr = newexpr.subs(mapping, mapping.plus)
+                if not newexpr.is_zero:
+                    int_expressions += [InterfaceExpression(interface, u_minus, v_plus, newexpr)]
+                # ...
+                # TODO must call InterfaceExpression afterward
+                newexpr = _nullify(expr, u_plus, trials)
+                newexpr = _nullify(newexpr, v_minus, tests)
+                mapping = newexpr.atoms(InterfaceMapping)
+                if mapping:
+                    mapping = list(mapping)[0]
+                    newexpr = newexpr.subs(mapping, mapping.plus)
+                if not newexpr.is_zero:
+                    int_expressions += [InterfaceExpression(interface, u_plus, v_minus, newexpr)]
+                # ...
+                newexpr = _nullify(expr, u_plus, trials)
+                newexpr = _nullify(newexpr, v_plus, tests)
+                newexpr = newexpr.subs({u_plus: u, v_plus: v})
+                mapping = newexpr.atoms(InterfaceMapping)
+                if mapping:
+                    mapping = list(mapping)[0]
+                    newexpr = newexpr.subs(mapping, mapping.plus)
+                if not newexpr.is_zero:
+                    bnd_expressions[interface.plus] = newexpr
+                # ...
+
+    elif is_linear:
+        for v in d_tests.keys():
+            v_minus = d_tests[v]['-']
+            v_plus  = d_tests[v]['+']
+
+            # ...
+            newexpr = _nullify(expr, v_minus, tests)
+            newexpr = newexpr.subs({v_minus: v})
+            mapping = newexpr.atoms(InterfaceMapping)
+            if mapping:
+                mapping = list(mapping)[0]
+                newexpr = newexpr.subs(mapping, mapping.minus)
+            if not newexpr.is_zero:
+                bnd_expressions[interface.minus] = newexpr
+            # ...
+
+            # ...
+            newexpr = _nullify(expr, v_plus, tests)
+            newexpr = newexpr.subs({v_plus: v})
+            mapping = newexpr.atoms(InterfaceMapping)
+            if mapping:
+                mapping = list(mapping)[0]
+                newexpr = newexpr.subs(mapping, mapping.plus)
+            if not newexpr.is_zero:
+                bnd_expressions[interface.plus] = newexpr
+            # ...
+
+    return int_expressions, bnd_expressions
+
 
 #==============================================================================
 def test_linear_expr_2d_1():
@@ -891,6 +1081,45 @@ def test_terminal_expr_bilinear_3d_1():
     assert e2[0].expr          == dx(um)*dx(vm) + dy(um)*dy(vm) + dz(um)*dz(vm)
     assert e3[0].expr.factor() == (dx1(u)*dx1(v) + dx2(u)*dx2(v) + dx3(u)*dx3(v))*det
 
+#==============================================================================
+def test_to_matrix_form_2d_1():
+
+    domain = Domain('Omega', dim=2)
+    x,y    = domain.coordinates
+
+    V = VectorFunctionSpace('V', domain)
+    W = ScalarFunctionSpace('W', domain)
+
+    u,v = elements_of(V, names='u,v')
+    p,q = elements_of(W, names='p,q')
+    f   = Function('f')
+
+    trials = (u[0], u[1], p)
+    tests  = (v[0], v[1], q)
+
+    # Products of (derivatives of) test and trial functions
+    expr = x*dx(u[0])*dy(v[1]) + u[1]*v[1] - p*dx(v[0]) + y*q*p + dx(u[0])*q
+    M    = _to_matrix_form(expr, trials=trials, tests=tests)
+
+    assert M == _to_matrix_form_subs(expr, trials=trials, tests=tests)
+    assert M[1, 0] == x*dx(u[0])*dy(v[1])
+    assert M[2, 2] == y*q*p
+    assert M[0, 1] == 0
+
+    # Factorized and nonlinear terms, and terms without test/trial functions
+    expr = (dx(u[0]) + dx(u[1]))*(v[0] - v[1])*exp(x) + (u[0] + p)**2*v[1] \
+         + f(dx(u[1]))*v[0] + cos(q)*p + x*y
+    M    = _to_matrix_form(expr, trials=trials, tests=tests)
+
+    assert M == _to_matrix_form_subs(expr, trials=trials, tests=tests)
+
+    # Linear form
+    expr = x*v[0] + (v[1] + q)*y + sin(q)
+    M    = _to_matrix_form(expr, tests=tests)
+
+    assert M == _to_matrix_form_subs(expr, tests=tests)
+    assert M.shape == (3, 1)
+
 #==============================================================================
 @pytest.mark.skip(reason="New linearize() function does not accept 'LinearExpr' objects")
 def test_linearize_expr_2d_1():
@@ -1141,6 +1370,129 @@ def test_linearize_form_2d_4():
 
     assert a(du, v) == int_0(dot(grad(v), grad(du)) + 4.*exp(-u) * du * v)
 
+#==============================================================================
+def test_linearize_form_2d_5():
+    domain = Domain('Omega', dim=2)
+    B1     = Boundary(r'\Gamma_1', domain)
+    nn     = NormalVector('nn')
+    eps    = Constant('eps', real=True)
+
+    V = ScalarFunctionSpace('V', domain)
+    W = VectorFunctionSpace('W', domain)
+
+    v, F, u = elements_of(V, names='v, F, u')
+    w, G, m = elements_of(W, names='w, G, m')
+
+    int_0 = lambda expr: integral(domain, expr)
+    int_1 = lambda expr: integral(B1, expr)
+
+    # ... p-Laplacian, with a non integer power
+    s = eps**2 + dot(grad(F), grad(F))
+    l = LinearForm(v, int_0(sqrt(s)*dot(grad(F), grad(v))))
+    a = linearize(l, F, trials=u)
+    assert a(u, v) == int_0(sqrt(s)*dot(grad(u), grad(v)) +
+                            dot(grad(F), grad(u))*dot(grad(F), grad(v))/sqrt(s))
+    # ...
+
+    # ... absolute value
+    l = LinearForm(v, int_0(Abs(F)*F*v))
+    a = linearize(l, F, trials=u)
+    assert a(u, v) == int_0(Abs(F)*u*v + sign(F)*F*u*v)
+    # ...
+
+    # ... indexed components and convection
+    l = LinearForm(w, int_0(G[0]*G[1]*w[0] + dot(convect(G, G), w)))
+    a = linearize(l, G, trials=m)
+    assert a(m, w) == int_0((m[0]*G[1] + G[0]*m[1])*w[0] +
+                            dot(convect(m, G), w) + dot(convect(G, m), w))
+    # ...
+
+    # ... boundary integral
+    l = LinearForm(v, int_1(F**2*v*dot(grad(F), nn)))
+    a = linearize(l, F, trials=u)
+    assert a(u, v) == int_1(2*F*u*v*dot(grad(F), nn) + F**2*v*dot(grad(u), nn))
+    # ...
+
+    # ... field which does not appear in the form
+    l = LinearForm(v, int_0(F**2*v) + int_1(v))
+    a = linearize(l, F, trials=u)
+    assert a(u, v) == int_0(2*F*u*v)
+    # ...
+
+#==============================================================================
+def test_terminal_expr_bind_2d_1():
+
+    from sympde.expr.evaluation import kernel_dependencies
+    from sympde.cache           import clear, stats
+
+    domain = Square()
+    B      = domain.boundary
+    x, y   = domain.coordinates
+    kappa  = Constant('kappa', is_real=True)
+    mu     = Constant('mu', is_real=True)
+
+    V = ScalarFunctionSpace('V', domain)
+    W = VectorFunctionSpace('W', domain)
+
+    u, v, F, G = elements_of(V, names='u, v, F, G')
+    H, K       = elements_of(W, names='H, K')
+
+    a = BilinearForm((u, v), integral(domain, F*u*v + dot(grad(F), grad(u))*v + div(H)*u*v)
+                             + integral(B, kappa*u*v))
+
+    terminal = TerminalExpr(a)
+
+    # ... dependency record
+    dependencies = kernel_dependencies(a)
+    assert dependencies['F'] == dependencies['H'] == (0,)
+    assert dependencies['kappa'] == tuple(range(1, len(terminal)))
+    # ...
+
+    # ... the kernel expressions which do not depend on the free variables
+    #     are not recomputed
+    for kwargs in [dict(F=G), dict(H=K), dict(kappa=2), dict(kappa=mu**2, F=G, H=K)]:
+        b = a.bind(**kwargs)
+        assert b._binding is not None
+
+        expected = TerminalExpr(BilinearForm((u, v), a._update_free_variables(**kwargs)))
+        assert TerminalExpr(b) == expected
+
+        patched = set(i for k in kwargs for i in dependencies[k])
+        for i, (e1, e2) in enumerate(zip(terminal, TerminalExpr(b))):
+            assert (e1 is e2) == (i not in patched)
+    # ...
+
+    # ... the kernel expressions which vanish are removed
+    b = a.bind(kappa=0)
+    assert b._binding is not None
+
+    expected = TerminalExpr(BilinearForm((u, v), a._update_free_variables(kappa=0)))
+    assert TerminalExpr(b) == expected
+    assert len(expected) == 1
+    # ...
+
+    # ... forms bound from a bound form
+    c = a.bind(F=G).bind(G=F)
+    assert TerminalExpr(c) == terminal
+    # ...
+
+    # ... the terminal expressions are only kept in the in-memory caches
+    b = a.bind(kappa=2)
+    expected = TerminalExpr(b)
+    clear('terminal_expr')
+    assert stats('terminal_expr')['size'] == 0
+    assert TerminalExpr(b) == expected
+    # ...
+
+    # ... the terminal expression is recomputed when it cannot be patched
+    for kwargs in [dict(F=x*G), dict(kappa=x), dict(F=K)]:
+        b = a.bind(**kwargs)
+        assert b._binding is None
+    # ...
+
+    with pytest.raises(ValueError):
+        a.bind(nu=1)
+
 #==============================================================================
 def test_area_2d_1():
 
@@ -1622,6 +1974,148 @@ def test_linearity_bilinear_form_2d_1():
     with pytest.raises(UnconsistentLinearExpressionError):
         _ = BilinearForm((u, v), int_0(u * v) + int_1(v * exp(u)))
 
+#==============================================================================
+def test_linearity_structural_2d_1():
+
+    from sympde import config
+    from sympde.expr.expr import _linear_degree
+
+    domain = Domain('Omega', dim=2)
+    B1     = Boundary(r'\Gamma_1', domain)
+    x, y   = domain.coordinates
+    nn     = NormalVector('nn')
+    kappa  = Constant('kappa', is_real=True)
+
+    V = ScalarFunctionSpace('V', domain)
+    W = VectorFunctionSpace('W', domain)
+
+    u, v, f = elements_of(V, names='u, v, f')
+    w, z    = elements_of(W, names='w, z')
+
+    int_0 = lambda expr: integral(domain, expr)
+    int_1 = lambda expr: integral(B1, expr)
+
+    linear = [
+        (int_0(dot(grad(u), grad(v)) + kappa*x*u*v), (u,)),
+        (int_0(f**2*u*v) + int_1(v*dot(grad(u), nn)), (u,)),
+        (int_0(inner(grad(w), grad(z)) + div(w)*v + w[0]*z[1]), (w,)),
+        (int_0(rot(w)*rot(z) + sin(x)*dot(w, z)), (z,)),
+        (int_0(u**1*v), (v,)),
+    ]
+
+    nonlinear = [
+        (int_0(u**2*v), (u,)),
+        (int_0(exp(u)*v), (u,)),
+        (int_0(u*v + f*v), (u,)),
+        (int_0(u*v/u), (u,)),
+        (int_0(dot(w, w)*v), (w,)),
+        (int_0(u*dot(grad(u), grad(v))), (u, v)),
+    ]
+
+    # The structural and expand-based methods agree
+    for method in ['structural', 'expand']:
+        for expr, args in linear:
+            assert is_linear_expression(expr, args, method=method)
+
+        for expr, args in nonlinear:
+            assert not is_linear_expression(expr, args, method=method, debug=False)
+
+    # The linear expressions do not need the expand-based check
+    for expr, args in linear:
+        assert _linear_degree(expr, frozenset(args), {}) == 1
+
+    # Sums of terms of different degrees are undecided
+    assert _linear_degree(int_0(u*v + f*v), frozenset([u]), {}) is None
+
+    # The default method is taken from the configuration
+    assert config.linearity == 'structural'
+    config.linearity = 'expand'
+    try:
+        assert is_linear_expression(int_0(u*v), (u,))
+    finally:
+        config.linearity = 'structural'
+
+    with pytest.raises(ValueError):
+        is_linear_expression(int_0(u*v), (u,), method='unknown')
+
+#==============================================================================
+def test_linearity_deferred_2d_1():
+
+    from sympde import config
+    from sympde.expr.expr import Integral
+    from sympde.expr.errors import UnconsistentLinearExpressionError
+
+    domain = Domain('Omega', dim=2)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    int_0 = lambda expr: integral(domain, expr)
+
+    a_linear    = int_0(dot(grad(u), grad(v)) + u*v)
+    a_nonlinear = int_0(u**2*v)
+
+    # ... eager validation (default)
+    assert config.validate == 'eager'
+    with pytest.raises(UnconsistentLinearExpressionError):
+        BilinearForm((u, v), a_nonlinear)
+
+    with pytest.raises(UnconsistentLinearExpressionError):
+        LinearForm(v, int_0(u*v**2), check=True)
+    # ...
+
+    # ... lazy validation: checked on first evaluation
+    a = BilinearForm((u, v), a_nonlinear, check='lazy')
+    assert a._check_pending
+
+    with pytest.raises(UnconsistentLinearExpressionError):
+        TerminalExpr(a)
+
+    a = BilinearForm((u, v), a_linear, check='lazy')
+    assert a == BilinearForm((u, v), a_linear)
+    TerminalExpr(a)
+    assert not a._check_pending
+    # ...
+
+    # ... no validation, unless explicitly requested
+    l = LinearForm(v, int_0(v**2), check=False)
+    assert not l._check_pending
+    TerminalExpr(l)
+
+    with pytest.raises(UnconsistentLinearExpressionError):
+        l.validate()
+
+    assert BilinearForm((u, v), a_linear, check=False).validate().expr == a_linear
+    # ...
+
+    # ... default mode from the configuration
+    config.validate = 'off'
+    try:
+        BilinearForm((u, v), a_nonlinear)
+
+        # the equality of integrals does not depend on the configuration
+        assert Integral((u + v)**2, domain.interior) == Integral(u**2 + 2*u*v + v**2, domain.interior)
+    finally:
+        config.validate = 'eager'
+
+    assert Integral((u + v)**2, domain.interior) == Integral(u**2 + 2*u*v + v**2, domain.interior)
+    # ...
+
+    # ... the validation mode is kept when the fields are annotated
+    F = element_of(V, name='F')
+    a = BilinearForm((u, v), int_0(F*u**2*v), check=False)
+    assert not a.annotate()._check_pending
+    TerminalExpr(a)
+
+    a = BilinearForm((u, v), int_0(F*u**2*v), check='lazy')
+    with pytest.raises(UnconsistentLinearExpressionError):
+        TerminalExpr(a)
+    # ...
+
+    with pytest.raises(ValueError):
+        BilinearForm((u, v), a_linear, check='never')
+
 #==============================================================================
 def test_interface_2d_1():
 
@@ -1739,6 +2233,92 @@ def test_interface_integral_1():
 #    print(expr)
 #    # ...
 
+#==============================================================================
+def test_split_expr_over_interface_2d_1():
+
+    A = Square('A')
+    B = Square('B')
+
+    domain = A.join(B, name = 'domain',
+                bnd_minus = A.get_boundary(axis=0, ext=1),
+                bnd_plus  = B.get_boundary(axis=0, ext=-1))
+
+    x,y = domain.coordinates
+    I   = domain.interfaces
+
+    V = ScalarFunctionSpace('V', domain, kind=None)
+
+    u, p, v, q = elements_of(V, names='u, p, v, q')
+    kappa      = Constant('kappa')
+
+    # Bilinear form
+    expr = Matrix([[- avg(Dn(u)) * jump(v) + kappa * jump(u) * jump(v)
+                    + plus(Dn(u)) * minus(v) + x * jump(p) * plus(q)]])
+
+    for trials, tests in [([u], [v]), ([u, p], [v, q])]:
+        ls_int, d_bnd = _split_expr_over_interface(expr, I, tests=tests, trials=trials)
+        ref_int, ref_bnd = _split_expr_over_interface_subs(expr, I, tests=tests, trials=trials)
+
+        assert ls_int == ref_int
+        assert [(e.trial, e.test) for e in ls_int] == [(e.trial, e.test) for e in ref_int]
+        assert list(d_bnd.items()) == list(ref_bnd.items())
+
+    expr = Matrix([[kappa * jump(u) * jump(v)]])
+    ls_int, d_bnd = _split_expr_over_interface(expr, I, tests=[v], trials=[u])
+
+    assert d_bnd[I.minus] == Matrix([[kappa*u*v]])
+    assert d_bnd[I.plus ] == Matrix([[kappa*u*v]])
+    assert [(e.trial, e.test) for e in ls_int] == [(minus(u), plus(v)), (plus(u), minus(v))]
+
+    # Linear form
+    expr = Matrix([[sin(x) * jump(v) + cos(y) * plus(q)]])
+    ls_int, d_bnd = _split_expr_over_interface(expr, I, tests=[v, q])
+
+    assert ls_int == []
+    assert list(d_bnd.items()) == list(_split_expr_over_interface_subs(expr, I, tests=[v, q])[1].items())
+
+#==============================================================================
+def test_terminal_expr_parallel_2d_1():
+
+    patches = [Square('A{}'.format(i), bounds1=(i, i+1), bounds2=(0, 1)) for i in range(3)]
+
+    domain = patches[0]
+    for i in range(1, 3):
+        domain = domain.join(patches[i], name='D{}'.format(i),
+                             bnd_minus=patches[i-1].get_boundary(axis=0, ext=1),
+                             bnd_plus =patches[i  ].get_boundary(axis=0, ext=-1))
+
+    I = domain.interfaces
+    V = ScalarFunctionSpace('V', domain, kind=None)
+
+    u, v  = elements_of(V, names='u, v')
+    kappa = Constant('kappa')
+
+    expr_I = - avg(Dn(u)) * jump(v) - avg(Dn(v)) * jump(u) + kappa * jump(u) * jump(v)
+    a      = BilinearForm((u,v), integral(domain, dot(grad(u),grad(v)))
+                               + integral(I, expr_I))
+
+    expected = TerminalExpr(a)
+    result   = TerminalExpr(a, parallel='process', workers=2)
+
+    assert result == expected
+    assert [e.target for e in result] == [e.target for e in expected]
+
+    with pytest.raises(ValueError):
+        TerminalExpr(a, parallel='thread')
+
+    # A single pool is kept, and rebuilt when the number of workers changes
+    executor = _get_executor(2)
+    assert _get_executor(2) is executor
+    assert _get_executor(3) is not executor
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+
+    shutdown_executor()
+    assert _get_executor(2) is not executor
+    shutdown_executor()
+    shutdown_executor()
+
 #==============================================================================
 def test_interface_integral_2():
 
@@ -0,0 +1,163 @@
+# coding: utf-8
+
+import pytest
+
+from sympy import Function, pi, sin
+
+from sympde.calculus import grad, dot, jump
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import elements_of
+from sympde.topology import Square, PolarMapping
+from sympde.expr     import BilinearForm, LinearForm, integral
+from sympde.expr     import TerminalExpr, Norm, find, EssentialBC
+from sympde.serialization import encode, decode, digest, FORMAT_VERSION
+from sympde.serialization import MAGIC, _uint, _text
+from sympde.serialization import _SINGLETON, _TYPE, _BASIC, _OBJECT
+
+#==============================================================================
+def _poisson_form(name='Omega'):
+    domain = Square(name)
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+    return BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+
+def _multipatch_form():
+    A  = Square('A')
+    B  = Square('B')
+    M1 = PolarMapping('M1', 2, c1=0, c2=0, rmin=0, rmax=1)
+    M2 = PolarMapping('M2', 2, c1=0, c2=0, rmin=1, rmax=2)
+    D1 = M1(A)
+    D2 = M2(B)
+    domain = D1.join(D2, name='D',
+                     bnd_minus=D1.get_boundary(axis=0, ext=1),
+                     bnd_plus =D2.get_boundary(axis=0, ext=-1))
+
+    V    = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+    I    = domain.interfaces
+    expr = integral(domain, dot(grad(u), grad(v))) + integral(I, jump(u)*jump(v))
+    return BilinearForm((u, v), expr)
+
+#==============================================================================
+def test_encode_decode_forms():
+
+    a = _multipatch_form()
+    r = TerminalExpr(a)
+
+    data = encode(a)
+    b    = decode(data)
+    assert b == a
+    assert encode(b) == data
+    assert TerminalExpr(b) == r
+
+    # Evaluated forms, with their domains and mappings
+    for e1, e2 in zip(r, decode(encode(r))):
+        assert e1 == e2
+        assert e1.target.mapping == e2.target.mapping
+
+    # Reference cycle between a mapping and its Jacobian
+    for domain in decode(encode(a.domain)).args:
+        assert domain.mapping.jacobian.args[0] is domain.mapping
+
+#==============================================================================
+def test_encode_decode_equation():
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a  = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    l  = LinearForm(v, integral(domain, sin(pi*x)*v))
+    bc = EssentialBC(u, 0, domain.boundary)
+    eq = find(u, forall=v, lhs=a(u, v), rhs=l(v), bc=bc)
+    n  = Norm(u - sin(pi*x), domain, kind='l2')
+
+    eq2, n2, options = decode(encode((eq, n, {'degree': [2, 2], 'tol': 1e-10})))
+    assert eq2.lhs == eq.lhs
+    assert eq2.rhs == eq.rhs
+    assert eq2.bc[0].lhs == bc.lhs
+    assert eq2.trial_functions == eq.trial_functions
+    assert n2 == n
+    assert options == {'degree': [2, 2], 'tol': 1e-10}
+
+#==============================================================================
+def test_structural_digest():
+
+    a1 = _poisson_form()
+    a2 = _poisson_form()
+    a3 = _poisson_form(name='Gamma')
+
+    # Identical forms built independently are encoded to the same bytes
+    assert encode(a1) == encode(a2)
+    assert digest(a1) == digest(a2)
+    assert digest(a1) != digest(a3)
+
+    # Sets are encoded independently of their iteration order
+    assert encode({'u', 'v', 'w'}) == encode({'w', 'v', 'u'})
+
+    # Shared nodes are stored once
+    assert len(encode((a1, a2))) < len(encode(a1)) + 8
+
+#==============================================================================
+def test_decode_errors():
+
+    data = encode(_poisson_form())
+
+    with pytest.raises(ValueError):
+        decode(b'XXXX' + data[4:])
+
+    with pytest.raises(ValueError):
+        decode(data[:-10])
+
+    with pytest.raises(ValueError):
+        decode(data[:4] + bytes([FORMAT_VERSION + 1]) + data[5:])
+
+    # Classes created at run time cannot be imported by name
+    f = Function('f')
+    with pytest.raises(TypeError):
+        encode(f(pi))
+
+#==============================================================================
+def _payload(tag, name):
+    """ Data of a single node of class name, without arguments. """
+    data  = MAGIC + _uint(FORMAT_VERSION) + _uint(1) + _text(name)
+    data += _uint(1) + bytes([tag]) + _uint(0)
+    if tag == _BASIC:
+        data += _uint(0) + _uint(0)
+    if tag in (_BASIC, _OBJECT):
+        data += _uint(0)
+    return data + _uint(0)
+
+def test_decode_untrusted():
+
+    # Only classes of sympy and sympde are imported, and never called
+    for tag in (_SINGLETON, _TYPE, _BASIC, _OBJECT):
+        with pytest.raises(ValueError):
+            decode(_payload(tag, 'os:getpid'))
+        with pytest.raises(ValueError):
+            decode(_payload(tag, 'subprocess:Popen'))
+
+    with pytest.raises(ValueError):
+        decode(_payload(_SINGLETON, 'sympde.serialization:import_module'))
+    with pytest.raises(ValueError):
+        decode(_payload(_SINGLETON, 'sympy.core.numbers:Integer'))
+    with pytest.raises(ValueError):
+        decode(_payload(_BASIC, 'sympde.topology.basic:Connectivity'))
+    with pytest.raises(ValueError):
+        decode(_payload(_OBJECT, 'sympy.printing.str:StrPrinter'))
+
+    assert decode(_payload(_SINGLETON, 'sympy.core.numbers:Pi')) is pi
+    assert decode(_payload(_TYPE, 'builtins:int')) is int
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
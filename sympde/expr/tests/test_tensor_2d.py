@@ -2,6 +2,7 @@
 
 # TODO: - add assert to every test
 
+from sympy import Rational, Symbol, symbols
 from sympy.core.containers import Tuple
 
 from sympde.core     import Constant
@@ -13,9 +14,12 @@ from sympde.topology import elements_of
 from sympde.topology import Boundary
 from sympde.topology import Domain
 from sympde.topology import Mapping
+from sympde.topology import Square, PolarMapping, AffineMapping
+from sympde.topology import dx1, dx2
 
 from sympde.expr.expr import BilinearForm, integral
-from sympde.expr.evaluation import TensorExpr
+from sympde.expr.evaluation import TensorExpr, KroneckerSum, kronecker_decomposition
+from sympde.expr.evaluation import Mass, Stiffness, Advection, AdvectionT, Form1d
 
 
 #==============================================================================
@@ -43,6 +47,7 @@ def test_tensorize_2d_1():
 
     expr = TensorExpr(a)
     print(expr)
+    assert expr == mu*Mass(0)*Mass(1) + Stiffness(0)*Mass(1) + Mass(0)*Stiffness(1)
     # ...
 
 #==============================================================================
@@ -66,6 +71,9 @@ def test_tensorize_2d_2():
 
     expr = TensorExpr(a)
     print(expr)
+    assert expr.shape == (2, 2)
+    assert expr[0,0] == Stiffness(0)*Mass(1) + Mass(0)*Stiffness(1)
+    assert expr[0,1] == AdvectionT(0)*Advection(1) - Advection(0)*AdvectionT(1)
     # ...
 
 #==============================================================================
@@ -133,6 +141,91 @@ def test_tensorize_2d_3():
 
     print(TensorExpr(a))
     print('')
+    assert TensorExpr(a) == (bx**2*Stiffness(0)*Mass(1) + by**2*Mass(0)*Stiffness(1) +
+                             bx*by*Advection(0)*AdvectionT(1) + bx*by*AdvectionT(0)*Advection(1))
+
+#==============================================================================
+def test_kronecker_decomposition_2d():
+
+    domain = Square()
+    x1, x2 = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u, v, f = elements_of(V, names='u, v, f')
+
+    mu = Constant('mu', is_real=True)
+
+    # Separable coefficients
+    a = BilinearForm((u,v), integral(domain, mu*x1*x2**2*u*v + (1 + x1**2)*dx1(u)*dx1(v)))
+    k = kronecker_decomposition(a)
+    assert isinstance(k, KroneckerSum)
+    assert k.is_separable and k.rank == 2
+    assert set(k.terms) == {(mu, (Mass(0, x1), Mass(1, x2**2))),
+                            (1, (Stiffness(0, x1**2 + 1), Mass(1)))}
+
+    # Arbitrary orders of derivatives
+    a = BilinearForm((u,v), integral(domain, dx1(dx1(u))*v))
+    k = kronecker_decomposition(a)
+    assert k.terms == ((1, (Form1d(0, 2, 0), Mass(1))),)
+    assert k.terms[0][1][0].orders == (2, 0)
+
+    # Non-separable terms are left in the remainder
+    a = BilinearForm((u,v), integral(domain, (x1 + x2)*u*v + f*u*v + dx2(u)*v))
+    k = kronecker_decomposition(a)
+    assert not k.is_separable and k.rank == 3
+    assert k.remainder == Symbol('f')*Symbol('u')*Symbol('v')
+
+    # The coefficients are expanded on demand
+    a = BilinearForm((u,v), integral(domain, (1 + mu)**2*u*v))
+    assert TensorExpr(a) == (1 + mu)**2*Mass(0)*Mass(1)
+    assert TensorExpr(a, expand=True) == ((mu**2 + 2*mu + 1)*Mass(0)*Mass(1)).expand()
+
+    # Vector-valued forms: the off-diagonal blocks vanish
+    W = VectorFunctionSpace('W', domain)
+    w, z = elements_of(W, names='w, z')
+
+    a = BilinearForm((w,z), integral(domain, dot(w, z)))
+    blocks = kronecker_decomposition(a)
+    assert blocks[0][1].rank == blocks[1][0].rank == 0
+    assert blocks[0][0].terms == blocks[1][1].terms == ((1, (Mass(0), Mass(1))),)
+
+#==============================================================================
+def test_kronecker_decomposition_2d_mapping():
+
+    # Affine mapping: constant metric
+    A = AffineMapping('A', 2, c1=0, c2=0, a11=2, a12=0, a21=0, a22=3)
+    domain = A(Square())
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(u), grad(v))))
+    k = kronecker_decomposition(a)
+    assert k.is_separable
+    assert set(k.terms) == {(Rational(1, 4), (Stiffness(0), Mass(1))),
+                            (Rational(1, 9), (Mass(0), Stiffness(1)))}
+
+    # Polar mapping: separable metric, with the Jacobian determinant
+    P = PolarMapping('P', 2, c1=0, c2=0, rmin=1, rmax=2)
+    domain = P(Square())
+    x1, x2 = symbols('x1, x2')
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(u), grad(v))))
+    k = kronecker_decomposition(a, measure=True)
+    assert k.is_separable
+    assert set(k.terms) == {(1, (Stiffness(0, x1 + 1), Mass(1))),
+                            (1, (Mass(0, 1/(x1 + 1)), Stiffness(1)))}
+
+    # Generic mapping: unknown metric
+    M = Mapping('M', 2)
+    domain = M(Square())
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(u), grad(v))))
+    k = kronecker_decomposition(a)
+    assert k.rank == 0 and not k.is_separable
 
 
 #==============================================================================
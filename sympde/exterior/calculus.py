@@ -2,8 +2,6 @@
 
 # TODO - use BasicOperator instead of LinearOperator
 
-from numpy import unique
-
 from sympy.core import Basic
 from sympy.tensor import Indexed, IndexedBase
 from sympy.core import Symbol
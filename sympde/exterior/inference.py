@@ -1,8 +1,6 @@
 # coding: utf-8
 
 
-from numpy import unique
-
 from sympy.core import Basic
 from sympy.tensor import Indexed, IndexedBase
 from sympy.core import Symbol
@@ -1 +1,3 @@
 from .latex  import *
+from .pycode import *
+from .kernel import *
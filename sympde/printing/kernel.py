@@ -0,0 +1,398 @@
+# coding: utf-8
+
+"""
+Generation of element kernels from the terminal expressions of forms.
+
+The terminal expression of a form (see `sympde.expr.TerminalExpr`, possibly
+followed by `sympde.topology.LogicalExpr`) is converted with `SymbolicExpr`,
+where the test and trial functions and their derivatives become flat symbols
+such as v, v_x1 or u_0_x2. An element kernel takes the values of these
+symbols at the quadrature points of a batch of elements, and returns the
+local element matrices (bilinear forms), vectors (linear forms) or values
+(functionals) of the whole batch:
+
+- the quadrature weights are an array of shape (n_elements, n_points);
+
+- every symbol of a test or trial function is an array of shape
+  (n_elements, n_basis, n_points), where n_basis is the number of basis
+  functions of the corresponding (component of the) space;
+
+- every other symbol (fields, coordinates, constants, metric) is an array of
+  shape (n_elements, n_points), or a scalar;
+
+- all arguments are broadcast, hence values which do not depend on the element
+  (e.g. basis functions on the reference element) can be passed with a leading
+  dimension of length 1.
+
+The 'numpy' backend generates vectorized NumPy code. The 'numba' backend is
+experimental: it generates explicit loops compiled with `numba.njit`, and is
+only tested where numba is installed (the 'python' backend runs the same loops
+without compiling them, and is only meant for debugging).
+
+"""
+
+import keyword
+
+from sympy                 import cse, numbered_symbols
+from sympy                 import Matrix, ImmutableDenseMatrix
+from sympy.core            import Add, Mul, Symbol
+from sympy.printing.pycode import NumPyPrinter
+
+from sympde.core.utils import function_pattern, split_terms
+
+__all__ = ('ElementKernel', 'lambdify_kernel')
+
+_backends = ('numpy', 'numba', 'python')
+
+#==============================================================================
+class ElementKernel(object):
+    """
+    An element kernel, generated by lambdify_kernel.
+
+    Parameters
+    ----------
+    func : callable
+        Generated function.
+
+    args : tuple of str
+        Names of the arguments: the quadrature weights, then the symbols of
+        the test functions, of the trial functions and of the coefficients.
+
+    kind : str
+        'bilinear', 'linear' or 'functional'.
+
+    shape : tuple of int
+        Shape of the block structure of the expression; the kernel returns a
+        single array if shape is (), and nested tuples of arrays otherwise.
+
+    source : str
+        Python source code of the function.
+
+    backend : str
+        Backend used to generate the function.
+
+    target : BasicDomain
+        Domain of integration, if known.
+
+    """
+    def __init__(self, func, args, kind, shape, source, backend, target=None):
+        self._func    = func
+        self._args    = tuple(args)
+        self._kind    = kind
+        self._shape   = tuple(shape)
+        self._source  = source
+        self._backend = backend
+        self._target  = target
+
+    @property
+    def args(self):
+        return self._args
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def target(self):
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._func(*args, **kwargs)
+
+    def __repr__(self):
+        return 'ElementKernel({}, {})'.format(self._kind, ', '.join(self._args))
+
+#==============================================================================
+def _coefficient(x, ne, nq):
+    import numpy as np
+    return np.broadcast_to(np.asarray(x, dtype=float), (ne, nq))
+
+def _basis(x, ne, nq):
+    import numpy as np
+    x = np.asarray(x, dtype=float)
+    return np.broadcast_to(x, (ne, x.shape[-2], nq))
+
+#==============================================================================
+def lambdify_kernel(expr, tests=(), trials=(), backend='numpy', name='kernel', use_cse=True):
+    """
+    Create an element kernel which evaluates the local element matrices,
+    vectors or values of a variational form on a batch of elements.
+
+    Parameters
+    ----------
+    expr : tuple | KernelExpression | sympy.Expr | Matrix
+        Terminal expression of a form: the tuple returned by TerminalExpr (in
+        which case a tuple of kernels is returned), one of its elements, or
+        the expression of one of its elements (possibly after LogicalExpr).
+
+    tests : iterable
+        Test functions of the form (or their names); empty for a functional.
+
+    trials : iterable
+        Trial functions of the form (or their names); empty for a linear form
+        or a functional.
+
+    backend : str
+        'numpy', 'numba' (experimental, requires numba) or 'python'.
+
+    name : str
+        Name of the generated function.
+
+    use_cse : bool
+        Whether to extract the common subexpressions of the coefficients.
+
+    Returns
+    -------
+    kernel : ElementKernel
+        Function of the quadrature weights and of the symbols of the
+        expression (see the module documentation), returning an array of
+        shape (n_elements, n_test, n_trial), (n_elements, n_test) or
+        (n_elements,) for every block of the expression; the identically
+        zero blocks are None.
+
+    Examples
+    --------
+    >>> a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    >>> kernel, = lambdify_kernel(TerminalExpr(a), tests=[v], trials=[u])
+    >>> kernel.args
+    ('weights', 'v_x1', 'v_x2', 'u_x1', 'u_x2')
+    >>> kernel(np.ones((100, 9)), v_x1=bx, v_x2=by, u_x1=bx, u_x2=by).shape
+    (100, 4, 4)
+
+    """
+    from sympde.topology.mapping import SymbolicExpr
+
+    if isinstance(expr, (tuple, list)):
+        return tuple(lambdify_kernel(e, tests, trials, backend=backend,
+                                     name='{}_{}'.format(name, i), use_cse=use_cse)
+                     for i, e in enumerate(expr))
+
+    if backend not in _backends:
+        raise ValueError('> backend must be one of {}, given {}'.format(_backends, backend))
+
+    if backend == 'numba':
+        try:
+            import numba
+        except ImportError:
+            raise ImportError("> The experimental numba backend requires numba, which "
+                              "is not installed; use the backend 'numpy'") from None
+
+    target = getattr(expr, 'target', None)
+    if target is not None:
+        expr = expr.expr
+
+    tests  = function_pattern(tests)
+    trials = function_pattern(trials)
+    if tests is None and trials is not None:
+        raise ValueError('> Trial functions given without test functions')
+
+    kind = 'functional' if tests is None else 'linear' if trials is None else 'bilinear'
+
+    # ... entries of the expression, as flat symbolic expressions
+    expr = SymbolicExpr(expr)
+    if isinstance(expr, (Matrix, ImmutableDenseMatrix)):
+        shape   = expr.shape
+        entries = list(expr)
+    else:
+        shape   = ()
+        entries = [expr]
+
+    terms = [split_terms(e, tests, trials) for e in entries]
+    # ...
+
+    # ... arguments
+    symbols = set().union(*[e.free_symbols for e in entries])
+    names   = sorted(str(s) for s in symbols)
+    for n in names:
+        if not n.isidentifier() or keyword.iskeyword(n) or n.startswith('_') or n == 'weights':
+            raise ValueError('> Cannot generate a kernel for the symbol {}'.format(n))
+
+    v_args = [n for n in names if tests  is not None and tests .match(n)]
+    u_args = [n for n in names if trials is not None and trials.match(n)]
+    c_args = [n for n in names if n not in v_args and n not in u_args]
+    args   = ['weights'] + v_args + u_args + c_args
+    # ...
+
+    # ... coefficients, which only depend on the quadrature point and are
+    #     multiplied by the quadrature weight
+    coeffs = {}
+    def _coeff(c):
+        c = Symbol('weights')*c
+        if c not in coeffs:
+            coeffs[c] = Symbol('_c{}'.format(len(coeffs)))
+        return coeffs[c]
+
+    blocks = []
+    for t in terms:
+        if kind == 'functional':
+            blocks.append(None if t == 0 else _coeff(t))
+        elif not t:
+            blocks.append(None)
+        elif kind == 'linear':
+            blocks.append([(v, _coeff(c)) for v, c in t])
+        else:
+            blocks.append([(v, [(u, _coeff(c)) for u, c in cu]) for v, cu in t if cu] or None)
+
+    coeffs = list(coeffs)
+    if use_cse and coeffs:
+        temps, coeffs = cse(coeffs, symbols=numbered_symbols('_t'), order='none')
+    else:
+        temps = []
+    # ...
+
+    generate = _numpy_source if backend == 'numpy' else _loops_source
+    source   = generate(name, kind, shape, args, v_args, u_args, c_args, temps, coeffs, blocks)
+
+    import numpy as np
+    namespace = {'numpy': np, '_coefficient': _coefficient, '_basis': _basis}
+    exec(compile(source, '<{}>'.format(name), 'exec'), namespace)
+
+    if backend == 'numba':
+        from numba import njit
+        namespace['_' + name] = njit(namespace['_' + name])
+
+    return ElementKernel(namespace[name], args, kind, shape, source, backend, target)
+
+#==============================================================================
+def _prologue(name, args, v_args, u_args, c_args):
+    lines = ['def {}({}):'.format(name, ', '.join(args))]
+    lines.append('    weights = numpy.asarray(weights, dtype=float)')
+    lines.append('    _ne, _nq = weights.shape')
+    for n in v_args + u_args:
+        lines.append('    {0} = _basis({0}, _ne, _nq)'.format(n))
+    for n in c_args:
+        lines.append('    {0} = _coefficient({0}, _ne, _nq)'.format(n))
+    return lines
+
+def _result(shape, outputs):
+    if not shape:
+        return outputs[0]
+    rows = ['({},)'.format(', '.join(outputs[i*shape[1]:(i+1)*shape[1]]))
+            for i in range(shape[0])]
+    return '({},)'.format(', '.join(rows))
+
+def _numpy_source(name, kind, shape, args, v_args, u_args, c_args, temps, coeffs, blocks):
+    """ Vectorized NumPy code: the coefficients are computed for all the
+    quadrature points at once, and the blocks are obtained by contraction. """
+    printer = NumPyPrinter({'fully_qualified_modules': True})
+    pr      = printer.doprint
+
+    lines = _prologue(name, args, v_args, u_args, c_args)
+    lines.append('    weights = weights[:, None, :]')
+    for n in c_args:
+        lines.append('    {0} = {0}[:, None, :]'.format(n))
+
+    for t, e in temps:
+        lines.append('    {} = {}'.format(pr(t), pr(e)))
+    for i, c in enumerate(coeffs):
+        lines.append('    _c{} = {}'.format(i, pr(c)))
+
+    outputs = []
+    for k, block in enumerate(blocks):
+        if block is None:
+            outputs.append('None')
+            continue
+
+        out = '_out{}'.format(k)
+        outputs.append(out)
+        if kind == 'functional':
+            lines.append('    {} = numpy.broadcast_to({}, (_ne, 1, _nq)).sum(axis=(1, 2))'.format(out, pr(block)))
+
+        elif kind == 'linear':
+            expr = Add(*[Mul(v, c) for v, c in block])
+            lines.append('    {} = ({}).sum(axis=2)'.format(out, pr(expr)))
+
+        else:
+            for i, (v, cu) in enumerate(block):
+                expr = Add(*[Mul(c, u) for u, c in cu])
+                term = "numpy.einsum('eiq,ejq->eij', {}, {})".format(pr(v), pr(expr))
+                lines.append('    {} = {}{}'.format(out, '{} + '.format(out) if i else '', term))
+
+    lines.append('    return {}'.format(_result(shape, outputs)))
+    return '\n'.join(lines) + '\n'
+
+def _loops_source(name, kind, shape, args, v_args, u_args, c_args, temps, coeffs, blocks):
+    """ Explicit loops over the elements, the quadrature points and the basis
+    functions, to be compiled with numba: the coefficients are computed once
+    per quadrature point. """
+    printer = NumPyPrinter({'fully_qualified_modules': True})
+    pr      = printer.doprint
+
+    # ... wrapper: allocation of the blocks
+    lines   = _prologue(name, args, v_args, u_args, c_args)
+    outputs = []
+    for k, block in enumerate(blocks):
+        if block is None:
+            outputs.append('None')
+            continue
+
+        out = '_out{}'.format(k)
+        outputs.append(out)
+        if kind == 'functional':
+            dims = '_ne'
+        elif kind == 'linear':
+            dims = '_ne, {}.shape[1]'.format(pr(block[0][0]))
+        else:
+            dims = '_ne, {}.shape[1], {}.shape[1]'.format(pr(block[0][0]), pr(block[0][1][0][0]))
+        lines.append('    {} = numpy.zeros(({}))'.format(out, dims))
+
+    arrays = args + [o for o in outputs if o != 'None']
+    lines.append('    _{}({})'.format(name, ', '.join(arrays)))
+    lines.append('    return {}'.format(_result(shape, outputs)))
+    lines.append('')
+    # ...
+
+    # ... loops; the arrays are renamed, so that the names of the symbols
+    #     denote their values at the current point
+    params = ['_a{}'.format(i) for i in range(len(args))]
+    array  = dict(zip(args, params))
+    lines.append('def _{}({}):'.format(name, ', '.join(params + [o for o in outputs if o != 'None'])))
+    lines.append('    for _e in range(_a0.shape[0]):')
+    lines.append('        for _q in range(_a0.shape[1]):')
+    lines.append('            weights = _a0[_e, _q]')
+    for n in c_args:
+        lines.append('            {} = {}[_e, _q]'.format(n, array[n]))
+    for t, e in temps:
+        lines.append('            {} = {}'.format(pr(t), pr(e)))
+    for i, c in enumerate(coeffs):
+        lines.append('            _c{} = {}'.format(i, pr(c)))
+
+    for k, block in enumerate(blocks):
+        if block is None:
+            continue
+
+        out = '_out{}'.format(k)
+        if kind == 'functional':
+            lines.append('            {}[_e] += {}'.format(out, pr(block)))
+            continue
+
+        lines.append('            for _i in range({}.shape[1]):'.format(out))
+        for v in sorted({v for v, _ in block}, key=str):
+            lines.append('                {} = {}[_e, _i, _q]'.format(pr(v), array[str(v)]))
+
+        if kind == 'linear':
+            expr = Add(*[Mul(v, c) for v, c in block])
+            lines.append('                {}[_e, _i] += {}'.format(out, pr(expr)))
+            continue
+
+        lines.append('                for _j in range({}.shape[2]):'.format(out))
+        for u in sorted({u for _, cu in block for u, _ in cu}, key=str):
+            lines.append('                    {} = {}[_e, _j, _q]'.format(pr(u), array[str(u)]))
+
+        expr = Add(*[Mul(v, Add(*[Mul(c, u) for u, c in cu])) for v, cu in block])
+        lines.append('                    {}[_e, _i, _j] += {}'.format(out, pr(expr)))
+    # ...
+
+    return '\n'.join(lines) + '\n'
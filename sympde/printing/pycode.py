@@ -0,0 +1,169 @@
+# coding: utf-8
+
+"""
+Generation of vectorized NumPy functions from symbolic expressions.
+
+Unlike sympy.lambdify, the generated functions:
+
+- evaluate all the components of a matrix expression in one call, and return
+  a single array of shape (*expr.shape, *grid.shape);
+
+- share the common subexpressions between the components (sympy.cse);
+
+- broadcast the constant components over the whole grid.
+
+"""
+
+from sympy                 import cse, numbered_symbols
+from sympy                 import Matrix, ImmutableDenseMatrix
+from sympy.core            import Basic, Symbol, Tuple
+from sympy.printing.pycode import NumPyPrinter
+
+__all__ = ('NumpyKernel', 'lambdify_numpy')
+
+#==============================================================================
+class NumpyKernel(object):
+    """
+    A vectorized NumPy function, generated by lambdify_numpy.
+
+    Parameters
+    ----------
+    func : callable
+        Compiled function.
+
+    args : tuple of str
+        Names of the arguments.
+
+    shape : tuple of int
+        Shape of the symbolic expression.
+
+    source : str
+        Python source code of the function.
+
+    """
+    def __init__(self, func, args, shape, source):
+        self._func   = func
+        self._args   = tuple(args)
+        self._shape  = tuple(shape)
+        self._source = source
+
+    @property
+    def args(self):
+        return self._args
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def source(self):
+        return self._source
+
+    def __call__(self, *args):
+        if len(args) != len(self._args):
+            raise TypeError('> Expecting {} arguments ({}), given {}'.format(
+                len(self._args), ', '.join(self._args), len(args)))
+        return self._func(*args)
+
+    def __repr__(self):
+        return 'NumpyKernel({})'.format(', '.join(self._args))
+
+#==============================================================================
+def lambdify_numpy(args, expr, name='kernel', use_cse=True):
+    """
+    Create a vectorized NumPy function which evaluates a symbolic expression.
+
+    Parameters
+    ----------
+    args : iterable of Symbol
+        Arguments of the function. The values passed to the function must be
+        arrays (or scalars) which can be broadcast together.
+
+    expr : sympy.Expr | Matrix | ImmutableDenseMatrix | Tuple
+        Expression to evaluate. All its free symbols must be in args.
+
+    name : str
+        Name of the generated function.
+
+    use_cse : bool
+        Whether to extract the common subexpressions.
+
+    Returns
+    -------
+    kernel : NumpyKernel
+        Function returning an array of shape (*expr.shape, *grid.shape), where
+        grid.shape is the broadcast shape of the arguments.
+
+    Examples
+    --------
+    >>> from sympy import symbols, cos, sin, Matrix
+    >>> x1, x2 = symbols('x1, x2')
+    >>> f = lambdify_numpy([x1, x2], Matrix([[cos(x2), -x1*sin(x2)], [sin(x2), x1*cos(x2)]]))
+    >>> f(np.ones(10), np.zeros(10)).shape
+    (2, 2, 10)
+
+    """
+    import numpy as np
+
+    args = tuple(args)
+    if not args:
+        raise ValueError('> Expecting at least one argument')
+
+    for a in args:
+        if not isinstance(a, Symbol):
+            raise TypeError('> Expecting Symbol arguments, given {}'.format(type(a)))
+
+    if isinstance(expr, (Matrix, ImmutableDenseMatrix)):
+        shape = expr.shape
+        exprs = list(expr)
+
+    elif isinstance(expr, (tuple, list, Tuple)):
+        shape = (len(expr),)
+        exprs = list(expr)
+
+    elif isinstance(expr, Basic):
+        shape = ()
+        exprs = [expr]
+
+    else:
+        raise TypeError('> Expecting a sympy expression, given {}'.format(type(expr)))
+
+    free = set().union(*[e.free_symbols for e in exprs]) - set(args)
+    if free:
+        raise ValueError('> Unknown symbols {}'.format(
+            ', '.join(sorted(str(s) for s in free))))
+
+    # ...
+    if use_cse:
+        temporaries = numbered_symbols('_t')
+        temps, exprs = cse(exprs, symbols=temporaries, order='none')
+    else:
+        temps = []
+    # ...
+
+    printer = NumPyPrinter({'fully_qualified_modules': True})
+    indices = np.ndindex(*shape) if shape else [Ellipsis]
+
+    names = [printer.doprint(a) for a in args]
+    lines = ['def {}({}):'.format(name, ', '.join(names))]
+    lines.append('    {}, = numpy.broadcast_arrays({},)'.format(', '.join(names),
+                 ', '.join('numpy.asarray({}, dtype=float)'.format(n) for n in names)))
+    lines.append('    _out = numpy.empty({!r} + {}.shape)'.format(tuple(shape), names[0]))
+
+    for t, e in temps:
+        lines.append('    {} = {}'.format(printer.doprint(t), printer.doprint(e)))
+
+    for index, e in zip(indices, exprs):
+        if index is Ellipsis:
+            index = '...'
+        else:
+            index = ', '.join(str(i) for i in index) + ', ...'
+        lines.append('    _out[{}] = {}'.format(index, printer.doprint(e)))
+
+    lines.append('    return _out')
+    source = '\n'.join(lines) + '\n'
+
+    namespace = {'numpy': np}
+    exec(compile(source, '<{}>'.format(name), 'exec'), namespace)
+
+    return NumpyKernel(namespace[name], names, shape, source)
@@ -0,0 +1,158 @@
+# coding: utf-8
+
+import numpy as np
+import pytest
+
+from sympde.core     import Constant
+from sympde.calculus import grad, dot, div
+from sympde.topology import Square, IdentityMapping
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import elements_of
+from sympde.expr     import BilinearForm, LinearForm, Functional, integral
+from sympde.expr     import TerminalExpr
+from sympde.printing.kernel import lambdify_kernel
+
+ne, nq, nb = 3, 4, 5
+
+#==============================================================================
+def _data(args, seed=0):
+    """ Random weights, basis values (shared by all the elements) and
+    coefficients. """
+    rng  = np.random.default_rng(seed)
+    data = {}
+    for a in args[1:]:
+        if a.startswith(('u', 'v', 'w', 'z', 'p', 'q')):
+            data[a] = rng.random((1, nb, nq))
+        else:
+            data[a] = rng.random((ne, nq))
+    return rng.random((ne, nq)), data
+
+def _full(x):
+    return np.broadcast_to(x, (ne, nb, nq))
+
+#==============================================================================
+def test_kernel_poisson():
+
+    domain = Square()
+    x1, x2 = domain.coordinates
+    V      = ScalarFunctionSpace('V', domain)
+    u, v, f = elements_of(V, names='u, v, f')
+    kappa  = Constant('kappa')
+
+    a = BilinearForm((u, v), integral(domain, kappa*f*dot(grad(u), grad(v)) + x1*u*v))
+    w, d = _data(('weights', 'u', 'u_x1', 'u_x2', 'v', 'v_x1', 'v_x2', 'f', 'x1'))
+    d['kappa'] = 2.
+
+    expected = sum(np.einsum('eq,eiq,ejq->eij', w*c, _full(d[s]), _full(d[r]))
+                   for c, s, r in [(2*d['f'], 'v_x1', 'u_x1'),
+                                   (2*d['f'], 'v_x2', 'u_x2'),
+                                   (d['x1'], 'v', 'u')])
+
+    for backend in ('numpy', 'python'):
+        kernel, = lambdify_kernel(TerminalExpr(a), tests=[v], trials=[u], backend=backend)
+
+        assert kernel.kind   == 'bilinear'
+        assert kernel.target == domain.interior
+        assert kernel.args   == ('weights', 'v', 'v_x1', 'v_x2', 'u', 'u_x1', 'u_x2',
+                                 'f', 'kappa', 'x1')
+        assert np.allclose(kernel(w, **d), expected)
+
+    # Linear forms and functionals
+    l = LinearForm(v, integral(domain, f*v))
+    kernel, = lambdify_kernel(TerminalExpr(l), tests=[v])
+    assert kernel.kind == 'linear'
+    assert np.allclose(kernel(w, v=d['v'], f=d['f']),
+                       np.einsum('eq,eiq->ei', w*d['f'], _full(d['v'])))
+
+    F = Functional(f**2, domain)
+    kernel, = lambdify_kernel(TerminalExpr(F))
+    assert kernel.kind == 'functional'
+    assert np.allclose(kernel(w, f=d['f']), (w*d['f']**2).sum(axis=1))
+
+    # Nonlinear expressions are rejected
+    with pytest.raises(ValueError):
+        lambdify_kernel(TerminalExpr(F), tests=[f])
+
+#==============================================================================
+def test_kernel_blocks():
+
+    domain = Square()
+    V = VectorFunctionSpace('V', domain)
+    W = ScalarFunctionSpace('W', domain)
+    u, v = elements_of(V, names='u, v')
+    p, q = elements_of(W, names='p, q')
+
+    a = BilinearForm(((u, p), (v, q)), integral(domain, dot(u, v) - div(v)*p + div(u)*q))
+    results = []
+    for backend in ('numpy', 'python'):
+        kernel, = lambdify_kernel(TerminalExpr(a), tests=[v, q], trials=[u, p], backend=backend)
+        assert kernel.shape == (3, 3)
+
+        w, d = _data(kernel.args)
+        results.append(kernel(w, **d))
+
+    for r1, r2 in zip(results[0], results[1]):
+        for b1, b2 in zip(r1, r2):
+            assert (b1 is None) == (b2 is None)
+            assert b1 is None or np.allclose(b1, b2)
+
+    blocks = results[0]
+    assert blocks[0][1] is None and blocks[2][2] is None
+    assert np.allclose(blocks[2][0], np.einsum('eq,eiq,ejq->eij', w, _full(d['q']), _full(d['u_0_x1'])))
+    assert np.allclose(blocks[0][2], -np.einsum('eq,eiq,ejq->eij', w, _full(d['v_0_x1']), _full(d['p'])))
+
+#==============================================================================
+def test_kernel_mapping():
+
+    M      = IdentityMapping('M', 2)
+    domain = M(Square())
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    kernel, = lambdify_kernel(TerminalExpr(a), tests=[v], trials=[u])
+    assert kernel.args == ('weights', 'v_x', 'v_y', 'u_x', 'u_y')
+
+#==============================================================================
+def test_kernel_numba_missing():
+    try:
+        import numba
+    except ImportError:
+        pass
+    else:
+        pytest.skip('numba is installed')
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, u*v))
+    with pytest.raises(ImportError, match='numba'):
+        lambdify_kernel(TerminalExpr(a), tests=[v], trials=[u], backend='numba')
+
+#==============================================================================
+def test_kernel_numba():
+    pytest.importorskip('numba')
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    k1, = lambdify_kernel(TerminalExpr(a), tests=[v], trials=[u], backend='numba')
+    k2, = lambdify_kernel(TerminalExpr(a), tests=[v], trials=[u], backend='numpy')
+
+    w, d = _data(k1.args)
+    assert np.allclose(k1(w, **d), k2(w, **d))
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
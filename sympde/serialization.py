@@ -0,0 +1,618 @@
+# coding: utf-8
+"""
+Binary serialization format for SymPDE objects.
+
+The functions `encode` and `decode` convert SymPDE objects (forms, equations,
+norms, evaluated expressions, test and trial functions, spaces, mappings,
+domains, ...) and any container of them to and from a compact binary string:
+
+>>> from sympde.serialization import encode, decode, digest
+>>> data = encode(a)
+>>> b    = decode(data)
+>>> digest(a) == digest(b)
+True
+
+Contrary to `sympde.cache.dumps`, which relies on the `pickle` module, the
+format is independent of the object identities and of the Python version:
+
+- the objects are stored as a directed acyclic graph of nodes, in which all
+  the structurally identical sub-expressions are stored only once, even if
+  they are distinct Python objects (shared-node deduplication);
+
+- the encoding of an object only depends on its structure, i.e. its class,
+  its arguments and its private attributes (except for those which only cache
+  derived information), hence two structurally identical objects built by
+  different processes are encoded to the same bytes;
+
+- `digest` returns a hash of the structure of an object, which can be used as
+  a key for caching results; it does not require encoding the object.
+
+Objects are rebuilt structurally (an empty instance is created, and its slots
+and attributes are restored), hence their constructors are not called when
+decoding. Only the classes which can be imported by name from the `sympy` and
+`sympde` packages can be serialized: SymPy objects (subclasses of `Basic`) and
+singletons, any class (as a value), and the few other objects listed in
+`_object_classes`. Since the names of the classes are read from the data,
+`decode` refuses any other name without importing it.
+
+Format
+------
+All integers are stored as unsigned LEB128 variable-length integers (signed
+integers are zigzag-encoded first):
+
+    magic    : b'SPDE'
+    version  : integer, see FORMAT_VERSION
+    names    : count, then (length, UTF-8 bytes) for each name
+    nodes    : count, then (tag, payload) for each node
+    root     : index of the root node
+
+The names are the class names ('module:qualname') and the names of the slots
+and attributes, which are referred to by their index. The payload of a node
+refers to other nodes by their index; the nodes which represent containers
+and arguments of SymPy objects only refer to nodes which precede them, while
+the attributes of an object may refer to any node (reference cycles, e.g.
+between a Mapping and its JacobianSymbol, are allowed through attributes).
+
+"""
+
+import struct
+import hashlib
+
+from collections import OrderedDict
+from importlib   import import_module
+
+from sympy.core             import Basic
+from sympy.core.singleton   import Singleton
+from sympy.core.assumptions import StdFactKB
+from sympy.core.logic       import fuzzy_bool
+
+from sympde.cache import _get_slots, _new_instance, _transient_attributes
+
+__all__ = (
+    'FORMAT_VERSION',
+    'decode',
+    'digest',
+    'encode',
+)
+
+#==============================================================================
+MAGIC          = b'SPDE'
+FORMAT_VERSION = 1
+
+# Node tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _COMPLEX, _STR, _BYTES = range(8)
+_TUPLE, _LIST, _SET, _FROZENSET, _DICT, _ODICT             = range(8, 14)
+_TYPE, _SINGLETON, _BASIC, _OBJECT                         = range(14, 18)
+
+_containers = {tuple: _TUPLE, list: _LIST, set: _SET, frozenset: _FROZENSET,
+               dict: _DICT, OrderedDict: _ODICT}
+
+# Packages from which classes can be imported when decoding
+_trusted_packages = ('sympy', 'sympde')
+
+# Builtin classes which can be serialized as values
+_builtin_types = {'builtins:' + t.__qualname__: t for t in
+                  (bool, int, float, complex, str, bytes, tuple, list, set,
+                   frozenset, dict, type(None))}
+
+# Classes other than SymPy objects whose instances can be serialized
+_object_classes = frozenset((
+    'sympde.topology.basic:Connectivity',
+))
+
+_closed  = float('inf')
+_missing = object()
+
+#==============================================================================
+# Low-level encoding
+#==============================================================================
+def _uint(n):
+    """ Unsigned LEB128 encoding of a non-negative integer. """
+    out = bytearray()
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+def _sint(n):
+    """ Zigzag and LEB128 encoding of an integer. """
+    return _uint(n << 1 if n >= 0 else ((-n) << 1) - 1)
+
+def _text(s):
+    b = s.encode('utf-8')
+    return _uint(len(b)) + b
+
+class _Reader(object):
+
+    def __init__(self, data):
+        self._data = memoryview(data)
+        self._pos  = 0
+
+    def uint(self):
+        data  = self._data
+        n     = 0
+        shift = 0
+        while True:
+            try:
+                b = data[self._pos]
+            except IndexError:
+                raise ValueError('> Truncated data') from None
+            self._pos += 1
+            n |= (b & 0x7f) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def sint(self):
+        n = self.uint()
+        return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+    def raw(self, size):
+        start = self._pos
+        self._pos += size
+        if self._pos > len(self._data):
+            raise ValueError('> Truncated data')
+        return self._data[start:self._pos].tobytes()
+
+    def text(self):
+        return self.raw(self.uint()).decode('utf-8')
+
+    @property
+    def exhausted(self):
+        return self._pos == len(self._data)
+
+#==============================================================================
+# Classes
+#==============================================================================
+_class_names = {}
+
+def _is_trusted(module):
+    return module.split('.')[0] in _trusted_packages
+
+def _resolve(name):
+    """ Import a class by name; only the classes defined in the trusted
+    packages and the builtin scalar and container classes can be imported.
+    """
+    if name in _builtin_types:
+        return _builtin_types[name]
+
+    module, qualname = name.split(':')
+    if not _is_trusted(module):
+        raise ValueError('> Refusing to import {} from an untrusted module'.format(name))
+
+    obj = import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+
+    if not (isinstance(obj, type) and _is_trusted(obj.__module__)):
+        raise ValueError('> {} is not a class of the sympy or sympde packages'.format(name))
+    return obj
+
+def _class_name(cls):
+    """ Return the name under which a class can be imported, after checking
+    that it indeed refers to the class (which is not the case e.g. for the
+    classes created by sympy.Function).
+    """
+    try:
+        return _class_names[cls]
+    except KeyError:
+        pass
+
+    name = '{}:{}'.format(cls.__module__, cls.__qualname__)
+    try:
+        found = _resolve(name)
+    except (ImportError, AttributeError, ValueError):
+        found = None
+    if found is not cls:
+        raise TypeError('> Cannot serialize an instance of {}, which is not '
+                        'importable by name'.format(cls))
+
+    _class_names[cls] = name
+    return name
+
+#==============================================================================
+# Encoding
+#==============================================================================
+class _Node(object):
+    """ A node of the graph: its tag, its payload (bytes for the scalar
+    values, a name for the classes) and the nodes it refers to.
+    """
+    __slots__ = ('tag', 'value', 'items', 'slots', 'state',
+                 'digest', 'key', 'depth', 'open')
+
+    def __init__(self, tag, value=b'', depth=0):
+        self.tag    = tag
+        self.value  = value
+        self.items  = ()
+        self.slots  = ()
+        self.state  = None
+        self.digest = None
+        self.key    = None
+        self.depth  = depth
+        self.open   = _closed
+
+class _Graph(object):
+    """
+    Graph of the nodes reachable from an object, together with the digest of
+    each node.
+
+    The digest of a node is computed from its tag, payload and the digests of
+    the nodes it refers to. A reference to a node which is being visited (a
+    reference cycle) contributes a marker to the digest instead. The nodes
+    whose digest depends on such a marker for another node cannot be shared
+    with other nodes, since the marker does not identify the target of the
+    reference: they are deduplicated by identity only.
+
+    """
+    def __init__(self):
+        self._nodes = {}
+        self._alive = []  # keep the visited objects alive, as ids are used as keys
+        self._depth = 0
+
+    def visit(self, obj):
+        k    = id(obj)
+        node = self._nodes.get(k)
+        if node is not None:
+            if node.digest is None and node.tag not in (_BASIC, _OBJECT):
+                raise ValueError('> Cannot serialize a recursive container')
+            return node
+
+        self._alive.append(obj)
+        cls = type(obj)
+
+        if obj is None:
+            node = _Node(_NONE)
+        elif cls is bool:
+            node = _Node(_TRUE if obj else _FALSE)
+        elif cls is int:
+            node = _Node(_INT, _sint(obj))
+        elif cls is float:
+            node = _Node(_FLOAT, struct.pack('<d', obj))
+        elif cls is complex:
+            node = _Node(_COMPLEX, struct.pack('<dd', obj.real, obj.imag))
+        elif cls is str:
+            node = _Node(_STR, _text(obj))
+        elif cls is bytes:
+            node = _Node(_BYTES, _uint(len(obj)) + obj)
+        elif isinstance(cls, Singleton):
+            node = _Node(_SINGLETON, _class_name(cls))
+        elif isinstance(obj, type):
+            node = _Node(_TYPE, _class_name(obj))
+        elif cls in _containers:
+            return self._visit_container(k, obj, _containers[cls])
+        elif isinstance(obj, Basic):
+            return self._visit_object(k, obj, _BASIC)
+        elif hasattr(obj, '__dict__'):
+            return self._visit_object(k, obj, _OBJECT)
+        else:
+            raise TypeError('> Cannot serialize an instance of {}'.format(cls))
+
+        self._nodes[k] = node
+        self._close(node)
+        return node
+
+    def _visit_container(self, k, obj, tag):
+        node = _Node(tag, depth=self._depth)
+        self._nodes[k] = node
+        self._depth += 1
+
+        if tag in (_DICT, _ODICT):
+            items = [self.visit(i) for kv in obj.items() for i in kv]
+        else:
+            items = [self.visit(i) for i in obj]
+
+        # The elements of a set are sorted, as their order depends on the
+        # hashes of the objects, which vary from one process to another
+        if tag in (_SET, _FROZENSET):
+            items.sort(key=lambda i: self._ref(node, i))
+
+        node.items   = items
+        self._depth -= 1
+        self._close(node)
+        return node
+
+    def _visit_object(self, k, obj, tag):
+        cls  = type(obj)
+        node = _Node(tag, _class_name(cls), depth=self._depth)
+        if tag == _OBJECT and node.value not in _object_classes:
+            raise TypeError('> Cannot serialize an instance of {}'.format(cls))
+        self._nodes[k] = node
+        self._depth += 1
+
+        if tag == _BASIC:
+            slots = []
+            for name, value in _get_slots(obj):
+                if name == '_args':
+                    node.items = [self.visit(a) for a in value]
+                elif name == '_assumptions':
+                    # Only the assumptions given by the user (to a Symbol or
+                    # an IndexedBase) are stored, the other facts are cached
+                    # results of queries
+                    facts = getattr(value, '_generator', None)
+                    if facts is None and obj.is_Symbol:
+                        facts = obj.assumptions0
+                    if facts is not None:
+                        slots.append((name, self.visit(dict(sorted(facts.items())))))
+                else:
+                    slots.append((name, self.visit(value)))
+            node.slots = slots
+
+        state = getattr(obj, '__dict__', None)
+        if state:
+            node.state = [(name, self.visit(state[name])) for name in sorted(state)
+                          if name not in _transient_attributes]
+
+        self._depth -= 1
+        self._close(node)
+        return node
+
+    def _ref(self, node, target):
+        """ Contribution of a reference to the digest of a node. """
+        if target.digest is None:
+            node.open = min(node.open, target.depth)
+            return hashlib.blake2b(b'cycle:' + target.value.encode('utf-8'),
+                                   digest_size=16).digest()
+        node.open = min(node.open, target.open)
+        return target.digest
+
+    def _close(self, node):
+        h = hashlib.blake2b(bytes([node.tag]), digest_size=16)
+        if isinstance(node.value, str):
+            h.update(_text(node.value))
+        else:
+            h.update(node.value)
+
+        h.update(_uint(len(node.items)))
+        for i in node.items:
+            h.update(self._ref(node, i))
+
+        for attrs in (node.slots, node.state or ()):
+            h.update(_uint(len(attrs)))
+            for name, i in attrs:
+                h.update(_text(name))
+                h.update(self._ref(node, i))
+
+        node.digest = h.digest()
+        if node.open >= node.depth:
+            node.open = _closed
+            node.key  = node.digest
+        else:
+            node.key  = id(node)
+
+def encode(obj):
+    """
+    Encode a SymPDE object (or any container of them) to bytes.
+
+    Parameters
+    ----------
+    obj : object
+        A SymPy/SymPDE object, or a combination of tuples, lists, sets and
+        dictionaries of them and of scalars (None, bool, int, float, complex,
+        str, bytes) and classes.
+
+    Returns
+    -------
+    data : bytes
+        The encoded object, which can be rebuilt with `decode`. Structurally
+        identical objects are encoded to the same bytes.
+
+    """
+    root = _Graph().visit(obj)
+
+    names   = {}
+    index   = {}
+    nodes   = []
+    pending = []
+
+    def name_index(name):
+        try:
+            return names[name]
+        except KeyError:
+            names[name] = len(names)
+            return names[name]
+
+    def emit(node):
+        try:
+            return index[node.key]
+        except KeyError:
+            pass
+
+        items = [emit(i) for i in node.items]
+        slots = [(name_index(name), emit(i)) for name, i in node.slots]
+
+        if isinstance(node.value, str):
+            name_index(node.value)
+
+        index[node.key] = len(nodes)
+        nodes.append([node, items, slots, None])
+
+        # The attributes are emitted last, as they can refer to the node itself
+        if node.state is not None:
+            pending.append(nodes[-1])
+        return index[node.key]
+
+    root = emit(root)
+    while pending:
+        record = pending.pop(0)
+        record[3] = [(name_index(name), emit(i)) for name, i in record[0].state]
+
+    out = bytearray(MAGIC)
+    out += _uint(FORMAT_VERSION)
+
+    out += _uint(len(names))
+    for name in names:
+        out += _text(name)
+
+    out += _uint(len(nodes))
+    for node, items, slots, state in nodes:
+        out.append(node.tag)
+        if isinstance(node.value, str):
+            out += _uint(names[node.value])
+        else:
+            out += node.value
+
+        if node.tag in _containers.values() or node.tag == _BASIC:
+            out += _uint(len(items))
+            for i in items:
+                out += _uint(i)
+
+        if node.tag == _BASIC:
+            out += _uint(len(slots))
+            for name, i in slots:
+                out += _uint(name) + _uint(i)
+
+        if node.tag in (_BASIC, _OBJECT):
+            state = state or ()
+            out += _uint(len(state))
+            for name, i in state:
+                out += _uint(name) + _uint(i)
+
+    out += _uint(root)
+    return bytes(out)
+
+def digest(obj):
+    """
+    Compute a hash of the structure of an object, as defined by `encode`:
+    two objects have the same digest if and only if they are encoded to the
+    same bytes, but the object is not encoded.
+
+    Returns
+    -------
+    key : str
+        Hexadecimal digest (32 characters).
+
+    """
+    h = hashlib.blake2b(MAGIC + _uint(FORMAT_VERSION), digest_size=16)
+    h.update(_Graph().visit(obj).digest)
+    return h.hexdigest()
+
+#==============================================================================
+# Decoding
+#==============================================================================
+def _resolve_class(tag, name):
+    """ Import the class of a node, after checking that it is allowed for
+    the tag of the node, as no other object must be created nor called.
+    """
+    if tag == _OBJECT and name not in _object_classes:
+        raise ValueError('> Refusing to decode an instance of {}'.format(name))
+
+    cls = _resolve(name)
+    if tag == _SINGLETON and not isinstance(cls, Singleton):
+        raise ValueError('> {} is not a singleton class'.format(name))
+    if tag == _BASIC and not issubclass(cls, Basic):
+        raise ValueError('> {} is not a subclass of Basic'.format(name))
+    return cls
+
+def _read_node(r, names):
+    tag = r.uint()
+    if tag in (_NONE, _FALSE, _TRUE):
+        value = (None, False, True)[tag]
+    elif tag == _INT:
+        value = r.sint()
+    elif tag == _FLOAT:
+        value, = struct.unpack('<d', r.raw(8))
+    elif tag == _COMPLEX:
+        value = complex(*struct.unpack('<dd', r.raw(16)))
+    elif tag == _STR:
+        value = r.text()
+    elif tag == _BYTES:
+        value = r.raw(r.uint())
+    elif tag in (_TYPE, _SINGLETON, _BASIC, _OBJECT):
+        value = _resolve_class(tag, names[r.uint()])
+    elif tag in _containers.values():
+        value = None
+    else:
+        raise ValueError('> Unknown node tag {}'.format(tag))
+
+    items = slots = state = ()
+    if tag in _containers.values() or tag == _BASIC:
+        items = [r.uint() for _ in range(r.uint())]
+    if tag == _BASIC:
+        slots = [(names[r.uint()], r.uint()) for _ in range(r.uint())]
+    if tag in (_BASIC, _OBJECT):
+        state = [(names[r.uint()], r.uint()) for _ in range(r.uint())]
+
+    return tag, value, items, slots, state
+
+class _Builder(object):
+    """ Rebuild the objects from the nodes, starting from the root. An
+    object is registered before its attributes are restored, hence the
+    attributes can refer to the object itself.
+    """
+    def __init__(self, nodes):
+        self._nodes   = nodes
+        self._objects = [_missing]*len(nodes)
+
+    def build(self, i):
+        obj = self._objects[i]
+        if obj is not _missing:
+            return obj
+
+        tag, value, items, slots, state = self._nodes[i]
+
+        if tag < _TUPLE or tag == _TYPE:
+            obj = value
+        elif tag == _SINGLETON:
+            obj = value()
+        elif tag in (_DICT, _ODICT):
+            values = [self.build(j) for j in items]
+            obj    = (dict if tag == _DICT else OrderedDict)(zip(values[::2], values[1::2]))
+        elif tag in (_TUPLE, _LIST, _SET, _FROZENSET):
+            cls = {_TUPLE: tuple, _LIST: list, _SET: set, _FROZENSET: frozenset}[tag]
+            obj = cls(self.build(j) for j in items)
+        elif tag == _BASIC:
+            obj = self._new_basic(value, items, slots)
+        else:
+            obj = object.__new__(value)
+
+        self._objects[i] = obj
+        if state:
+            obj.__dict__.update((name, self.build(j)) for name, j in state)
+        return obj
+
+    def _new_basic(self, cls, items, slots):
+        args  = tuple(self.build(j) for j in items)
+        slots = [(name, self.build(j)) for name, j in slots]
+
+        assumptions = cls.default_assumptions
+        for k, (name, value) in enumerate(slots):
+            if name == '_assumptions':
+                # Same as in Symbol.__new_stage2__ and IndexedBase.__new__
+                facts = dict(value)
+                facts['commutative'] = fuzzy_bool(facts.get('commutative', True))
+                assumptions = StdFactKB(facts)
+                assumptions._generator = dict(value)
+                del slots[k]
+                break
+
+        slots = [('_args', args), ('_assumptions', assumptions)] + slots
+        return _new_instance(cls, slots)
+
+def decode(data):
+    """
+    Rebuild an object from the bytes returned by `encode`.
+
+    Raises
+    ------
+    ValueError
+        If the data is not in the SymPDE format, or was written with a more
+        recent version of the format.
+
+    """
+    r = _Reader(data)
+    if r.raw(len(MAGIC)) != MAGIC:
+        raise ValueError('> Not a SymPDE serialized object')
+
+    version = r.uint()
+    if version > FORMAT_VERSION:
+        raise ValueError('> Unsupported format version {} (expected at most {})'.format(
+                         version, FORMAT_VERSION))
+
+    names = [r.text() for _ in range(r.uint())]
+    nodes = [_read_node(r, names) for _ in range(r.uint())]
+    root  = r.uint()
+    if not r.exhausted:
+        raise ValueError('> Unexpected data after the root node')
+
+    return _Builder(nodes).build(root)
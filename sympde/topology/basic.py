@@ -3,6 +3,7 @@
 
 from collections import OrderedDict
 from collections import abc
+from itertools   import chain
 
 from sympy.core import Basic, Symbol
 from sympy.core.containers import Tuple
@@ -13,6 +14,7 @@ class BasicDomain(Basic):
     _dim         = None
     _name        = None
     _coordinates = None
+    _order_key   = None
 
     @property
     def name(self):
@@ -40,6 +42,23 @@ class BasicDomain(Basic):
         else:
             return self._coordinates
 
+    @property
+    def order_key(self):
+        """
+        Key which defines the order of the domains in a Union: a tuple
+        (label, kind, axis, ext), where label is the string representation of
+        the domain and kind is the name of its class. The key is computed once
+        per domain.
+
+        """
+        key = self._order_key
+        if key is None:
+            key = self._order_key = self._eval_order_key()
+        return key
+
+    def _eval_order_key(self):
+        return (str(self), type(self).__name__, -1, 0)
+
     def _sympystr(self, printer):
         sstr = printer.doprint
         return '{}'.format(sstr(self.name))
@@ -98,6 +117,13 @@ class InteriorDomain(BasicDomain):
     def dim(self):
         return self._dim
 
+    def _eval_order_key(self):
+        if self.mapping:
+            label = '{}({})'.format(self.mapping.name, self.name)
+        else:
+            label = str(self.name)
+        return (label, type(self).__name__, -1, 0)
+
     def _sympystr(self, printer):
         sstr = printer.doprint
         if self.mapping:
@@ -112,6 +138,10 @@ class InteriorDomain(BasicDomain):
         return OrderedDict(sorted(d.items()))
 
 
+#==============================================================================
+def _order_key(domain):
+    return domain.order_key
+
 #==============================================================================
 # TODO remove redundancy
 class Union(BasicDomain):
@@ -119,7 +149,7 @@ class Union(BasicDomain):
     def __new__(cls, *args):
 
         # Discard empty Unions (represented as None) from args
-        args = Tuple(*[a for a in args if a is not None])
+        args = [a for a in args if a is not None]
 
         # Verify types
         if not all(isinstance(a, BasicDomain) for a in args):
@@ -135,11 +165,15 @@ class Union(BasicDomain):
         # Flatten arguments into a single list of domains
         unions = [a for a in args if     isinstance(a, Union)]
         args   = [a for a in args if not isinstance(a, Union)]
-        for union in unions:
-            args += list(union.as_tuple())
 
-        # remove duplicates and sort domains by their string representation
-        args = sorted(set(args), key=str)
+        # Fast path: the arguments of a Union are already sorted and unique
+        if len(unions) == 1 and not args:
+            return unions[0]
+
+        # remove duplicates and sort domains by their order key: the sorted
+        # arguments of the unions are merged as runs by the sort
+        args = dict.fromkeys(chain(*[u.args for u in unions], args))
+        args = sorted(args, key=_order_key)
 
         # a. If the required Union contains no domains, return None;
         # b. If it contains a single domain, return the domain itself;
@@ -303,6 +337,12 @@ class Boundary(BasicDomain):
     def dim(self):
         return self.domain.dim
 
+    def _eval_order_key(self):
+        label = '{}_{}'.format(self.domain.order_key[0], self.name)
+        axis  = -1 if self.axis is None else self.axis
+        ext   =  0 if self.ext  is None else self.ext
+        return (label, type(self).__name__, axis, ext)
+
     def _sympystr(self, printer):
         sstr = printer.doprint
         return '{}_{}'.format(sstr(self.domain),sstr(self.name))
@@ -381,6 +421,10 @@ class Interface(BasicDomain):
     def logical_domain(self):
         return self._logical_domain
 
+    def _eval_order_key(self):
+        axis = -1 if self.axis is None else self.axis
+        return (str(self.name), type(self).__name__, axis, 0)
+
     def _sympystr(self, printer):
         sstr = printer.doprint
 
@@ -414,7 +458,8 @@ class Edge(object):
 
 #==============================================================================
 class Connectivity(abc.Mapping):
-    _patches  = []
+    _patches    = []
+    _interfaces = None
 
     def __init__(self, data=None):
         if data is None:
@@ -424,7 +469,8 @@ class Connectivity(abc.Mapping):
             for k,v in data.items():
                 assert( isinstance( k, str ) )
                 assert( isinstance(v, Interface) )
-        self._data = data
+        self._data       = data
+        self._interfaces = None
 
     @property
     def patches(self):
@@ -432,11 +478,10 @@ class Connectivity(abc.Mapping):
 
     @property
     def interfaces(self):
-        ls = []
-        data = OrderedDict(sorted(self._data.items()))
-        for _,v in data.items():
-            ls.append(v)
-        return Union(*ls)
+        # The Union is built once, and rebuilt only if an interface is added
+        if self._interfaces is None:
+            self._interfaces = Union(*[v for _,v in sorted(self._data.items())])
+        return self._interfaces
 
     def todict(self):
         # ... create the connectivity
@@ -455,7 +500,8 @@ class Connectivity(abc.Mapping):
         assert( isinstance(value, Interface) )
         assert( str(value.name) == key )
 
-        self._data[key] = value
+        self._data[key]  = value
+        self._interfaces = None
 
     # ==========================================
     #  abstract methods
@@ -478,4 +524,84 @@ class Connectivity(abc.Mapping):
 
     # ==========================================
 
+#==============================================================================
+class Adjacency(object):
+    """
+    Index of the topology of a multipatch domain, which gives the external
+    boundaries and the interfaces of each patch, the interface of a boundary
+    and the neighbours of each patch without traversing the whole domain.
+
+    Parameters
+    ----------
+    interiors : iterable of InteriorDomain
+        The patches of the domain.
 
+    boundaries : iterable of Boundary
+        The external boundaries of the domain.
+
+    connectivity : Connectivity
+        The interfaces between the patches.
+
+    """
+    def __init__(self, interiors, boundaries=(), connectivity=None):
+
+        patches    = OrderedDict((i.name, i) for i in interiors)
+        bnds       = OrderedDict((name, []) for name in patches)
+        interfaces = OrderedDict((name, []) for name in patches)
+        neighbours = OrderedDict((name, []) for name in patches)
+        interface  = {}
+
+        for b in boundaries:
+            bnds[b.domain.name].append(b)
+
+        if connectivity is not None:
+            for _,v in sorted(connectivity.items()):
+                minus = v.minus.domain.name
+                plus  = v.plus.domain.name
+                interfaces[minus].append(v)
+                interfaces[plus ].append(v)
+                interface[v.minus] = v
+                interface[v.plus ] = v
+                if plus not in neighbours[minus]:
+                    neighbours[minus].append(plus)
+                    neighbours[plus ].append(minus)
+
+        self._patches    = patches
+        self._boundaries = OrderedDict((k, tuple(v)) for k,v in bnds.items())
+        self._interfaces = OrderedDict((k, tuple(v)) for k,v in interfaces.items())
+        self._neighbours = OrderedDict((k, tuple(patches[i] for i in v))
+                                       for k,v in neighbours.items())
+        self._interface  = interface
+
+    @property
+    def patches(self):
+        return tuple(self._patches.values())
+
+    def _name(self, patch):
+        name = patch if isinstance(patch, str) else patch.name
+        if name not in self._patches:
+            raise ValueError('> could not find interior {}'.format(name))
+        return name
+
+    def patch(self, name):
+        """return the patch with the given name."""
+        return self._patches[self._name(name)]
+
+    def boundaries(self, patch):
+        """return the external boundaries of a patch."""
+        return self._boundaries[self._name(patch)]
+
+    def interfaces(self, patch):
+        """return the interfaces of a patch."""
+        return self._interfaces[self._name(patch)]
+
+    def neighbours(self, patch):
+        """return the patches which share an interface with a patch."""
+        return self._neighbours[self._name(patch)]
+
+    def interface(self, boundary):
+        """return the interface of a boundary, or None for an external boundary."""
+        return self._interface.get(boundary)
+
+    def __len__(self):
+        return len(self._patches)
@@ -5,8 +5,6 @@
 #        derivatives
 
 
-from numpy import unique
-
 from sympy.core import Basic
 from sympy.tensor import Indexed, IndexedBase
 from sympy.core import Symbol
@@ -2,7 +2,6 @@
 
 # TODO add action of diff operators on sympy known functions
 
-import numpy as np
 from itertools   import groupby
 from collections import OrderedDict
 
@@ -18,7 +17,7 @@ from sympy import Indexed, IndexedBase
 from sympy import diff
 from sympy import log
 from sympy import preorder_traversal
-from sympy import cacheit
+from sympde.cache import cacheit
 
 from sympy.core.function      import AppliedUndef
 from sympy.core.function      import UndefinedFunction
@@ -54,7 +53,7 @@ class DifferentialOperator(LinearOperator):
         return self
 
     @classmethod
-    @cacheit
+    @cacheit('derivatives')
     def eval(cls, expr):
 
         types = (VectorTestFunction, ScalarTestFunction,
@@ -110,7 +109,7 @@ class DifferentialOperator(LinearOperator):
                     if len(M)>0:
                         M = list(M)[0]
                         expr_primes = [diff(expr, M[i]) for i in range(M.rdim)]
-                        Jj = Jacobian(M)[:,cls.grad_index]
+                        Jj = M.jacobian_expr[:,cls.grad_index]
                         expr_prime = sum([ei*Jji for ei,Jji in zip(expr_primes, Jj)])
                         return expr_prime + diff(expr, x)
                 return diff(expr, x)
@@ -207,7 +206,7 @@ class dx3(DifferentialOperator):
 _logical_partial_derivatives = (dx1, dx2, dx3)
 
 #==============================================================================
-@cacheit
+@cacheit('derivatives')
 def find_partial_derivatives(expr):
     """
     returns all partial derivative expressions
@@ -233,7 +232,7 @@ def find_partial_derivatives(expr):
     return ()
 
 #==============================================================================
-@cacheit
+@cacheit('derivatives')
 def get_number_derivatives(expr):
     """
     returns the number of partial derivatives in expr.
@@ -248,7 +247,7 @@ def get_number_derivatives(expr):
     return n
 
 #==============================================================================
-@cacheit
+@cacheit('derivatives')
 def sort_partial_derivatives(expr):
     """returns the partial derivatives of an expression, sorted.
     """
@@ -280,9 +279,7 @@ def sort_partial_derivatives(expr):
     # ...
 
     # ... sort keys from high to low
-    keys = np.asarray(list(d.keys()))
-    keys.sort()
-    keys = keys[::-1]
+    keys = sorted(d.keys(), reverse=True)
     # ...
 
     # ... construct a list of partial derivatives from high to low order
@@ -294,7 +291,7 @@ def sort_partial_derivatives(expr):
     return tuple(ls)
 
 #==============================================================================
-@cacheit
+@cacheit('derivatives')
 def get_index_derivatives(expr):
     """
     """
@@ -320,7 +317,7 @@ def get_index_derivatives(expr):
     return d
 
 #==============================================================================
-@cacheit
+@cacheit('derivatives')
 def get_atom_derivatives(expr):
     """
     """
@@ -359,7 +356,7 @@ def get_index_logical_derivatives(expr):
     return d
 
 #==============================================================================
-@cacheit
+@cacheit('derivatives')
 def get_atom_logical_derivatives(expr):
     """
     """
@@ -525,7 +522,7 @@ class GradBasic(CalculusFunction):
     nargs = None
     name = 'Grad'
 
-    @cacheit
+    @cacheit('derivatives')
     def __new__(cls, *args, **options):
         # (Try to) sympify args first
 
@@ -549,7 +546,7 @@ class GradBasic(CalculusFunction):
 class Grad_1d(GradBasic):
 
     @classmethod
-    @cacheit
+    @cacheit('derivatives')
     def eval(cls, *_args):
 
         if not _args:
@@ -562,7 +559,7 @@ class Grad_1d(GradBasic):
 class Grad_2d(GradBasic):
 
     @classmethod
-    @cacheit
+    @cacheit('derivatives')
     def eval(cls, *_args):
 
         if not _args:
@@ -582,7 +579,7 @@ class Grad_2d(GradBasic):
 class Grad_3d(GradBasic):
 
     @classmethod
-    @cacheit
+    @cacheit('derivatives')
     def eval(cls, *_args):
 
         if not _args:
@@ -1,9 +1,5 @@
 # coding: utf-8
 
-import numpy as np
-import h5py
-import yaml
-import yamlloader
 import os
 
 from collections import OrderedDict
@@ -21,13 +17,23 @@ from sympy.core.expr import AtomicExpr
 from sympde.core.basic import CalculusFunction
 from .basic            import BasicDomain, InteriorDomain, Boundary, Union, Connectivity
 from .basic            import Interval, Interface
-from .basic            import ProductDomain
+from .basic            import ProductDomain, Adjacency
 
 # TODO fix circular dependency between domain and mapping
 
 # TODO add pdim
 
 iterable_types = (tuple, list, Tuple, Union)
+
+def _as_tuple(domain):
+    """Return the domains of a Union, of a single domain or of None (empty Union)."""
+    if domain is None:
+        return ()
+    elif isinstance(domain, Union):
+        return domain.args
+    else:
+        return (domain,)
+
 #==============================================================================
 class Domain(BasicDomain):
     """
@@ -38,6 +44,7 @@ class Domain(BasicDomain):
     name and connectivity need to be passed.
 
     """
+    _adjacency = None
 
     def __new__(cls, name, *, interiors=None, boundaries=None, dim=None,
                 connectivity=None, mapping=None, logical_domain=None):
@@ -163,6 +170,15 @@ class Domain(BasicDomain):
     def interfaces(self):
         return self.connectivity.interfaces
 
+    @property
+    def adjacency(self):
+        """Index of the patches, boundaries and interfaces of the domain."""
+        if self._adjacency is None:
+            self._adjacency = Adjacency(_as_tuple(self.interior),
+                                        _as_tuple(self.boundary),
+                                        self.connectivity)
+        return self._adjacency
+
     def __len__(self):
         if isinstance(self.interior, InteriorDomain):
             return 1
@@ -235,11 +251,7 @@ class Domain(BasicDomain):
     def get_interior(self, name):
         """return interior by name."""
         if isinstance(self.interior, Union):
-            x = [i for i in self.interior.args if i.name == name]
-            if len(x) == 0:
-                raise ValueError('> could not find interior {}'.format(name))
-
-            return x[0]
+            return self.adjacency.patch(name)
 
         elif isinstance(self.interior, InteriorDomain):
             if self.interior.name == name:
@@ -268,75 +280,116 @@ class Domain(BasicDomain):
 
         return OrderedDict(sorted(d.items()))
 
-    def export( self, filename ):
+    def export(self, filename, compression=None, layout='yaml'):
+        """
+        Export the topology of the domain to an HDF5 file, which can be read
+        with Domain.from_file.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the HDF5 file, which is overwritten if it exists.
 
-        yml = self.todict()
+        compression : str
+            HDF5 compression filter of the tables ('gzip', 'lzf', ...), if any,
+            with the layout 'hdf5'.
 
-        # Dump metadata to string in YAML file format
-        geo = yaml.dump( data   = yml,
-                         Dumper = yamlloader.ordereddict.Dumper )
+        layout : str
+            'yaml' : the output of todict is stored as a YAML string in the
+            dataset 'topology.yml', which is read by the other readers of
+            SymPDE geometry files (default);
+
+            'hdf5' : the interiors, boundaries and interfaces are stored in
+            chunked tables with one row per patch, boundary and interface,
+            in the group 'topology' (see _write_topology), which can only be
+            read by Domain.from_file.
+
+        """
+        # The I/O libraries are only imported when needed, as they
+        # significantly increase the import time of sympde
+        import h5py
+
+        if layout not in ('hdf5', 'yaml'):
+            raise ValueError("> layout must be 'hdf5' or 'yaml', given {}".format(layout))
 
         # Create HDF5 file (in parallel mode if MPI communicator size > 1)
-        h5 = h5py.File( filename, mode='w' )
+        with h5py.File( filename, mode='w' ) as h5:
+            if layout == 'hdf5':
+                _write_topology(h5, self, compression)
+            else:
+                import numpy as np
+                import yaml
+                import yamlloader
 
-        # Write geometry metadata as fixed-length array of ASCII characters
-        h5['topology.yml'] = np.array( geo, dtype='S' )
+                # Dump metadata to string in YAML file format
+                geo = yaml.dump( data   = self.todict(),
+                                 Dumper = yamlloader.ordereddict.Dumper )
 
-        # Close HDF5 file
-        h5.close()
+                # Write geometry metadata as fixed-length array of ASCII characters
+                h5['topology.yml'] = np.array( geo, dtype='S' )
 
     @classmethod
-    def from_file( cls, filename ):
-
+    def from_file(cls, filename, patches=None):
+        """
+        Read a domain from an HDF5 file written by Domain.export, with either
+        layout.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the HDF5 file.
+
+        patches : iterable
+            Names or indices of the patches to load: the other patches, their
+            boundaries and the interfaces with them are not loaded (nor read,
+            with the layout 'hdf5'). By default all patches are loaded. The
+            domains of the gallery (with a dtype) are rebuilt from their
+            parameters, hence all their patches must be selected.
+
+        """
         # ... check extension of the file
         basename, ext = os.path.splitext(filename)
         if not(ext == '.h5'):
             raise ValueError('> Only h5 files are supported')
         # ...
-        from sympde.topology.mapping import Mapping, MultiPatchMapping
-
-        h5  = h5py.File( filename, mode='r' )
-        yml = yaml.load( h5['topology.yml'][()], Loader=yaml.SafeLoader )
-
-        domain_name    = yml['name']
-        dim            = yml['dim']
-        dtype          = yml['dtype']
-        d_interior     = yml['interior']
-        d_boundary     = yml['boundary']
-        d_connectivity = yml['connectivity']
-        mapping        = Mapping('{}_mapping'.format(domain_name), int(dim))
+        import h5py
+        from sympde.topology.mapping import Mapping
+
+        with h5py.File( filename, mode='r' ) as h5:
+            if 'topology' in h5:
+                desc = _read_topology(h5['topology'], patches)
+            elif 'topology.yml' in h5:
+                desc = _read_topology_yaml(h5['topology.yml'], patches)
+            else:
+                raise ValueError('> No topology found in {}'.format(filename))
 
-        if dtype == 'None': dtype = None
+        domain_name, dim, dtype, d_interior, d_boundary, d_connectivity = desc
+        mapping = Mapping('{}_mapping'.format(domain_name), dim)
 
         if dtype is not None:
             constructor = globals()[dtype['type']]
-            return mapping(constructor(domain_name, **dtype['parameters']))
+            obj         = constructor(domain_name, **dtype['parameters'])
 
-        # ... create sympde InteriorDomain (s)
-        interior = [InteriorDomain(i['name'], dim=dim) for i in d_interior]
+            # The domain is rebuilt from its parameters, with all its patches
+            interiors = obj.interior.as_tuple() if isinstance(obj.interior, Union) else (obj.interior,)
+            if [i.name for i in interiors] != list(d_interior):
+                raise ValueError('> Cannot load a subset of the patches of a {} domain'.format(
+                                 dtype['type']))
 
-        # create a dict of interiors accessed by name => needed for boundaries
-        d_interior = {}
-        for i in interior:
-            d_interior[i.name] = i
+            return mapping(obj)
 
+        # ... create sympde InteriorDomain (s)
+        # dict of interiors accessed by name => needed for boundaries
+        d_interior = OrderedDict((name, InteriorDomain(name, dim=dim)) for name in d_interior)
+
+        interior = list(d_interior.values())
         if len(interior) == 1:
             interior = interior[0]
         # ...
 
         # ... create sympde Boundary (s)
-        boundary = []
-        for desc in d_boundary:
-            name  = desc['name']
-            patch = d_interior[desc['patch']]
-            axis  = desc['axis']
-            ext   = desc['ext']
-
-            if axis == 'None': axis = None
-            if ext  == 'None': ext  = None
-
-            bnd = Boundary(name, patch, axis=axis, ext=ext)
-            boundary.append(bnd)
+        boundary = [Boundary(name, d_interior[patch], axis=axis, ext=ext)
+                    for name, patch, axis, ext in d_boundary]
 
         if len(boundary) == 1:
             boundary = boundary[0]
@@ -344,14 +397,9 @@ class Domain(BasicDomain):
 
         # ... create connectivity
         connectivity = Connectivity()
-        for edge,pair in d_connectivity.items():
-            bnds = []
-            for desc in pair:
-                patch = d_interior[desc['patch']]
-                name  = desc['name']
-                bnd   = Boundary(name, patch)
-                bnds.append(bnd)
-
+        for edge, pair in d_connectivity:
+            bnds = [Boundary(name, d_interior[patch], axis=axis, ext=ext)
+                    for name, patch, axis, ext in pair]
             connectivity[edge] = Interface(edge, bnds[0], bnds[1])
         # ...
 
@@ -362,48 +410,63 @@ class Domain(BasicDomain):
         return mapping(obj)
 
     def join(self, other, name, bnd_minus=None, bnd_plus=None):
-
+        """
+        Join the domain with one or several domains, gluing them along pairs
+        of boundaries. If other is a list of domains, bnd_minus and bnd_plus
+        are lists of boundaries of the same length, the k-th interface being
+        created between bnd_minus[k] and bnd_plus[k]: the N domains are then
+        merged at once, rather than by N-1 successive joins.
+
+        """
         from sympde.topology.mapping import InterfaceMapping, MultiPatchMapping
+
+        domains = [self] + (list(other) if isinstance(other, (tuple, list)) else [other])
+
+        if bnd_minus is None or bnd_plus is None:
+            bnd_minus = bnd_plus = ()
+        elif not isinstance(bnd_minus, (tuple, list)):
+            bnd_minus = [bnd_minus]
+            bnd_plus  = [bnd_plus]
+
+        if len(bnd_minus) != len(bnd_plus):
+            raise ValueError('> bnd_minus and bnd_plus must have the same length')
+
         # ... connectivity
         connectivity = Connectivity()
         # TODO be careful with '|' in psydac
-        if bnd_minus and bnd_plus:
+        for minus, plus in zip(bnd_minus, bnd_plus):
 
-            if bnd_minus.mapping and bnd_plus.mapping:
-                int_map            = InterfaceMapping(bnd_minus.mapping , bnd_plus.mapping)
-                a,b                = bnd_minus.logical_domain, bnd_plus.logical_domain
+            if minus.mapping and plus.mapping:
+                int_map            = InterfaceMapping(minus.mapping , plus.mapping)
+                a,b                = minus.logical_domain, plus.logical_domain
                 l_name             = '{l}|{r}'.format(l=a.domain.name, r=b.domain.name)
                 int_logical_domain = Interface(l_name, a,b)
             else:
                 int_map            = None
                 int_logical_domain = None
 
-            name               = '{l}|{r}'.format(l=bnd_minus.domain.name, r=bnd_plus.domain.name)
-            connectivity[name] = Interface(name, bnd_minus, bnd_plus,
-                                           mapping=int_map,
-                                           logical_domain=int_logical_domain)
-
-        for k,v in self.connectivity.items():
-            connectivity[k] = v
+            int_name               = '{l}|{r}'.format(l=minus.domain.name, r=plus.domain.name)
+            connectivity[int_name] = Interface(int_name, minus, plus,
+                                               mapping=int_map,
+                                               logical_domain=int_logical_domain)
 
-        for k,v in other.connectivity.items():
-            connectivity[k] = v
+        for domain in domains:
+            for k,v in domain.connectivity.items():
+                connectivity[k] = v
 
         # ... boundary
-        boundaries_minus = self.boundary.complement(bnd_minus)
-        boundaries_plus  = other.boundary.complement(bnd_plus)
-
-        boundaries = Union(boundaries_minus, boundaries_plus)
-        boundaries = boundaries.as_tuple()
+        glued      = set(bnd_minus) | set(bnd_plus)
+        boundaries = [b for domain in domains
+                        for b in _as_tuple(domain.boundary) if b not in glued]
 
         # ... interiors
-        interiors       = Union(self.interior, other.interior)
+        interiors = Union(*[domain.interior for domain in domains])
         if all(e.mapping for e in interiors):
             logical_interiors    = Union(*[e.logical_domain for e in interiors])
             logical_boundaries   = [e.logical_domain for e in boundaries]
             logical_connectivity = Connectivity()
             for k,v in connectivity.items():
-                logical_connectivity[name] = v.logical_domain
+                logical_connectivity[v.logical_domain.name] = v.logical_domain
 
             mapping        = MultiPatchMapping({e.logical_domain: e.mapping for e in interiors})
             logical_domain = Domain(name,
@@ -731,6 +794,200 @@ class Area(BasicGeometryOperator):
 
 
 
+#==============================================================================
+# Topology files
+#==============================================================================
+# Version of the layout written by _write_topology
+_TOPOLOGY_VERSION = 1
+
+# Encoding of Boundary.axis and Boundary.ext equal to None in the tables
+_NO_AXIS = -1
+_NO_EXT  = 0
+
+def _boundary_row(bnd, patches):
+    axis = _NO_AXIS if bnd.axis is None else bnd.axis
+    ext  = _NO_EXT  if bnd.ext  is None else bnd.ext
+    return (str(bnd.name), patches[str(bnd.domain.name)], axis, ext)
+
+def _write_table(group, name, fields, rows, compression):
+    """ Write a list of tuples to a dataset with a compound type. """
+    import numpy as np
+
+    data = np.array(rows, dtype=fields)
+    if len(data) == 0:
+        group.create_dataset(name, data=data)
+    else:
+        group.create_dataset(name, data=data, chunks=True, compression=compression)
+
+def _write_topology(h5, domain, compression=None):
+    """
+    Write the topology of a domain to the group 'topology' of an HDF5 file:
+
+    - attributes 'version', 'name', 'dim' and 'dtype' (JSON string);
+    - table 'interiors' : the names of the patches;
+    - table 'boundaries' : name, patch (index), axis, ext;
+    - table 'interfaces' : name, and patch (index), name, axis, ext of the
+      boundaries on the minus and plus sides.
+
+    The tables are chunked, hence a subset of their rows (e.g. the boundaries
+    of some patches) can be read without reading the others. An axis (resp.
+    ext) equal to None is stored as -1 (resp. 0).
+
+    """
+    import json
+    import h5py
+
+    string  = h5py.string_dtype()
+    group   = h5.create_group('topology')
+
+    group.attrs['version'] = _TOPOLOGY_VERSION
+    group.attrs['name']    = str(domain.name)
+    group.attrs['dim']     = int(domain.dim)
+    group.attrs['dtype']   = json.dumps(domain.dtype)
+
+    interiors = domain.interior.args if isinstance(domain.interior, Union) else [domain.interior]
+    patches   = OrderedDict((str(i.name), k) for k, i in enumerate(interiors))
+
+    boundaries = domain.boundary
+    boundaries = boundaries.args if isinstance(boundaries, Union) else [boundaries]
+
+    bnd_fields = [('name', string), ('patch', 'i8'), ('axis', 'i1'), ('ext', 'i1')]
+    int_fields = [('name', string)] + [(side + '_' + name, dtype)
+                  for side in ('minus', 'plus') for name, dtype in bnd_fields]
+
+    _write_table(group, 'interiors', [('name', string)],
+                 [(name,) for name in patches], compression)
+
+    _write_table(group, 'boundaries', bnd_fields,
+                 [_boundary_row(b, patches) for b in boundaries if b is not None],
+                 compression)
+
+    _write_table(group, 'interfaces', int_fields,
+                 [(str(name),) + _boundary_row(i.minus, patches) + _boundary_row(i.plus, patches)
+                  for name, i in sorted(domain.connectivity.items())],
+                 compression)
+
+def _select_patches(names, patches):
+    """ Return the indices of the selected patches, in increasing order. """
+    if patches is None:
+        return list(range(len(names)))
+
+    index    = {name: k for k, name in enumerate(names)}
+    selected = set()
+    for p in patches:
+        if isinstance(p, str):
+            if p not in index:
+                raise ValueError('> Unknown patch {}'.format(p))
+            selected.add(index[p])
+        elif 0 <= p < len(names):
+            selected.add(int(p))
+        else:
+            raise ValueError('> Patch index {} out of range'.format(p))
+    return sorted(selected)
+
+def _read_rows(dataset, columns, selected=None):
+    """ Read the rows of a table whose values in the given (integer) columns
+    are all selected. Only these columns and the selected rows are read.
+    """
+    import numpy as np
+
+    if selected is None or dataset.shape[0] == 0:
+        return dataset[()]
+
+    keep = np.ones(dataset.shape[0], dtype=bool)
+    for c in columns:
+        keep &= np.isin(dataset.fields(c)[()], selected)
+
+    # Read the contiguous ranges of selected rows
+    rows   = np.flatnonzero(keep)
+    breaks = np.flatnonzero(np.diff(rows) > 1) + 1
+    ranges = [(r[0], r[-1] + 1) for r in np.split(rows, breaks) if len(r)]
+    if not ranges:
+        return dataset[0:0]
+    return np.concatenate([dataset[a:b] for a, b in ranges])
+
+def _read_topology(group, patches=None):
+    """ Read the description of a domain written by _write_topology, see
+    _read_topology_yaml.
+    """
+    import json
+
+    version = group.attrs['version']
+    if version > _TOPOLOGY_VERSION:
+        raise ValueError('> Unsupported topology layout version {}'.format(version))
+
+    def _str(s):
+        return s.decode('utf-8') if isinstance(s, bytes) else str(s)
+
+    def _bnd(row, prefix=''):
+        axis = int(row[prefix + 'axis'])
+        ext  = int(row[prefix + 'ext'])
+        return (_str(row[prefix + 'name']), names[row[prefix + 'patch']],
+                None if axis == _NO_AXIS else axis,
+                None if ext  == _NO_EXT  else ext)
+
+    name  = _str(group.attrs['name'])
+    dim   = int(group.attrs['dim'])
+    dtype = json.loads(_str(group.attrs['dtype']))
+
+    names    = [_str(n) for n in group['interiors'].fields('name')[()]]
+    selected = _select_patches(names, patches)
+    subset   = None if patches is None else selected
+
+    boundaries = [_bnd(row) for row in _read_rows(group['boundaries'], ['patch'], subset)]
+    interfaces = [(_str(row['name']), (_bnd(row, 'minus_'), _bnd(row, 'plus_')))
+                  for row in _read_rows(group['interfaces'], ['minus_patch', 'plus_patch'], subset)]
+
+    return name, dim, dtype, [names[k] for k in selected], boundaries, interfaces
+
+def _read_topology_yaml(dataset, patches=None):
+    """
+    Read the description of a domain stored as a YAML string (former layout).
+
+    Returns
+    -------
+    name, dim, dtype :
+        Name, dimension and type (None or a dict) of the domain.
+
+    interiors : list
+        Names of the patches.
+
+    boundaries : list
+        (name, patch name, axis, ext) of each boundary.
+
+    interfaces : list
+        (name, (minus boundary, plus boundary)) of each interface, where the
+        boundaries are described as above.
+
+    """
+    import yaml
+
+    yml = yaml.load( dataset[()], Loader=yaml.SafeLoader )
+
+    def _int(value):
+        return None if value in (None, 'None') else int(value)
+
+    def _list(value):
+        # A single interior or boundary is stored as a dict
+        return [value] if isinstance(value, dict) else value
+
+    def _bnd(desc):
+        return (desc['name'], desc['patch'], _int(desc.get('axis')), _int(desc.get('ext')))
+
+    dtype = yml['dtype']
+    if dtype == 'None': dtype = None
+
+    names    = [i['name'] for i in _list(yml['interior'])]
+    selected = {names[k] for k in _select_patches(names, patches)}
+
+    boundaries = [_bnd(desc) for desc in _list(yml['boundary']) if desc['patch'] in selected]
+    interfaces = [(edge, tuple(_bnd(desc) for desc in pair))
+                  for edge, pair in yml['connectivity'].items()
+                  if all(desc['patch'] in selected for desc in pair)]
+
+    return (yml['name'], int(yml['dim']), dtype,
+            [n for n in names if n in selected], boundaries, interfaces)
+
 #==============================================================================
 def split(domain, value):
     if domain.dtype['type'] == 'Line':
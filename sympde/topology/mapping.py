@@ -6,7 +6,6 @@ from sympy import Indexed, IndexedBase, Idx
 from sympy import Matrix, ImmutableDenseMatrix
 from sympy import Function, Expr
 from sympy import sympify
-from sympy import cacheit
 
 from sympy.core import Basic
 from sympy.core import Symbol
@@ -49,21 +48,117 @@ from .derivatives import LogicalGrad_1d, LogicalGrad_2d, LogicalGrad_3d
 # TODO fix circular dependency between sympde.topology.domain and sympde.topology.mapping
 # TODO fix circular dependency between sympde.expr.evaluation and sympde.topology.mapping
 #==============================================================================
-from sympy                   import sqrt, symbols
+from sympy                   import sqrt, symbols, binomial, Rational
+from sympy                   import Dummy
 from sympy.core.exprtools    import factor_terms
-from sympy.polys.polytools   import parallel_poly_from_expr
-from sympy                   import cacheit
+from sympy.core.compatibility import default_sort_key
+from sympy.core.numbers      import Float
+from sympy.polys.domains     import QQ
+from sympy.polys.rings       import PolyRing
+from sympde.cache             import cacheit
 
-@cacheit
-def cancel(f):
+def _opaque_generators(expr, generators):
+    """
+    Replace the non-polynomial subexpressions of expr (components of the
+    mapping and their derivatives, elementary functions, radicals, ...) by
+    dummy symbols, stored in the dictionary generators.
+    """
+    if expr.is_Number or expr.is_Symbol:
+        return expr
+
+    elif isinstance(expr, (Add, Mul)):
+        return expr.func(*[_opaque_generators(a, generators) for a in expr.args])
+
+    elif isinstance(expr, Pow) and expr.exp.is_Integer and expr.exp > 0:
+        return Pow(_opaque_generators(expr.base, generators), expr.exp)
+
+    try:
+        return generators[expr]
+    except KeyError:
+        generators[expr] = Dummy()
+        return generators[expr]
+
+def _n_terms(expr):
+    """ Upper bound of the number of terms of the expanded polynomial. """
+    if isinstance(expr, Add):
+        return sum(_n_terms(a) for a in expr.args)
+
+    elif isinstance(expr, Mul):
+        n = 1
+        for a in expr.args:
+            n *= _n_terms(a)
+        return n
+
+    elif isinstance(expr, Pow):
+        k = _n_terms(expr.base)
+        return binomial(int(expr.exp) + k - 1, k - 1)
+
+    return 1
+
+@cacheit('mapping')
+def cancel(f, max_terms=2000):
+    """
+    Cancel the common factors of the numerator and the denominator of a
+    rational expression. The components of the mapping, their derivatives and
+    all the non-polynomial subexpressions are treated as opaque generators.
+
+    If the numerator and the denominator have no common factor, f (with its
+    common terms factored) is returned. The polynomial arithmetic is skipped,
+    which also returns f, when they have no generator in common, or when
+    their expansion would have more than max_terms terms: the result only
+    depends on f and max_terms. The floating point coefficients are replaced
+    by rational numbers for the cancellation, and restored afterwards; the
+    exact coefficients of f are kept exact.
+    """
     try:
-        f           = factor_terms(f, radical=True)
-        p, q        = f.as_numer_denom()
-        # TODO accelerate parallel_poly_from_expr
-        (p, q), opt = parallel_poly_from_expr((p,q))
-        c, P, Q     = p.cancel(q)
-        return c*(P.as_expr()/Q.as_expr())
-    except:
+        exact = {c for c in f.atoms(Rational) if not c.is_Integer}
+        f     = factor_terms(f, radical=True)
+        p, q  = f.as_numer_denom()
+        if q.is_Number or not (f.is_commutative and q.is_commutative):
+            return f
+
+        generators = OrderedDict()
+        p = _opaque_generators(p, generators)
+        q = _opaque_generators(q, generators)
+
+        # The greatest common divisor of polynomials in disjoint sets of
+        # variables is a constant
+        if not (p.free_symbols & q.free_symbols):
+            return f
+
+        if _n_terms(p) + _n_terms(q) > max_terms:
+            return f
+
+        # The gcd of polynomials with floating point coefficients is not
+        # reliable: it is computed with rational coefficients
+        floats = {c: Rational(str(c)) for c in p.atoms(Float) | q.atoms(Float)}
+        if floats:
+            p = p.xreplace(floats)
+            q = q.xreplace(floats)
+
+        # The polynomials are built directly in a sparse polynomial ring,
+        # which is much faster than expanding the expressions
+        gens = sorted(p.free_symbols | q.free_symbols, key=default_sort_key)
+        R    = PolyRing(gens, QQ)
+        P, Q = R.from_expr(p), R.from_expr(q)
+        if P.gcd(Q).is_ground:
+            return f
+
+        P, Q = P.cancel(Q)
+
+        r = P.as_expr()/Q.as_expr()
+        if floats:
+            # The exact coefficients of f are kept, the rational images of its
+            # floating point coefficients are mapped back to them, and the
+            # other coefficients, which result from the scaling of the latter
+            # by the cancellation, are converted to floating point numbers
+            restore = {v: k for k, v in floats.items()}
+            r = r.xreplace({c: restore.get(c, Float(c)) for c in r.atoms(Rational)
+                            if not (c.is_Integer or c in exact)})
+
+        return r.xreplace({v: k for k, v in generators.items()})
+
+    except Exception:
         return f
 
 def get_logical_test_function(u):
@@ -75,6 +170,43 @@ def get_logical_test_function(u):
     el              = l_space.element(u.name)
     return el
 #==============================================================================
+@cacheit('mapping')
+def _mapping_metric(mapping, kind, axis=None):
+    """
+    Metric data of a mapping: Jacobian matrix (kind='J'), its inverse
+    ('inv_J') and determinant ('det_J'), metric tensor G = J^T J ('G'), its
+    inverse ('inv_G') and determinant ('det_G'). If an axis is given, the
+    column 'axis' of the Jacobian matrix is removed (boundary normal to the
+    given axis).
+    """
+    if kind == 'J':
+        if axis is None:
+            value = Jacobian(mapping)
+        else:
+            value = ImmutableDenseMatrix(mapping.jacobian_expr.col_del(axis))
+
+    elif kind == 'inv_J':
+        value = mapping.jacobian_expr.inv()
+
+    elif kind == 'det_J':
+        value = mapping.jacobian_expr.det().factor()
+
+    elif kind == 'G':
+        J     = _mapping_metric(mapping, 'J', axis)
+        value = J.T*J
+
+    elif kind == 'inv_G':
+        value = _mapping_metric(mapping, 'G', axis).inv()
+
+    elif kind == 'det_G':
+        value = _mapping_metric(mapping, 'G', axis).det().factor()
+
+    else:
+        raise ValueError('> Unknown metric data {}'.format(kind))
+
+    return value
+
+#==============================================================================
 class Mapping(BasicMapping):
     """
     Represents a Mapping object.
@@ -189,6 +321,48 @@ class Mapping(BasicMapping):
     def det_jacobian(self):
         return self.jacobian.det()
 
+    # ... metric data, computed on demand and cached (see _mapping_metric)
+    def _metric(self, kind, axis=None):
+        return _mapping_metric(self, kind, axis)
+
+    @property
+    def jacobian_expr(self):
+        """ Jacobian matrix J of the mapping, in terms of the logical
+        derivatives of its components. """
+        return self._metric('J')
+
+    @property
+    def jacobian_inv_expr(self):
+        """ Inverse of the Jacobian matrix. """
+        return self._metric('inv_J')
+
+    @property
+    def jacobian_det_expr(self):
+        """ Determinant of the Jacobian matrix. """
+        return self._metric('det_J')
+
+    @property
+    def metric_expr(self):
+        """ Metric tensor G = J^T J. """
+        return self._metric('G')
+
+    @property
+    def metric_inv_expr(self):
+        """ Inverse of the metric tensor. """
+        return self._metric('inv_G')
+
+    @property
+    def metric_det_expr(self):
+        """ Determinant of the metric tensor. """
+        return self._metric('det_G')
+
+    def boundary_measure_expr(self, axis):
+        """ Surface measure sqrt(det(J_b^T J_b)) on the boundaries normal to
+        the given axis, where J_b is the Jacobian matrix without its column
+        'axis'. """
+        return sqrt(self._metric('det_G', axis))
+    # ...
+
     @property
     def is_analytical(self):
         return not( self._expressions is None )
@@ -197,6 +371,32 @@ class Mapping(BasicMapping):
     def expressions(self):
         return self._expressions
 
+    def to_callable(self, **params):
+        """
+        Return vectorized NumPy functions which evaluate an analytical mapping,
+        its Jacobian matrix, the inverse of the Jacobian and its determinant.
+
+        Parameters
+        ----------
+        params : dict
+            Values of the constants which were not given to the constructor.
+
+        Returns
+        -------
+        F : CallableMapping
+            Callable object.
+
+        Examples
+        --------
+        >>> M = PolarMapping('M', 2, c1=0, c2=0, rmin=0.5, rmax=1)
+        >>> F = M.to_callable()
+        >>> x1, x2 = np.meshgrid(np.linspace(0, 1, 10), np.linspace(0, np.pi, 20), indexing='ij')
+        >>> F(x1, x2).shape, F.jacobian(x1, x2).shape, F.det_jacobian(x1, x2).shape
+        ((2, 10, 20), (2, 2, 10, 20), (10, 20))
+
+        """
+        return CallableMapping(self, **params)
+
     def _sympystr(self, printer):
         sstr = printer.doprint
         return sstr(self.name)
@@ -410,6 +610,135 @@ class TwistedTargetMapping(Mapping):
 
     _rdim        = 3
 
+#==============================================================================
+@cacheit('mapping')
+def _lambdify_mapping(expressions, coordinates, kind):
+    """
+    Create a NumPy kernel for the analytical expressions of a mapping
+    (kind='F'), its Jacobian matrix (kind='J'), the inverse of the Jacobian
+    (kind='inv_J') or its determinant (kind='det_J').
+
+    If the Jacobian matrix is not square, i.e. the number of expressions
+    differs from the number of logical coordinates, its Moore-Penrose
+    pseudo-inverse is returned for kind='inv_J', and its determinant is not
+    defined.
+    """
+    # avoid circular import
+    from sympde.printing.pycode import lambdify_numpy
+
+    F = ImmutableDenseMatrix(expressions)
+    J = F.jacobian(coordinates)
+
+    if kind == 'F':
+        expr = Tuple(*expressions)
+    elif kind == 'J':
+        expr = J
+    elif kind == 'det_J':
+        if not J.is_square:
+            raise ValueError('> The determinant of the {}x{} Jacobian matrix is not defined'
+                             ', use the determinant of the metric tensor J^T J'.format(*J.shape))
+        expr = J.det(method='berkowitz')
+    elif kind == 'inv_J':
+        if J.rows > J.cols:
+            # Left inverse (J^T J)^-1 J^T of a Jacobian with full column rank
+            G    = J.T*J
+            expr = G.adjugate() * J.T / G.det(method='berkowitz')
+        elif J.rows < J.cols:
+            # Right inverse J^T (J J^T)^-1 of a Jacobian with full row rank
+            G    = J*J.T
+            expr = J.T * G.adjugate() / G.det(method='berkowitz')
+        else:
+            expr = J.adjugate() / J.det(method='berkowitz')
+    else:
+        raise ValueError('> Unknown kind {}'.format(kind))
+
+    return lambdify_numpy(coordinates, expr, name='mapping_{}'.format(kind))
+
+class CallableMapping(object):
+    """
+    Vectorized NumPy evaluation of an analytical mapping, and of its metric
+    quantities, on whole grids of logical coordinates.
+
+    The arguments of all the methods are the arrays of the logical
+    coordinates x1, x2, (x3), which are broadcast together; the results are
+    arrays whose last dimensions are those of the grid. The kernels are
+    generated on first use, and shared between all the mappings with the same
+    expressions.
+
+    Parameters
+    ----------
+    mapping : Mapping
+        Analytical mapping.
+
+    params : dict
+        Values of the constants which were not given to the constructor of
+        the mapping.
+
+    """
+    def __init__(self, mapping, **params):
+
+        if not isinstance(mapping, Mapping):
+            raise TypeError('> Expecting a Mapping object')
+
+        if not mapping.is_analytical:
+            raise ValueError('> Only analytical mappings can be evaluated')
+
+        expressions = mapping.expressions
+        constants   = {c.name: c for c in expressions.free_symbols if isinstance(c, Constant)}
+
+        unknown = set(params) - set(constants)
+        if unknown:
+            raise ValueError('> Unknown parameters {} for mapping {}'.format(
+                ', '.join(sorted(unknown)), mapping.name))
+
+        missing = set(constants) - set(params)
+        if missing:
+            raise ValueError('> Missing values for the parameters {} of mapping {}'.format(
+                ', '.join(sorted(missing)), mapping.name))
+
+        expressions = expressions.subs({constants[k]: v for k, v in params.items()})
+
+        self._mapping     = mapping
+        self._params      = params
+        self._expressions = expressions
+        self._coordinates = mapping._logical_coordinates
+
+    @property
+    def mapping(self):
+        return self._mapping
+
+    @property
+    def params(self):
+        return self._params
+
+    @property
+    def rdim(self):
+        return self._mapping.rdim
+
+    def _kernel(self, kind):
+        return _lambdify_mapping(self._expressions, self._coordinates, kind)
+
+    def __call__(self, *coordinates):
+        """ Physical coordinates, array of shape (rdim, *grid.shape). """
+        return self._kernel('F')(*coordinates)
+
+    def jacobian(self, *coordinates):
+        """ Jacobian matrix, array of shape (rdim, ldim, *grid.shape). """
+        return self._kernel('J')(*coordinates)
+
+    def inv_jacobian(self, *coordinates):
+        """ Inverse of the Jacobian matrix, array of shape (ldim, rdim, *grid.shape);
+        pseudo-inverse if the Jacobian matrix is not square. """
+        return self._kernel('inv_J')(*coordinates)
+
+    def det_jacobian(self, *coordinates):
+        """ Determinant of the Jacobian matrix, array of shape grid.shape; raises
+        a ValueError if the Jacobian matrix is not square. """
+        return self._kernel('det_J')(*coordinates)
+
+    def __repr__(self):
+        return 'CallableMapping({})'.format(self._mapping.name)
+
 #==============================================================================
 class MappedDomain(BasicDomain):
     """."""
@@ -476,7 +805,7 @@ class SymbolicWeightedVolume(Expr):
 class MappingApplication(Function):
     nargs = None
 
-    @cacheit
+    @cacheit('mapping')
     def __new__(cls, *args, **options):
 
         if options.pop('evaluate', True):
@@ -550,7 +879,7 @@ class Jacobian(MappingApplication):
     """
 
     @classmethod
-    @cacheit
+    @cacheit('mapping')
     def eval(cls, F):
         """
         this class methods computes the jacobian of a mapping
@@ -594,7 +923,7 @@ class Covariant(MappingApplication):
     """
 
     @classmethod
-    @cacheit
+    @cacheit('mapping')
     def eval(cls, F, v):
 
         """
@@ -617,7 +946,7 @@ class Covariant(MappingApplication):
         if not isinstance(v, (tuple, list, Tuple, ImmutableDenseMatrix, Matrix)):
             raise TypeError('> Expecting a tuple, list, Tuple, Matrix')
 
-        M   = Jacobian(F).inv().T
+        M   = F.jacobian_inv_expr.T
         dim = F.rdim
         if dim == 1:
             b = M[0,0] * v[0]
@@ -642,7 +971,7 @@ class Contravariant(MappingApplication):
     """
 
     @classmethod
-    @cacheit
+    @cacheit('mapping')
     def eval(cls, F, v):
         """
         This class methods computes the contravariant transformation
@@ -667,16 +996,14 @@ class Contravariant(MappingApplication):
         if not isinstance(v, (tuple, list, Tuple, ImmutableDenseMatrix, Matrix)):
             raise TypeError('> Expecting a tuple, list, Tuple, Matrix')
 
-        M = Jacobian(F)
-        M = M/M.det()
-        v = Matrix(v)
-        v = M*v
+        M = F.jacobian_expr/F.jacobian_det_expr
+        v = M*ImmutableDenseMatrix(v)
         return Tuple(*v)
 
 #==============================================================================
 class LogicalExpr(CalculusFunction):
 
-    @cacheit
+    @cacheit('logical_expr')
     def __new__(cls, expr, **options):
         # (Try to) sympify args first
 
@@ -725,7 +1052,7 @@ class LogicalExpr(CalculusFunction):
             return Indexed(self, indices, **kw_args)
 
     @classmethod
-    @cacheit
+    @cacheit('logical_expr')
     def eval(cls, expr, mapping=None, dim=None, **options):
         """."""
 
@@ -1044,9 +1371,8 @@ class LogicalExpr(CalculusFunction):
             domain  = expr.target.logical_domain
             mapping = expr.target.mapping
             dim     = domain.dim
-            J       = mapping.jacobian
             newexpr = cls.eval(expr.expr, mapping=mapping, dim=dim)
-            det     = TerminalExpr(sqrt((J.T*J).det()), dim=dim, logical=True)
+            det     = sqrt(mapping.metric_det_expr)
             
             return DomainExpression(domain, ImmutableDenseMatrix([[newexpr*det]]))
             
@@ -1060,7 +1386,7 @@ class SymbolicExpr(CalculusFunction):
     """returns a sympy expression where partial derivatives are converted into
     sympy Symbols."""
 
-    @cacheit
+    @cacheit('symbolic_expr')
     def __new__(cls, *args, **options):
         # (Try to) sympify args first
 
@@ -1082,7 +1408,7 @@ class SymbolicExpr(CalculusFunction):
             return Indexed(self, indices, **kw_args)
 
     @classmethod
-    @cacheit
+    @cacheit('symbolic_expr')
     def eval(cls, *_args, **kwargs):
         """."""
 
@@ -1231,3 +1557,184 @@ class SymbolicExpr(CalculusFunction):
         else:
             raise NotImplementedError('Cannot translate to Sympy: {}'.format(expr))
 
+
+#==============================================================================
+def metric_cse(expr, prefix='metric', symbolic=False):
+    """
+    Extract the metric subexpressions of a logical expression (i.e. the
+    subexpressions which only depend on the mapping, such as the entries of
+    the inverse Jacobian matrix, its determinant or the weighted volume) and
+    eliminate the common subexpressions between them.
+
+    Every maximal metric subexpression of the input, as well as every metric
+    subexpression which appears more than once, is replaced by a temporary
+    symbol, so that a kernel can compute the metric once per quadrature point
+    and reuse it in all the terms.
+
+    Parameters
+    ----------
+    expr : sympy.Expr | Matrix | ImmutableDenseMatrix
+        Output of LogicalExpr (or of TerminalExpr on a logical domain).
+
+    prefix : str
+        Prefix of the names of the temporary symbols.
+
+    symbolic : bool
+        If True, the temporaries and the reduced expression are converted with
+        SymbolicExpr.
+
+    Returns
+    -------
+    temporaries : list
+        List of pairs (Symbol, expr), where each expr may depend on the
+        symbols defined before it.
+
+    reduced : sympy.Expr | Matrix | ImmutableDenseMatrix
+        Input expression where the metric subexpressions are replaced by the
+        temporary symbols.
+
+    """
+    from sympy import cse, numbered_symbols, Dummy
+
+    is_matrix = isinstance(expr, (Matrix, ImmutableDenseMatrix))
+    exprs     = list(expr) if is_matrix else [sympify(expr)]
+
+    field_types  = (ScalarTestFunction, VectorTestFunction, ScalarField, VectorField)
+    metric_types = (Mapping, SymbolicDeterminant, SymbolicWeightedVolume)
+
+    # ... flags (has a field, has a metric atom) of every node
+    flags   = {}
+    symbols = set()
+    def _flags(e):
+        try:
+            return flags[e]
+        except KeyError:
+            pass
+
+        if isinstance(e, Symbol):
+            symbols.add(e)
+
+        if isinstance(e, field_types):
+            r = (True, False)
+        elif isinstance(e, metric_types):
+            r = (False, True)
+        else:
+            f = m = False
+            for a in e.args:
+                if isinstance(a, Basic):
+                    af, am = _flags(a)
+                    f, m   = f or af, m or am
+            r = (f, m)
+
+        flags[e] = r
+        return r
+
+    def _is_metric(e):
+        return (isinstance(e, Expr) and not isinstance(e, IndexedBase)
+                and e.is_commutative and not getattr(e, 'is_Matrix', False)
+                and _flags(e) == (False, True))
+    # ...
+
+    # ... replace the maximal metric subexpressions by placeholders
+    placeholders = OrderedDict()
+    def _placeholder(e):
+        try:
+            return placeholders[e]
+        except KeyError:
+            placeholders[e] = Dummy()
+            return placeholders[e]
+
+    extracted = {}
+    def _extract(e):
+        try:
+            return extracted[e]
+        except KeyError:
+            pass
+
+        if _is_metric(e):
+            r = _placeholder(e)
+
+        elif not _flags(e)[1]:
+            r = e
+
+        elif isinstance(e, (Add, Mul)):
+            metric = [a for a in e.args if _is_metric(a)]
+            others = [_extract(a) for a in e.args if not _is_metric(a)]
+            if metric:
+                others.insert(0, _placeholder(e.func(*metric)))
+            r = e.func(*others)
+
+        else:
+            args = [_extract(a) if isinstance(a, Basic) else a for a in e.args]
+            if all(a is b for a, b in zip(args, e.args)):
+                r = e
+            else:
+                r = e.func(*args)
+
+        extracted[e] = r
+        return r
+
+    exprs = [_extract(e) for e in exprs]
+    # ...
+
+    # ... the sympde atoms (derivatives of the mapping, ...) are replaced by
+    #     symbols, since sympy.cse can only rebuild sympy objects
+    atoms = OrderedDict()
+    atomized = {}
+    def _atomize(e):
+        try:
+            return atomized[e]
+        except KeyError:
+            pass
+
+        if isinstance(e, (Indexed, DifferentialOperator, SymbolicDeterminant, SymbolicWeightedVolume)):
+            r = Dummy()
+            atoms[r] = e
+        else:
+            args = [_atomize(a) if isinstance(a, Basic) else a for a in e.args]
+            if all(a is b for a, b in zip(args, e.args)):
+                r = e
+            else:
+                r = e.func(*args)
+
+        atomized[e] = r
+        return r
+
+    metric = [_atomize(e) for e in placeholders.keys()]
+    # ...
+
+    # ... common subexpressions of the metric
+    excluded    = symbols
+    temporaries = numbered_symbols(prefix, exclude=excluded)
+
+    temps, reduced = cse(metric, symbols=temporaries, order='none')
+    temps   = [(t, e.xreplace(atoms)) for t, e in temps]
+    reduced = [e.xreplace(atoms) for e in reduced]
+
+    # ... the remaining metric subexpressions are stored in new temporaries,
+    #     except the atoms which are kept as they are
+    atom_values = set(atoms.values())
+    d = {}
+    for p, e in zip(placeholders.values(), reduced):
+        if e in atom_values:
+            pass
+
+        elif not isinstance(e, Symbol) or e in excluded:
+            s = next(temporaries)
+            temps.append((s, e))
+            e = s
+        d[p] = e
+
+    exprs = [e.xreplace(d) for e in exprs]
+    # ...
+
+    if symbolic:
+        temps = [(s, SymbolicExpr(e)) for s, e in temps]
+        exprs = [SymbolicExpr(e) for e in exprs]
+
+    if is_matrix:
+        reduced = type(expr)(*expr.shape, exprs)
+    else:
+        reduced = exprs[0]
+
+    return temps, reduced
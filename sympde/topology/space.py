@@ -1,7 +1,5 @@
 # coding: utf-8
 
-from numpy import unique
-
 from sympy.core import Basic
 from sympy.tensor import Indexed, IndexedBase
 from sympy.core import Symbol
@@ -372,6 +370,7 @@ class ProductSpace(BasicFunctionSpace):
             else:
                 return [i.name for i in V.coordinates]
 
+        from numpy import unique
         coordinates = unique([_get_name(i) for i in spaces])
         for i in coordinates:
             if not isinstance(i, str):
@@ -10,6 +10,7 @@ from sympde.topology import Domain, Mapping
 from sympde.topology import dx, dy
 from sympde.topology import dx1, dx2, dx3
 from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import ScalarTestFunction
 from sympde.topology import element_of, elements_of
 from sympde.topology import LogicalExpr
 from sympde.topology import SymbolicExpr
@@ -21,10 +22,10 @@ from sympde.topology import CollelaMapping
 from sympde.topology import TorusMapping
 from sympde.topology import TwistedTargetMapping
 
-from sympde.expr     import BilinearForm, integral
+from sympde.expr     import BilinearForm, integral, TerminalExpr
 from sympde.calculus import grad, div, curl, dot
 
-from sympde.topology.mapping import Jacobian
+from sympde.topology.mapping import Jacobian, metric_cse
 
 #==============================================================================
 def test_logical_expr_1d_1():
@@ -776,6 +777,40 @@ def test_twisted_target_mapping_3d_1():
     assert(expand(LogicalExpr(Jacobian(M), mapping=M, dim=rdim, subs=True)) == expand(expected))
 
 
+#==============================================================================
+def test_metric_cse_2d_1():
+
+    M = Mapping('M', 2)
+    domain = M(Domain('Omega', dim=2))
+
+    V    = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+
+    a    = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    expr = LogicalExpr(TerminalExpr(a)[0].expr, mapping=M, dim=2)
+
+    temps, reduced = metric_cse(expr)
+
+    # The temporaries only depend on the mapping
+    for s, e in temps:
+        assert not e.atoms(ScalarTestFunction)
+        assert str(s).startswith('metric')
+
+    # The metric is not repeated in the reduced expression
+    assert len(temps) == 1
+    assert reduced.count(temps[0][0]) == 1
+
+    # Substituting the temporaries back gives the original expression
+    e = reduced
+    for s, t in reversed(temps):
+        e = e.xreplace({s: t})
+    assert expand(SymbolicExpr(e) - SymbolicExpr(expr)) == 0
+
+    # Symbolic output
+    temps, reduced = metric_cse(expr, symbolic=True)
+    assert Symbol('x_x1') in temps[0][1].free_symbols
+    assert Symbol('u_x1') in reduced.free_symbols
+
 #==============================================================================
 # CLEAN UP SYMPY NAMESPACE
 #==============================================================================
@@ -1,16 +1,25 @@
 # coding: utf-8
 
+import numpy as np
+import pytest
+
 from sympy.core.containers import Tuple
-from sympy import Matrix
+from sympy import Matrix, ImmutableDenseMatrix
 from sympy.tensor import IndexedBase
-from sympy import symbols, simplify
+from sympy import symbols, simplify, sqrt, cos, sin, count_ops
+from sympy import Rational, Float
 
 from sympde.topology import Mapping, MappedDomain
+from sympde.topology import IdentityMapping, PolarMapping, TorusMapping
+from sympde.topology import CzarnyMapping
 from sympde.topology import dx, dy, dz
 from sympde.topology import dx1, dx2, dx3
 from sympde.topology import Domain
 
 from sympde.topology.mapping import Jacobian, Covariant, Contravariant
+from sympde.topology.mapping import cancel
+from sympde.topology.mapping import _lambdify_mapping
+from sympde.expr import TerminalExpr
 # ...
 def test_mapping_1d():
     print('============ test_mapping_1d ==============')
@@ -127,6 +136,137 @@ def test_mapping_2d_2():
     domain = Domain('Omega', dim=rdim)
     D      = F(domain)
 
+# ...
+def test_mapping_to_callable():
+    print('============ test_mapping_to_callable ==============')
+
+    M = PolarMapping('M', 2, c1=1., c2=0., rmin=0.5, rmax=1.)
+    F = M.to_callable()
+
+    x1, x2 = np.meshgrid(np.linspace(0, 1, 5), np.linspace(0, np.pi, 7), indexing='ij')
+    r      = 0.5 + 0.5*x1
+
+    assert np.allclose(F(x1, x2), [1 + r*np.cos(x2), r*np.sin(x2)])
+    assert np.allclose(F.det_jacobian(x1, x2), 0.5*r)
+
+    J    = F.jacobian(x1, x2)
+    invJ = F.inv_jacobian(x1, x2)
+    assert J.shape == invJ.shape == (2, 2, 5, 7)
+    assert np.allclose(np.einsum('ij...,jk...->ik...', J, invJ), np.eye(2)[:, :, None, None])
+
+    # Constant entries are broadcast over the grid
+    I = IdentityMapping('I', 3).to_callable()
+    assert np.allclose(I.jacobian(0.5, np.zeros(4), 1.), np.eye(3)[:, :, None])
+
+    # Parameters not given to the mapping must be given to to_callable
+    M = TorusMapping('T', 3)
+    with pytest.raises(ValueError):
+        M.to_callable()
+
+    with pytest.raises(ValueError):
+        M.to_callable(R0=2., R1=1.)
+
+    x = np.random.rand(3, 10)
+    F = M.to_callable(R0=2.)
+    assert np.allclose(F.det_jacobian(*x), -x[0]*(2 + x[0]*np.cos(x[1])))
+
+    with pytest.raises(ValueError):
+        Mapping('F', 2).to_callable()
+
+    # Non-square Jacobian matrices: cylindrical surface in 3D
+    t1, t2 = symbols('x1, x2')
+    exprs  = Tuple(cos(t2), sin(t2), t1)
+    x      = np.random.rand(2, 10)
+
+    J    = _lambdify_mapping(exprs, Tuple(t1, t2), 'J')(*x)
+    invJ = _lambdify_mapping(exprs, Tuple(t1, t2), 'inv_J')(*x)
+    assert J.shape == (3, 2, 10) and invJ.shape == (2, 3, 10)
+    assert np.allclose(np.einsum('ij...,jk...->ik...', invJ, J), np.eye(2)[:, :, None])
+    assert np.allclose(invJ, np.moveaxis(np.linalg.pinv(np.moveaxis(J, -1, 0)), 0, -1))
+
+    with pytest.raises(ValueError):
+        _lambdify_mapping(exprs, Tuple(t1, t2), 'det_J')
+
+# ...
+def test_mapping_metric():
+    print('============ test_mapping_metric ==============')
+
+    rdim = 2
+    F    = Mapping('F', rdim)
+    J    = Jacobian(F)
+
+    # The metric data is computed once and stored in the mapping
+    assert F.jacobian_expr == J
+    assert F.jacobian_inv_expr is F.jacobian_inv_expr
+    assert F.metric_expr is F.metric_expr
+
+    assert simplify(F.jacobian_inv_expr*J) == Matrix.eye(rdim)
+    assert simplify(F.jacobian_det_expr - J.det()) == 0
+    assert simplify(F.metric_expr - J.T*J) == Matrix.zeros(rdim)
+    assert simplify(F.metric_inv_expr*F.metric_expr) == Matrix.eye(rdim)
+    assert simplify(F.metric_det_expr - J.det()**2) == 0
+
+    # Surface measure on the boundaries x1 = const
+    expected = sqrt(dx2(F[0])**2 + dx2(F[1])**2)
+    assert simplify(F.boundary_measure_expr(0) - expected) == 0
+
+    # TerminalExpr uses the metric data of the mapping
+    JS = F.jacobian
+    assert TerminalExpr(JS.det(), dim=rdim) is F.jacobian_det_expr
+    assert TerminalExpr(JS.inv(), dim=rdim) is F.jacobian_inv_expr
+    assert TerminalExpr((JS.T*JS).det(), dim=rdim) is F.metric_det_expr
+
+    # The metric data is cached, not stored in the (hashable) mapping
+    assert Mapping('F', rdim).metric_det_expr is F.metric_det_expr
+    assert not hasattr(F, '_metric_data')
+    assert hash(F) == hash(Mapping('F', rdim))
+
+# ...
+def test_mapping_cancel():
+    print('============ test_mapping_cancel ==============')
+
+    F      = Mapping('F', 2)
+    x1, x2 = symbols('x1, x2')
+
+    a, b = dx1(F[0]), dx1(F[1])
+    assert cancel((a**2 - b**2)/(a + b)) == a - b
+
+    # Non-polynomial subexpressions are opaque generators
+    c = cos(x2)
+    assert cancel((c**2 - 1)/(c - 1)) == c + 1
+    assert cancel((c**2 - 1)*sqrt(x1)/((c - 1)*sqrt(x1))) == c + 1
+
+    # Floating point coefficients
+    assert cancel((a**2 - 0.09*b**2)/(a + 0.3*b)) == a - 0.3*b
+
+    # Mixed exact and floating point coefficients: the exact ones are kept
+    r = cancel((Rational(1, 3)*b*(a**2 - 1) + 0.5*(a**2 - 1))/(a - 1))
+    assert r == a*b/3 + 0.5*a + b/3 + 0.5
+    assert Rational(1, 3) in r.atoms(Rational)
+    assert r.atoms(Float) == {Float(0.5)}
+
+    # No common factor or generator, or expansion too large: f is returned
+    f = (a + 1)/(b + 1)
+    assert cancel(f) == f
+
+    f = (a + 1)/(a + b)
+    assert cancel(f) == f
+
+    f = (a**2 - b**2)/(a + b)
+    assert cancel(f, max_terms=3) == f
+
+    # Gallery mapping with a polynomial blow-up
+    M  = CzarnyMapping('M', 2)
+    x  = M._logical_coordinates
+    J  = ImmutableDenseMatrix(M.expressions).jacobian(x)
+    A  = J.adjugate()
+    e  = (A*A.T)[0, 0]/J.det()
+    r  = cancel(e)
+    assert count_ops(r) <= count_ops(e)
+
+    d  = {s: 0.2 for s in e.free_symbols}
+    assert abs(complex(e.subs(d).evalf()) - complex(r.subs(d).evalf())) < 1e-12
+
 #==============================================================================
 # CLEAN UP SYMPY NAMESPACE
 #==============================================================================
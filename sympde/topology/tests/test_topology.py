@@ -1,5 +1,7 @@
 # coding: utf-8
 
+import pytest
+
 from collections import OrderedDict
 
 from sympy.tensor import Indexed
@@ -11,8 +13,11 @@ from sympde.topology import Domain, ElementDomain
 from sympde.topology import Area
 from sympde.topology import Interface
 from sympde.topology import Line, Square
+from sympde.topology import PolarMapping
 
 import os
+import subprocess
+import sys
 
 base_dir = os.path.dirname(os.path.realpath(__file__))
 topo_dir = os.path.join(base_dir, 'data')
@@ -35,6 +40,28 @@ def test_interior_domain():
     assert( D.todict() == [OrderedDict([('name', 'D1')]),
                            OrderedDict([('name', 'D2')])] )
 
+#==============================================================================
+def test_union():
+    A = InteriorDomain('A', dim=2)
+    B = InteriorDomain('B', dim=2)
+    C = InteriorDomain('C', dim=2)
+
+    bnd_A = Boundary('Gamma_1', A, axis=0, ext=-1)
+    bnd_B = Boundary('Gamma_1', B, axis=0, ext=-1)
+
+    # Domains are sorted as their string representation
+    U = Union(C, B, A)
+    assert U.args == (A, B, C)
+    assert Union(bnd_B, bnd_A).args == (bnd_A, bnd_B)
+    assert all(e.order_key[0] == str(e) for e in (A, bnd_A))
+
+    # Unions are flattened and merged
+    assert Union(U) is U
+    assert Union(Union(A, C), Union(B, C)) == U
+    assert Union(Union(B, C), A, None) == U
+    assert Union(None, None) is None
+    assert Union(A, A) == A
+
 #==============================================================================
 def test_topology_1():
     # ... create a domain with 2 subdomains A and B
@@ -69,6 +96,46 @@ def test_topology_1():
     D = Domain.from_file('omega.h5')
     assert( D.todict() == Omega.todict() )
 
+#==============================================================================
+def test_topology_layouts():
+    # ... create a chain of 4 patches
+    patches      = [InteriorDomain('P{}'.format(i), dim=2) for i in range(4)]
+    boundaries   = [Boundary(r'\Gamma_1', patches[0], axis=0, ext=-1),
+                    Boundary(r'\Gamma_2', patches[-1], axis=0, ext=1)]
+    connectivity = Connectivity()
+    for i, P in enumerate(patches):
+        boundaries += [Boundary(r'\Gamma_3', P, axis=1, ext=-1),
+                       Boundary(r'\Gamma_4', P, axis=1, ext=1)]
+        if i > 0:
+            name = 'P{}|P{}'.format(i-1, i)
+            connectivity[name] = Interface(name,
+                                           Boundary(r'\Gamma_2', patches[i-1], axis=0, ext=1),
+                                           Boundary(r'\Gamma_1', P, axis=0, ext=-1))
+
+    Omega = Domain('Omega', interiors=patches, boundaries=boundaries,
+                   connectivity=connectivity)
+
+    for layout, compression in [('hdf5', None), ('hdf5', 'gzip'), ('yaml', None)]:
+        Omega.export('omega.h5', layout=layout, compression=compression)
+
+        D = Domain.from_file('omega.h5').logical_domain
+        assert D == Omega
+
+        # Partial loading, by name or index
+        D = Domain.from_file('omega.h5', patches=['P1', 2]).logical_domain
+        assert set(D.interior.args) == set(patches[1:3])
+        assert set(D.boundary.args) == {b for b in boundaries if b.domain in patches[1:3]}
+        assert list(D.connectivity.keys()) == ['P1|P2']
+        assert D.connectivity['P1|P2'] == connectivity['P1|P2']
+
+    # The domains of the gallery are loaded with all their patches
+    for layout in ('hdf5', 'yaml'):
+        Square('Omega').export('omega.h5', layout=layout)
+        assert Domain.from_file('omega.h5', patches=[0]).logical_domain == Square('Omega')
+
+        with pytest.raises(ValueError):
+            Domain.from_file('omega.h5', patches=[])
+
 #==============================================================================
 def test_domain_1():
     Omega_1 = InteriorDomain('Omega_1', dim=2)
@@ -226,6 +293,75 @@ def test_domain_join_square():
 
 
 
+#==============================================================================
+def test_domain_join_many():
+
+    A = Square('A')
+    B = Square('B')
+    C = Square('C')
+
+    bnd_minus = [A.get_boundary(axis=0, ext=1), B.get_boundary(axis=0, ext=1)]
+    bnd_plus  = [B.get_boundary(axis=0, ext=-1), C.get_boundary(axis=0, ext=-1)]
+
+    # ... all domains are merged at once
+    ABC = A.join([B, C], name='ABC', bnd_minus=bnd_minus, bnd_plus=bnd_plus)
+
+    AB  = A.join(B, name='AB', bnd_minus=bnd_minus[0], bnd_plus=bnd_plus[0])
+    ABC_pairwise = AB.join(C, name='ABC', bnd_minus=bnd_minus[1], bnd_plus=bnd_plus[1])
+
+    assert ABC.name       == 'ABC'
+    assert ABC            == ABC_pairwise
+    assert ABC.interfaces == ABC_pairwise.interfaces
+    assert ABC.interfaces is ABC.interfaces
+    assert len(ABC.boundary) == 8
+    # ...
+
+    # ... adjacency index
+    adjacency = ABC.adjacency
+    assert adjacency is ABC.adjacency
+    assert adjacency.patches == ABC.interior.args
+    assert adjacency.neighbours('B') == (A.interior, C.interior)
+    assert adjacency.neighbours(A.interior) == (B.interior,)
+    assert adjacency.interfaces('B') == ABC.interfaces.args
+    assert adjacency.interface(bnd_plus[1]) == ABC.connectivity['B|C']
+    assert adjacency.interface(A.get_boundary(axis=0, ext=-1)) is None
+    assert set(adjacency.boundaries('B')) == {B.get_boundary(axis=1, ext=-1),
+                                              B.get_boundary(axis=1, ext=1)}
+    assert ABC.get_interior('C') == C.interior
+    # ...
+
+    # ... mapped domains: every interface has its logical counterpart
+    M1 = PolarMapping('M1', 2, c1=0, c2=0, rmin=0, rmax=1)
+    M2 = PolarMapping('M2', 2, c1=0, c2=0, rmin=1, rmax=2)
+    M3 = PolarMapping('M3', 2, c1=0, c2=0, rmin=2, rmax=3)
+    D1, D2, D3 = M1(A), M2(B), M3(C)
+
+    D = D1.join([D2, D3], name='D',
+                bnd_minus=[D1.get_boundary(axis=0, ext=1), D2.get_boundary(axis=0, ext=1)],
+                bnd_plus =[D2.get_boundary(axis=0, ext=-1), D3.get_boundary(axis=0, ext=-1)])
+
+    assert D.name == 'D'
+    assert D.logical_domain.interior   == ABC.interior
+    assert D.logical_domain.interfaces == ABC.interfaces
+    # ...
+
+#==============================================================================
+def test_lazy_import():
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(base_dir)))
+
+    # The I/O libraries and the unused subpackages are not imported
+    code = ("import sys, sympde.expr; "
+            "print(sorted(m for m in ('h5py', 'yaml', 'numpy', 'sympde.exterior', "
+            "'sympde.printing') if m in sys.modules))")
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=root_dir)
+    assert out.decode().strip() == '[]'
+
+    # The names of the subpackages are still exported by sympde
+    code = "import sympde; from sympde import *; print(sympde.Square is Square, PullBack)"
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=root_dir)
+    assert out.decode().split() == ['True', 'PullBack']
+
 #==============================================================================
 # CLEAN UP SYMPY NAMESPACE
 #==============================================================================